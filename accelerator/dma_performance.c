@@ -11,6 +11,11 @@
 #define ACCEL_LENGTH    (*(volatile uint32_t*)(ACCEL_BASE + 0x10))
 #define ACCEL_PROGRESS  (*(volatile uint32_t*)(ACCEL_BASE + 0x14))
 
+// Control register bits
+#define CTRL_START         (1 << 0)
+#define CTRL_BURST         (1 << 1)              // Burst mode
+#define CTRL_BURST_LEN(n)  (((n) & 0xFF) << 8)   // Beats per burst (0 = hardware max)
+
 // Read CPU cycle counter (RISC-V)
 static inline uint64_t read_cycles(void) {
     uint64_t cycles;
@@ -18,7 +23,7 @@ static inline uint64_t read_cycles(void) {
     return cycles;
 }
 
-void test_dma_speed(uint32_t transfer_size) {
+void test_dma_speed(uint32_t transfer_size, uint32_t control) {
     uint32_t *src = (uint32_t *)malloc(transfer_size);
     uint32_t *dst = (uint32_t *)malloc(transfer_size);
     
@@ -27,7 +32,7 @@ void test_dma_speed(uint32_t transfer_size) {
         src[i] = i;
     }
     
-    printf("\n=== DMA Speed Test ===\n");
+    printf("\n=== DMA Speed Test (%s) ===\n", (control & CTRL_BURST) ? "burst" : "single-beat");
     printf("Transfer size: %d bytes (%.2f KB, %.2f MB)\n", 
            transfer_size, 
            transfer_size/1024.0, 
@@ -40,7 +45,8 @@ void test_dma_speed(uint32_t transfer_size) {
     
     // Start timing and operation
     uint64_t start_cycles = read_cycles();
-    ACCEL_CONTROL = 0x1;  // Start
+    ACCEL_CONTROL = 0x0;
+    ACCEL_CONTROL = control | CTRL_START;  // Start
     
     // Poll for completion
     while (ACCEL_STATUS & 0x1);  // Wait while busy
@@ -86,14 +92,17 @@ int main(void) {
     printf("DMA Performance Characterization\n");
     printf("=================================\n");
     
-    test_dma_speed(64);           // 64 bytes
-    test_dma_speed(256);          // 256 bytes
-    test_dma_speed(1024);         // 1 KB
-    test_dma_speed(4096);         // 4 KB
-    test_dma_speed(16384);        // 16 KB
-    test_dma_speed(65536);        // 64 KB
-    test_dma_speed(262144);       // 256 KB
-    test_dma_speed(1048576);      // 1 MB
+    uint32_t modes[] = { 0, CTRL_BURST | CTRL_BURST_LEN(0) };
+    for (int m = 0; m < 2; m++) {
+        test_dma_speed(64,      modes[m]);   // 64 bytes
+        test_dma_speed(256,     modes[m]);   // 256 bytes
+        test_dma_speed(1024,    modes[m]);   // 1 KB
+        test_dma_speed(4096,    modes[m]);   // 4 KB
+        test_dma_speed(16384,   modes[m]);   // 16 KB
+        test_dma_speed(65536,   modes[m]);   // 64 KB
+        test_dma_speed(262144,  modes[m]);   // 256 KB
+        test_dma_speed(1048576, modes[m]);   // 1 MB
+    }
     
     return 0;
 }
\ No newline at end of file
@@ -0,0 +1,17 @@
+#ifndef BENCH_H
+#define BENCH_H
+
+#include <stdint.h>
+#include <generated/mem.h>
+
+// Benchmark buffers in main_ram, above the firmware image
+#define BENCH_BUFFER_BASE (MAIN_RAM_BASE + 0x00100000)
+
+// Cycle counter (timer0)
+void timer_start(void);
+uint32_t timer_cycles(void);
+
+void bench_dma(void);
+void bench_sha3(void);
+
+#endif
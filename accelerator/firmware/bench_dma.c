@@ -0,0 +1,267 @@
+// SimpleDMAEngine copy benchmark (port of dma_performance.c)
+
+#include <stdio.h>
+#include <stdint.h>
+
+#include <system.h>
+#include <generated/csr.h>
+#include <generated/soc.h>
+
+#include "bench.h"
+
+// SimpleDMAEngine only (desc_addr): other --user-accelerator choices also have src_addr
+#ifdef CSR_USER_ACCEL_DESC_ADDR_ADDR
+
+// Control register bits
+#define CTRL_START         (1 << 0)
+#define CTRL_BURST         (1 << 1)              // Burst mode
+#define CTRL_FILL32        (1 << 3)              // Fill with fill_pattern bits [31:0]
+#define CTRL_BURST_LEN(n)  (((n) & 0xFF) << 8)   // Beats per burst (0 = hardware max)
+#define CTRL_OP(n)         (((n) & 0x3) << 16)   // Operation (OP_*)
+
+// Status register bits
+#define STATUS_DONE        (1 << 1)
+#define STATUS_ERROR       (1 << 2)
+#define STATUS_MISMATCH    (1 << 3)              // Compare found a difference
+
+// Operations (control bits [17:16])
+#define OP_FILL            1
+#define OP_CRC32C          2
+#define OP_COMPARE         3
+
+static void flush_caches(void) {
+    flush_cpu_dcache();
+#ifdef CONFIG_L2_SIZE
+    flush_l2_cache();
+#endif
+}
+
+static void test_dma_speed(uint32_t transfer_size, uint32_t control) {
+    volatile uint32_t *src = (volatile uint32_t *)BENCH_BUFFER_BASE;
+    volatile uint32_t *dst = (volatile uint32_t *)(BENCH_BUFFER_BASE + 0x00100000);
+    uint32_t words = transfer_size / 4;
+    uint32_t errors = 0;
+    uint32_t cycles;
+
+    // Initialize source data, clear destination
+    for (uint32_t i = 0; i < words; i++) {
+        src[i] = i ^ transfer_size;
+        dst[i] = 0;
+    }
+    flush_caches();
+
+    // Configure accelerator
+    user_accel_src_addr_write((uint32_t)src);
+    user_accel_dst_addr_write((uint32_t)dst);
+    user_accel_length_write(transfer_size);
+#ifdef CSR_USER_ACCEL_PERF_CONTROL_ADDR
+    user_accel_perf_control_write(2);  // Clear counters
+#endif
+
+    // Start and wait for completion (done is cleared as the job starts)
+    user_accel_control_write(0);
+    timer_start();
+    user_accel_control_write(control | CTRL_START);
+    while (!(user_accel_status_read() & STATUS_DONE));
+    cycles = timer_cycles();
+
+    // Verify correctness
+    flush_caches();
+    for (uint32_t i = 0; i < words; i++) {
+        if (dst[i] != (i ^ transfer_size))
+            errors++;
+    }
+    if (user_accel_status_read() & STATUS_ERROR)
+        errors++;
+
+    printf("%-6s %7u %9u %6u.%02u %7u",
+        (control & CTRL_BURST) ? "burst" : "single",
+        (unsigned)transfer_size,
+        (unsigned)cycles,
+        (unsigned)(cycles / words), (unsigned)((cycles * 100 / words) % 100),
+        (unsigned)((uint64_t)transfer_size * (CONFIG_CLOCK_FREQUENCY / 1000) / cycles / 1000));
+#ifdef CSR_USER_ACCEL_PERF_CONTROL_ADDR
+    user_accel_perf_control_write(1);  // Snapshot
+    printf(" %9u %9u",
+        (unsigned)user_accel_perf_rd_stall_cycles_read(),
+        (unsigned)user_accel_perf_wr_stall_cycles_read());
+#else
+    printf(" %9s %9s", "-", "-");
+#endif
+    printf("  %s\n", errors ? "FAIL" : "PASS");
+}
+
+#ifdef CSR_USER_ACCEL_CRC_ADDR
+
+static uint32_t crc32c_sw(const volatile uint8_t *p, uint32_t n) {
+    uint32_t crc = 0xFFFFFFFF;
+    while (n--) {
+        crc ^= *p++;
+        for (int k = 0; k < 8; k++)
+            crc = (crc >> 1) ^ ((crc & 1) ? 0x82F63B78 : 0);
+    }
+    return ~crc;
+}
+
+// Fill / CRC32C / compare on the DMA engine, against the same operation on the CPU
+static void test_dma_op(uint32_t transfer_size, uint32_t op) {
+    static const char *names[] = { "copy", "fill", "crc32c", "compare" };
+    volatile uint8_t *src = (volatile uint8_t *)BENCH_BUFFER_BASE;
+    volatile uint8_t *dst = (volatile uint8_t *)(BENCH_BUFFER_BASE + 0x00100000);
+    volatile uint32_t *dst32 = (volatile uint32_t *)dst;
+    uint32_t words = transfer_size / 4;
+    uint32_t differ = transfer_size - 3;
+    uint32_t errors = 0;
+    uint32_t cycles, cpu_cycles;
+    uint32_t crc = 0;
+
+    // Compare: the buffers differ (only) at `differ`
+    for (uint32_t i = 0; i < transfer_size; i++) {
+        src[i] = i ^ (i >> 8);
+        dst[i] = (op == OP_COMPARE) ? (src[i] ^ (i == differ)) : 0;
+    }
+    flush_caches();
+
+    // Same operation on the CPU (memset / crc32c / memcmp)
+    timer_start();
+    if (op == OP_FILL) {
+        for (uint32_t i = 0; i < words; i++)
+            dst32[i] = 0xA5A5A5A5;
+    } else if (op == OP_CRC32C) {
+        crc = crc32c_sw(src, transfer_size);
+    } else {
+        for (differ = 0; differ < transfer_size && src[differ] == dst[differ]; differ++);
+    }
+    cpu_cycles = timer_cycles();
+    if (op == OP_FILL) {
+        for (uint32_t i = 0; i < words; i++)
+            dst32[i] = 0;
+    }
+    flush_caches();
+
+    // DMA
+    user_accel_src_addr_write((uint32_t)src);
+    user_accel_dst_addr_write((uint32_t)dst);
+    user_accel_length_write(transfer_size);
+    user_accel_fill_pattern_write(0xA5A5A5A5);
+    user_accel_control_write(0);
+    timer_start();
+    user_accel_control_write(CTRL_OP(op) | CTRL_FILL32 | CTRL_BURST | CTRL_START);
+    while (!(user_accel_status_read() & STATUS_DONE));
+    cycles = timer_cycles();
+
+    // Verify against the CPU result
+    flush_caches();
+    if (op == OP_FILL) {
+        for (uint32_t i = 0; i < words; i++)
+            errors += dst32[i] != 0xA5A5A5A5;
+    } else if (op == OP_CRC32C) {
+        errors += user_accel_crc_read() != crc;
+    } else {
+        errors += !(user_accel_status_read() & STATUS_MISMATCH) || user_accel_mismatch_read() != differ;
+    }
+    if (user_accel_status_read() & STATUS_ERROR)
+        errors++;
+
+    printf("%-7s %7u %9u %6u.%02u %7u %9u  %s\n",
+        names[op],
+        (unsigned)transfer_size,
+        (unsigned)cycles,
+        (unsigned)(cycles / words), (unsigned)((cycles * 100 / words) % 100),
+        (unsigned)((uint64_t)transfer_size * (CONFIG_CLOCK_FREQUENCY / 1000) / cycles / 1000),
+        (unsigned)cpu_cycles,
+        errors ? "FAIL" : "PASS");
+}
+
+#endif
+
+#ifdef CSR_USER_ACCEL_ROWS_ADDR
+
+// 2D job: copy a w x h word tile out of a 1024-word wide source into a 2048-word wide destination
+static void test_dma_2d(uint32_t w, uint32_t h) {
+    const uint32_t src_pitch = 1024, dst_pitch = 2048;  // In words
+    volatile uint32_t *src = (volatile uint32_t *)BENCH_BUFFER_BASE;
+    volatile uint32_t *dst = (volatile uint32_t *)(BENCH_BUFFER_BASE + 0x00100000);
+    uint32_t words = w * h;
+    uint32_t errors = 0;
+    uint32_t cycles;
+
+    for (uint32_t y = 0; y < h; y++) {
+        for (uint32_t x = 0; x < src_pitch; x++)
+            src[y * src_pitch + x] = (y << 16) | x;
+        for (uint32_t x = 0; x < dst_pitch; x++)
+            dst[y * dst_pitch + x] = 0xFFFFFFFF;
+    }
+    flush_caches();
+
+    user_accel_src_addr_write((uint32_t)src);
+    user_accel_dst_addr_write((uint32_t)dst);
+    user_accel_length_write(4 * w);
+    user_accel_rows_write(h);
+    user_accel_src_stride_write(4 * src_pitch);
+    user_accel_dst_stride_write(4 * dst_pitch);
+    user_accel_control_write(0);
+    timer_start();
+    user_accel_control_write(CTRL_BURST | CTRL_START);
+    while (!(user_accel_status_read() & STATUS_DONE));
+    cycles = timer_cycles();
+    user_accel_rows_write(0);  // Back to linear jobs
+
+    // The tile is copied, the rest of each destination line is untouched
+    flush_caches();
+    for (uint32_t y = 0; y < h; y++) {
+        for (uint32_t x = 0; x < w + 1; x++)
+            errors += dst[y * dst_pitch + x] != ((x < w) ? ((y << 16) | x) : 0xFFFFFFFF);
+    }
+    if (user_accel_status_read() & STATUS_ERROR)
+        errors++;
+
+    printf("%4ux%-4u %7u %9u %6u.%02u %7u  %s\n",
+        (unsigned)w, (unsigned)h,
+        (unsigned)(4 * words),
+        (unsigned)cycles,
+        (unsigned)(cycles / words), (unsigned)((cycles * 100 / words) % 100),
+        (unsigned)((uint64_t)4 * words * (CONFIG_CLOCK_FREQUENCY / 1000) / cycles / 1000),
+        errors ? "FAIL" : "PASS");
+}
+
+#endif
+
+void bench_dma(void) {
+    static const uint32_t sizes[] = { 64, 256, 1024, 4096, 16384 };
+    uint32_t modes[] = { 0, CTRL_BURST | CTRL_BURST_LEN(0) };
+
+    printf("\nDMA Performance (SimpleDMAEngine)\n");
+    printf("%-6s %7s %9s %9s %7s %9s %9s  %s\n",
+        "mode", "size", "cycles", "cyc/word", "MB/s", "rd_stall", "wr_stall", "data");
+    for (int m = 0; m < 2; m++) {
+        for (unsigned i = 0; i < sizeof(sizes) / sizeof(sizes[0]); i++)
+            test_dma_speed(sizes[i], modes[m]);
+    }
+
+#ifdef CSR_USER_ACCEL_CRC_ADDR
+    printf("\nDMA Operations (burst; cpu = cycles of the same operation in software)\n");
+    printf("%-7s %7s %9s %9s %7s %9s  %s\n",
+        "op", "size", "cycles", "cyc/word", "MB/s", "cpu", "data");
+    for (uint32_t op = OP_FILL; op <= OP_COMPARE; op++) {
+        for (unsigned i = 0; i < sizeof(sizes) / sizeof(sizes[0]); i++)
+            test_dma_op(sizes[i], op);
+    }
+#endif
+
+#ifdef CSR_USER_ACCEL_ROWS_ADDR
+    printf("\nDMA 2D Tiles (burst, one job per tile)\n");
+    printf("%-9s %7s %9s %9s %7s  %s\n", "tile", "bytes", "cycles", "cyc/word", "MB/s", "data");
+    test_dma_2d(16, 16);
+    test_dma_2d(64, 64);
+    test_dma_2d(256, 16);
+#endif
+}
+
+#else
+
+void bench_dma(void) {
+    printf("\nDMA Performance: no SimpleDMAEngine (user_accel) in this SoC, skipped.\n");
+}
+
+#endif
@@ -0,0 +1,182 @@
+// SHA3-256 benchmark: software (port of sha3_bench.c) vs SHA3Accelerator (user_sha3)
+
+#include <stdio.h>
+#include <stdint.h>
+#include <string.h>
+
+#include <system.h>
+#include <generated/csr.h>
+#include <generated/soc.h>
+
+#include "bench.h"
+
+#define DATA_SIZE  850
+#define SW_HASHES  4
+
+// ========== Software SHA3-256 Implementation ==========
+#define SHA3_256_RATE 136
+
+static const uint64_t keccakf_rndc[24] = {
+    0x0000000000000001ULL, 0x0000000000008082ULL, 0x800000000000808aULL,
+    0x8000000080008000ULL, 0x000000000000808bULL, 0x0000000080000001ULL,
+    0x8000000080008081ULL, 0x8000000000008009ULL, 0x000000000000008aULL,
+    0x0000000000000088ULL, 0x0000000080008009ULL, 0x000000008000000aULL,
+    0x000000008000808bULL, 0x800000000000008bULL, 0x8000000000008089ULL,
+    0x8000000000008003ULL, 0x8000000000008002ULL, 0x8000000000000080ULL,
+    0x000000000000800aULL, 0x800000008000000aULL, 0x8000000080008081ULL,
+    0x8000000000008080ULL, 0x0000000080000001ULL, 0x8000000080008008ULL
+};
+
+static const int keccakf_rotc[24] = {
+    1,  3,  6,  10, 15, 21, 28, 36, 45, 55, 2,  14,
+    27, 41, 56, 8,  25, 43, 62, 18, 39, 61, 20, 44
+};
+
+static const int keccakf_piln[24] = {
+    10, 7,  11, 17, 18, 3, 5,  16, 8,  21, 24, 4,
+    15, 23, 19, 13, 12, 2, 20, 14, 22, 9,  6,  1
+};
+
+#define ROTL64(x, y) (((x) << (y)) | ((x) >> (64 - (y))))
+
+static void keccakf(uint64_t st[25]) {
+    uint64_t t, bc[5];
+    for (int round = 0; round < 24; round++) {
+        for (int i = 0; i < 5; i++)
+            bc[i] = st[i] ^ st[i + 5] ^ st[i + 10] ^ st[i + 15] ^ st[i + 20];
+        for (int i = 0; i < 5; i++) {
+            t = bc[(i + 4) % 5] ^ ROTL64(bc[(i + 1) % 5], 1);
+            for (int j = 0; j < 25; j += 5)
+                st[j + i] ^= t;
+        }
+        t = st[1];
+        for (int i = 0; i < 24; i++) {
+            int j = keccakf_piln[i];
+            bc[0] = st[j];
+            st[j] = ROTL64(t, keccakf_rotc[i]);
+            t = bc[0];
+        }
+        for (int j = 0; j < 25; j += 5) {
+            for (int i = 0; i < 5; i++)
+                bc[i] = st[j + i];
+            for (int i = 0; i < 5; i++)
+                st[j + i] ^= (~bc[(i + 1) % 5]) & bc[(i + 2) % 5];
+        }
+        st[0] ^= keccakf_rndc[round];
+    }
+}
+
+static void sha3_256_sw(const uint8_t *input, size_t len, uint8_t output[32]) {
+    uint64_t state[25] = {0};
+    size_t rate_bytes = SHA3_256_RATE;
+    size_t idx = 0;
+    while (len >= rate_bytes) {
+        for (size_t i = 0; i < rate_bytes / 8; i++) {
+            uint64_t word = 0;
+            for (int j = 0; j < 8; j++)
+                word |= ((uint64_t)input[idx++]) << (8 * j);
+            state[i] ^= word;
+        }
+        keccakf(state);
+        len -= rate_bytes;
+    }
+    uint8_t temp[SHA3_256_RATE] = {0};
+    for (size_t i = 0; i < len; i++)
+        temp[i] = input[idx++];
+    temp[len] = 0x06;
+    temp[rate_bytes - 1] |= 0x80;
+    for (size_t i = 0; i < rate_bytes / 8; i++) {
+        uint64_t word = 0;
+        for (int j = 0; j < 8; j++)
+            word |= ((uint64_t)temp[i * 8 + j]) << (8 * j);
+        state[i] ^= word;
+    }
+    keccakf(state);
+    for (int i = 0; i < 4; i++) {
+        for (int j = 0; j < 8; j++)
+            output[i * 8 + j] = (state[i] >> (8 * j)) & 0xFF;
+    }
+}
+
+static void print_hash(const char *name, const uint8_t hash[32]) {
+    printf("%-9s ", name);
+    for (int i = 0; i < 32; i++)
+        printf("%02x", hash[i]);
+    printf("\n");
+}
+
+#ifdef CSR_USER_SHA3_BASE
+
+// ========== Hardware SHA3-256 (SHA3Accelerator) ==========
+#define SHA3_CTRL_START    (1 << 0)   // Mode bits[2:1] = 00: SHA3-256
+#define SHA3_STATUS_DONE   (1 << 1)
+#define SHA3_STATUS_ERROR  (1 << 2)
+
+static int sha3_256_hw(const uint8_t *input, size_t len, uint8_t output[32], uint32_t *cycles) {
+    uint32_t words[8];
+
+    user_sha3_input_addr_write((uint32_t)input);
+    user_sha3_input_length_write(len);
+
+    // Start and wait for completion (done is cleared as the job starts)
+    user_sha3_control_write(0);
+    timer_start();
+    user_sha3_control_write(SHA3_CTRL_START);
+    while (!(user_sha3_status_read() & SHA3_STATUS_DONE));
+    *cycles = timer_cycles();
+
+    words[0] = user_sha3_hash_out0_read();
+    words[1] = user_sha3_hash_out1_read();
+    words[2] = user_sha3_hash_out2_read();
+    words[3] = user_sha3_hash_out3_read();
+    words[4] = user_sha3_hash_out4_read();
+    words[5] = user_sha3_hash_out5_read();
+    words[6] = user_sha3_hash_out6_read();
+    words[7] = user_sha3_hash_out7_read();
+    for (int i = 0; i < 32; i++)
+        output[i] = (words[i / 4] >> (8 * (i % 4))) & 0xFF;
+
+    return !(user_sha3_status_read() & SHA3_STATUS_ERROR);
+}
+
+#endif
+
+void bench_sha3(void) {
+    // 64-bit aligned input in main_ram (read by the accelerator DMA)
+    uint8_t *input = (uint8_t *)BENCH_BUFFER_BASE;
+    uint8_t hash_sw[32];
+    uint32_t sw_cycles;
+
+    // Fill with test pattern
+    for (size_t i = 0; i < DATA_SIZE; i++)
+        input[i] = (uint8_t)(i & 0xFF);
+
+    printf("\nSHA3-256 (%u bytes)\n", DATA_SIZE);
+
+    timer_start();
+    for (int i = 0; i < SW_HASHES; i++)
+        sha3_256_sw(input, DATA_SIZE, hash_sw);
+    sw_cycles = timer_cycles() / SW_HASHES;
+    print_hash("software", hash_sw);
+    printf("software: %u cycles/hash\n", (unsigned)sw_cycles);
+
+#ifdef CSR_USER_SHA3_BASE
+    uint8_t hash_hw[32];
+    uint32_t hw_cycles;
+    int ok;
+
+    flush_cpu_dcache();
+#ifdef CONFIG_L2_SIZE
+    flush_l2_cache();
+#endif
+    ok = sha3_256_hw(input, DATA_SIZE, hash_hw, &hw_cycles);
+    ok &= (memcmp(hash_sw, hash_hw, 32) == 0);
+    print_hash("hardware", hash_hw);
+    printf("hardware: %u cycles/hash, speedup %u.%02ux  %s\n",
+        (unsigned)hw_cycles,
+        (unsigned)(sw_cycles / hw_cycles), (unsigned)((sw_cycles * 100ULL / hw_cycles) % 100),
+        ok ? "PASS" : "FAIL");
+#else
+    printf("hardware: no SHA3Accelerator (user_sha3) in this SoC, skipped (--with-sha3).\n");
+#endif
+}
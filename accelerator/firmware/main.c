@@ -0,0 +1,51 @@
+// Accelerator benchmark firmware
+//
+// Bare-metal ports of dma_performance.c and sha3_bench.c, timed in system clock cycles.
+// Loaded in main_ram and booted by the BIOS (see alinx_ax7203_sim.py --build-firmware);
+// ends the simulation when done.
+
+#include <stdio.h>
+#include <stdint.h>
+
+#include <irq.h>
+#include <libbase/uart.h>
+#include <generated/csr.h>
+#include <generated/soc.h>
+
+#include "bench.h"
+
+// timer0 as a cycle counter: one-shot count down from 0xffffffff
+void timer_start(void) {
+    timer0_en_write(0);
+    timer0_reload_write(0);
+    timer0_load_write(0xffffffff);
+    timer0_en_write(1);
+}
+
+uint32_t timer_cycles(void) {
+    timer0_update_value_write(1);
+    return 0xffffffff - timer0_value_read();
+}
+
+int main(void) {
+#ifdef CONFIG_CPU_HAS_INTERRUPT
+    irq_setmask(0);
+    irq_setie(1);
+#endif
+    uart_init();
+
+    printf("\nAccelerator Benchmarks (%u MHz)\n", (unsigned)(CONFIG_CLOCK_FREQUENCY / 1000000));
+    printf("================================\n");
+
+    bench_dma();
+    bench_sha3();
+
+    printf("\nDone.\n");
+
+#ifdef CSR_SIM_FINISH_BASE
+    sim_finish_finish_write(1);
+#endif
+    while (1);
+
+    return 0;
+}
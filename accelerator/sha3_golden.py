@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+
+#
+# SHA3 Golden Model
+#
+# Vectorised NumPy reference for the hashing accelerators in user_accelerator.py: Keccak-f[1600]
+# runs over a batch of states at once (one uint64 array per lane), so millions of reference
+# digests take seconds instead of the hours of a per-message Python loop. The Keccak constants
+# are derived here from the specification, independently of the tables used by the hardware.
+#
+#   python3 sha3_golden.py check
+#   python3 sha3_golden.py batch --count 1000 --max-length 1024 --output vectors/sha3_batch
+#   python3 sha3_golden.py txpow --count 1000000 --header-length 100 --output vectors/txpow
+#
+# `batch` writes a SHA3Accelerator batch-mode memory image (message table and messages) with the
+# expected output buffer; `txpow` writes the digests of a TxPoWAccelerator nonce sweep and reports
+# the winning nonce. The images load into the Migen testbenches (`WishboneMemoryModel.write()`)
+# and, through the .json region file, into the Verilator simulation (`alinx_ax7203_sim.py
+# --firmware` / `get_mem_data`).
+#
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# ====================================================================================================
+# Keccak-f[1600]
+# ====================================================================================================
+
+def _round_constants():
+    # Round constants from the rc(t) LFSR (x^8 + x^6 + x^5 + x^4 + 1)
+    constants = []
+    r = 1
+    for _ in range(24):
+        rc = 0
+        for j in range(7):
+            if r & 1:
+                rc |= 1 << ((1 << j) - 1)
+            r = ((r << 1) ^ 0x171) if (r & 0x80) else (r << 1)
+        constants.append(rc)
+    return constants
+
+def _rho_pi():
+    # (source lane, destination lane, rotation) of the combined rho and pi steps; lane x + 5*y
+    offsets = {(0, 0): 0}
+    x, y = 1, 0
+    for t in range(24):
+        offsets[(x, y)] = ((t + 1)*(t + 2)//2) % 64
+        x, y = y, (2*x + 3*y) % 5
+    return [(x + 5*y, y + 5*((2*x + 3*y) % 5), offsets[(x, y)]) for y in range(5) for x in range(5)]
+
+KECCAK_RC     = [np.uint64(rc) for rc in _round_constants()]
+KECCAK_RHO_PI = _rho_pi()
+
+# Modes of SHA3Accelerator: mode -> (name, rate in bytes, padding byte, digest bytes; 0 = XOF)
+SHA3_MODES = {
+    0b000: ("SHA3-256", 136, 0x06, 32),
+    0b001: ("SHA3-224", 144, 0x06, 28),
+    0b010: ("SHA3-384", 104, 0x06, 48),
+    0b011: ("SHA3-512",  72, 0x06, 64),
+    0b100: ("SHAKE128", 168, 0x1f,  0),
+    0b101: ("SHAKE256", 136, 0x1f,  0),
+}
+SHA3_MODE_NAMES = {name.lower(): mode for mode, (name, _, _, _) in SHA3_MODES.items()}
+
+def keccak_f1600(state):
+    """
+    Keccak-f[1600] permutation of a batch of states, in place.
+
+    Parameters
+    ----------
+    state : numpy.ndarray
+        uint64 array of shape (25, N): lane x + 5*y of N states (the `st[]` order of
+        `keccakf()` in sha3_bench.c), each lane contiguous over the batch
+
+    Returns
+    -------
+    numpy.ndarray
+        `state`, permuted
+    """
+    assert state.dtype == np.uint64 and state.shape[0] == 25 and state.flags.c_contiguous
+    a = state.reshape(5, 5, -1)  # [y][x]
+    b = np.empty_like(a)
+    c = np.empty((5, state.shape[1]), dtype=np.uint64)
+    d = np.empty_like(c)
+    t = np.empty(state.shape[1], dtype=np.uint64)
+    one         = np.uint64(1)
+    sixty_three = np.uint64(63)
+    for rc in KECCAK_RC:
+        # Theta
+        np.bitwise_xor(a[0], a[1], out=c)
+        c ^= a[2]
+        c ^= a[3]
+        c ^= a[4]
+        for x in range(5):
+            cx = c[(x + 1) % 5]
+            np.left_shift(cx, one, out=d[x])
+            np.right_shift(cx, sixty_three, out=t)
+            d[x] |= t
+            d[x] ^= c[(x - 1) % 5]
+        a ^= d
+        # Rho and pi
+        lanes = state.reshape(25, -1)
+        shuffled = b.reshape(25, -1)
+        for src, dst, rot in KECCAK_RHO_PI:
+            if rot == 0:
+                shuffled[dst] = lanes[src]
+            else:
+                np.left_shift(lanes[src], np.uint64(rot), out=shuffled[dst])
+                np.right_shift(lanes[src], np.uint64(64 - rot), out=t)
+                shuffled[dst] |= t
+        # Chi
+        for x in range(5):
+            np.invert(b[:, (x + 1) % 5], out=c)
+            c &= b[:, (x + 2) % 5]
+            np.bitwise_xor(b[:, x], c, out=a[:, x])
+        # Iota
+        a[0, 0] ^= rc
+    return state
+
+# ====================================================================================================
+# SHA3 / SHAKE
+# ====================================================================================================
+
+def _lanes_to_bytes(lanes):
+    # (L, N) uint64 lanes -> (N, 8*L) uint8, little-endian lanes
+    return np.ascontiguousarray(lanes.T).astype("<u8").view(np.uint8).reshape(lanes.shape[1], -1)
+
+def sha3(messages, mode=0b000, output_length=None, chunk=1 << 14):
+    """
+    Hash a batch of messages of the same length.
+
+    Parameters
+    ----------
+    messages : array_like
+        uint8 array of shape (N, length), one message per row
+    mode : int
+        SHA3Accelerator mode, see `SHA3_MODES` (default: SHA3-256)
+    output_length : int
+        Output length in bytes for SHAKE (default: digest length of the mode)
+    chunk : int
+        Messages hashed at once; batches that fit in the CPU caches are fastest (default: 16384)
+
+    Returns
+    -------
+    numpy.ndarray
+        uint8 array of shape (N, output length), one digest per row
+    """
+    messages = np.asarray(messages, dtype=np.uint8)
+    if messages.ndim == 1:
+        messages = messages[np.newaxis]
+    name, rate, pad, digest_length = SHA3_MODES[mode]
+    output_length = output_length or digest_length
+    if output_length == 0:
+        raise ValueError(f"{name} needs an output length")
+    n, length = messages.shape
+    blocks = length // rate + 1
+
+    digests = np.empty((n, output_length), dtype=np.uint8)
+    for first in range(0, n, chunk):
+        batch = messages[first:first + chunk]
+        # Pad: message, padding byte after it, 0x80 in the last byte of the last block
+        padded = np.zeros((len(batch), blocks*rate), dtype=np.uint8)
+        padded[:, :length] = batch
+        padded[:, length] ^= pad
+        padded[:, -1] ^= 0x80
+        lanes = padded.view("<u8").reshape(len(batch), blocks, rate // 8)
+
+        # Absorb
+        state = np.zeros((25, len(batch)), dtype=np.uint64)
+        for block in range(blocks):
+            state[:rate // 8] ^= lanes[:, block].T
+            keccak_f1600(state)
+
+        # Squeeze, permuting again after every `rate` bytes
+        output = [_lanes_to_bytes(state[:rate // 8])]
+        while len(output)*rate < output_length:
+            keccak_f1600(state)
+            output.append(_lanes_to_bytes(state[:rate // 8]))
+        digests[first:first + chunk] = np.concatenate(output, axis=1)[:, :output_length]
+    return digests
+
+def sha3_many(messages, mode=0b000, output_length=None):
+    """Hash a list of messages (bytes) of any lengths; returns the list of digests (bytes)."""
+    digests = [None]*len(messages)
+    by_length = {}
+    for i, message in enumerate(messages):
+        by_length.setdefault(len(message), []).append(i)
+    for length, indexes in by_length.items():
+        batch = np.frombuffer(b"".join(messages[i] for i in indexes), dtype=np.uint8).reshape(len(indexes), length)
+        for i, digest in zip(indexes, sha3(batch, mode, output_length)):
+            digests[i] = digest.tobytes()
+    return digests
+
+# ====================================================================================================
+# TxPoW Nonce Sweep
+# ====================================================================================================
+
+def txpow_block(header, nonce_lane):
+    """Padded SHA3-256 block of a TxPoW header template, as 17 uint64 lanes (TxPoWAccelerator LOAD)."""
+    if len(header) > 135:
+        raise ValueError("TxPoW header is limited to one SHA3-256 block (135 bytes)")
+    if 8*nonce_lane + 8 > len(header):
+        raise ValueError("Nonce lane must lie inside the header")
+    block = bytearray(136)
+    block[:len(header)] = header
+    block[len(header)] ^= 0x06
+    block[135]         ^= 0x80
+    return np.frombuffer(bytes(block), dtype="<u8").astype(np.uint64)
+
+def txpow_digests(header, nonce_lane, nonces):
+    """
+    SHA3-256 digests of a header template with each nonce in lane `nonce_lane`.
+
+    Parameters
+    ----------
+    header : bytes
+        Header template (up to 135 bytes)
+    nonce_lane : int
+        Header lane (8-byte word) replaced by the 64-bit little-endian nonce
+    nonces : array_like
+        uint64 nonces
+
+    Returns
+    -------
+    numpy.ndarray
+        uint8 array of shape (N, 32), one digest per nonce
+    """
+    nonces = np.asarray(nonces, dtype=np.uint64)
+    state  = np.zeros((25, len(nonces)), dtype=np.uint64)
+    state[:17] = txpow_block(header, nonce_lane)[:, np.newaxis]
+    state[nonce_lane] = nonces
+    keccak_f1600(state)
+    return _lanes_to_bytes(state[:4])
+
+def txpow_winners(digests, target):
+    """Mask of the digests below `target`, comparing digests as 256-bit big-endian numbers."""
+    words = np.ascontiguousarray(digests).view(">u8").astype(np.uint64)  # (N, 4), most significant first
+    below = np.zeros(len(words), dtype=bool)
+    equal = np.ones(len(words), dtype=bool)
+    for k in range(4):
+        target_word = np.uint64((target >> (64*(3 - k))) & (2**64 - 1))
+        below |= equal & (words[:, k] < target_word)
+        equal &= (words[:, k] == target_word)
+    return below
+
+def txpow_search(header, nonce_lane, nonce_start, nonce_end, target, chunk=1 << 14, digests_file=None):
+    """
+    Search [nonce_start, nonce_end) for the lowest nonce whose digest is below `target`.
+
+    Follows TxPoWAccelerator: the search stops at the first (lowest) winner. With
+    `digests_file` (an open binary file) the search covers the whole range and writes the
+    32-byte digest of every nonce to it.
+
+    Returns
+    -------
+    tuple
+        (nonce, digest bytes) of the lowest winner, or (None, None)
+    """
+    winner = (None, None)
+    for first in range(nonce_start, nonce_end, chunk):
+        nonces  = np.arange(first, min(first + chunk, nonce_end), dtype=np.uint64)
+        digests = txpow_digests(header, nonce_lane, nonces)
+        if digests_file is not None:
+            digests_file.write(digests.tobytes())
+        if winner[0] is None:
+            wins = np.flatnonzero(txpow_winners(digests, target))
+            if len(wins):
+                winner = (int(nonces[wins[0]]), digests[wins[0]].tobytes())
+                if digests_file is None:
+                    break
+    return winner
+
+# ====================================================================================================
+# Test Vectors - Memory Images
+# ====================================================================================================
+
+def sha3_batch_image(messages, base, mode=0b000, output_length=None, align=32):
+    """
+    SHA3Accelerator batch-mode memory image.
+
+    Layout from `base`: the {addr, len} message table (two little-endian 32-bit words per
+    message), then the messages, each aligned to `align` bytes (at least the DMA data width),
+    then the output buffer.
+
+    Returns
+    -------
+    dict
+        `image` (bytes at `base`), `batch_table`, `batch_count`, `output_addr`, `stride`,
+        `control` (start, batch mode and mode bits) and `expected` (the output buffer after
+        the batch, zero between digests)
+    """
+    name, rate, pad, digest_length = SHA3_MODES[mode]
+    output_length = output_length or digest_length
+    stride = (output_length + 31) & ~31
+    aligned = lambda n: (n + align - 1) & ~(align - 1)
+
+    image = bytearray(aligned(8*len(messages)))
+    table = []
+    for message in messages:
+        table.append((base + len(image), len(message)))
+        image += message + bytes(aligned(len(message)) - len(message))
+    for i, (address, length) in enumerate(table):
+        image[8*i:8*i + 8] = address.to_bytes(4, "little") + length.to_bytes(4, "little")
+
+    expected = bytearray(stride*len(messages))
+    for i, digest in enumerate(sha3_many(messages, mode, output_length)):
+        expected[stride*i:stride*i + output_length] = digest
+    return {
+        "image":       bytes(image),
+        "batch_table": base,
+        "batch_count": len(messages),
+        "output_addr": base + len(image),
+        "stride":      stride,
+        "control":     ((mode >> 2) << 5) | (1 << 3) | ((mode & 0b11) << 1) | 1,
+        "expected":    bytes(expected),
+    }
+
+def write_regions(prefix, regions):
+    """Write {address: bytes} regions as <prefix>_<address>.bin plus a LiteX <prefix>.json region file."""
+    files = {}
+    for address, data in regions.items():
+        filename = f"{os.path.basename(prefix)}_{address:08x}.bin"
+        with open(os.path.join(os.path.dirname(prefix) or ".", filename), "wb") as f:
+            f.write(data)
+        files[filename] = f"0x{address:08x}"
+    with open(f"{prefix}.json", "w") as f:
+        json.dump(files, f, indent=4)
+
+# ====================================================================================================
+# Main
+# ====================================================================================================
+
+def _hashlib_reference(message, mode, output_length):
+    name = SHA3_MODES[mode][0].lower().replace("-", "_")
+    if name.startswith("shake"):
+        name = name[:5] + "_" + name[5:]
+        return hashlib.new(name, message).digest(output_length)
+    return hashlib.new(name, message).digest()
+
+def check(args):
+    rng = np.random.default_rng(args.seed)
+    failures = 0
+    for mode, (name, rate, _, digest_length) in SHA3_MODES.items():
+        output_length = digest_length or 2*rate + 5
+        messages = [rng.integers(0, 256, length, dtype=np.uint8).tobytes()
+            for length in list(range(3*rate)) + [rate*k + j for k in range(4, 8) for j in (-1, 0, 1)]]
+        digests = sha3_many(messages, mode, output_length)
+        errors  = sum(digest != _hashlib_reference(message, mode, output_length)
+            for message, digest in zip(messages, digests))
+        print(f"{name:<9} {len(messages):>5} messages  {'OK' if errors == 0 else f'{errors} FAIL'}")
+        failures += errors
+
+    # TxPoW against the message path
+    header  = rng.integers(0, 256, 100, dtype=np.uint8).tobytes()
+    nonces  = np.arange(2**64 - 8, 2**64, dtype=np.uint64)
+    digests = txpow_digests(header, 3, nonces)
+    errors  = sum(digest.tobytes() != hashlib.sha3_256(header[:24] + int(nonce).to_bytes(8, "little") + header[32:]).digest()
+        for nonce, digest in zip(nonces, digests))
+    print(f"{'TxPoW':<9} {len(nonces):>5} nonces    {'OK' if errors == 0 else f'{errors} FAIL'}")
+    failures += errors
+
+    # Throughput: full sweep (no winner below target 0)
+    start = time.perf_counter()
+    txpow_search(header, 3, 0, args.count, 0)
+    elapsed = time.perf_counter() - start
+    print(f"TxPoW sweep: {args.count/elapsed/1e6:.2f} MH/s ({args.count} nonces)")
+    return failures
+
+def batch(args):
+    rng = np.random.default_rng(args.seed)
+    mode = SHA3_MODE_NAMES[args.mode]
+    messages = [rng.integers(0, 256, rng.integers(args.min_length, args.max_length + 1), dtype=np.uint8).tobytes()
+        for _ in range(args.count)]
+    vectors = sha3_batch_image(messages, args.base, mode, args.output_length, args.align)
+    write_regions(args.output, {args.base: vectors["image"]})
+    with open(f"{args.output}_expected.bin", "wb") as f:
+        f.write(vectors["expected"])
+    print(f"{args.output}.json: {len(messages)} {args.mode.upper()} messages, {len(vectors['image'])} bytes at 0x{args.base:08x}")
+    print(f"{args.output}_expected.bin: output buffer ({vectors['stride']} bytes per digest)")
+    for csr in ["batch_table", "batch_count", "output_addr", "control"]:
+        print(f"  {csr:<12} = 0x{vectors[csr]:08x}")
+    return 0
+
+def txpow(args):
+    rng = np.random.default_rng(args.seed)
+    header = bytes.fromhex(args.header) if args.header else rng.integers(0, 256, args.header_length, dtype=np.uint8).tobytes()
+    target = int(args.target, 16)
+    start = time.perf_counter()
+    with open(f"{args.output}_digests.bin", "wb") as f:
+        nonce, digest = txpow_search(header, args.nonce_lane, args.nonce_start, args.nonce_start + args.count, target,
+            digests_file=f)
+    elapsed = time.perf_counter() - start
+    print(f"Header ({len(header)} bytes, nonce lane {args.nonce_lane}): {header.hex()}")
+    print(f"{args.output}_digests.bin: {args.count} digests from nonce {args.nonce_start} "
+          f"({args.count/elapsed/1e6:.2f} MH/s)")
+    if nonce is None:
+        print("No winner below the target")
+    else:
+        print(f"Winner: nonce {nonce} (0x{nonce:016x}), digest {digest.hex()}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorised SHA3 golden model and test-vector generator.")
+    parser.add_argument("--seed", default=0, type=int, help="Random seed for the test data.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_check = commands.add_parser("check", help="Check the model against hashlib and measure its throughput.")
+    parser_check.add_argument("--count", default=1 << 18, type=int, help="Nonces hashed for the throughput measurement.")
+    parser_check.set_defaults(function=check)
+
+    parser_batch = commands.add_parser("batch", help="SHA3Accelerator batch-mode memory image and expected digests.")
+    parser_batch.add_argument("--count",         default=256, type=int, help="Number of messages.")
+    parser_batch.add_argument("--min-length",    default=0, type=int, help="Minimum message length in bytes.")
+    parser_batch.add_argument("--max-length",    default=1024, type=int, help="Maximum message length in bytes.")
+    parser_batch.add_argument("--mode",          default="sha3-256", choices=SHA3_MODE_NAMES, help="Hash function.")
+    parser_batch.add_argument("--output-length", default=None, type=int, help="SHAKE output length in bytes.")
+    parser_batch.add_argument("--base",          default=0x40000000, type=lambda x: int(x, 0), help="Image address.")
+    parser_batch.add_argument("--align",         default=32, type=int, help="Message alignment in bytes (>= DMA data width).")
+    parser_batch.add_argument("--output",        default="sha3_batch", help="Output file prefix.")
+    parser_batch.set_defaults(function=batch)
+
+    parser_txpow = commands.add_parser("txpow", help="TxPoWAccelerator nonce sweep digests and winner.")
+    parser_txpow.add_argument("--header",        default=None, help="Header template (hex), random by default.")
+    parser_txpow.add_argument("--header-length", default=100, type=int, help="Random header length in bytes.")
+    parser_txpow.add_argument("--nonce-lane",    default=0, type=int, help="Header lane replaced by the nonce.")
+    parser_txpow.add_argument("--nonce-start",   default=0, type=int, help="First nonce.")
+    parser_txpow.add_argument("--count",         default=1 << 20, type=int, help="Number of nonces.")
+    parser_txpow.add_argument("--target",        default="0000" + "f"*60, help="Difficulty target (hex, 256 bits).")
+    parser_txpow.add_argument("--output",        default="txpow", help="Output file prefix.")
+    parser_txpow.set_defaults(function=txpow)
+
+    args = parser.parse_args()
+    if os.path.dirname(getattr(args, "output", "")):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    sys.exit(1 if args.function(args) else 0)
+
+if __name__ == "__main__":
+    main()
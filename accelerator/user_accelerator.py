@@ -8,12 +8,23 @@
 # accelerator implementation.
 #
 
+import os
+from functools import reduce
+from operator import or_, xor
+
 from migen import *
+from migen.genlib.roundrobin import RoundRobin, SP_CE
+from migen.genlib.cdc import BusSynchronizer, PulseSynchronizer
 from litex.gen import *
 from litex.soc.interconnect.csr import *
+from litex.soc.interconnect.csr_eventmanager import *
 from litex.soc.interconnect import wishbone
+from litex.soc.interconnect import axi
 from litex.soc.interconnect import stream
 
+from litedram.common import LiteDRAMNativePort
+from litedram.frontend.dma import LiteDRAMDMAReader, LiteDRAMDMAWriter
+
 # ====================================================================================================
 # User Accelerator Class
 # ====================================================================================================
@@ -35,13 +46,21 @@ class UserAccelerator(LiteXModule):
         Width of the DMA data bus (default: 32 bits)
     address_width : int
         Width of the address bus (default: 32 bits for byte-addressable)
+    with_perf : bool
+        Add performance counters (`perf`, see `PerfCounters`) (default: False)
     
     Attributes
     ----------
     wb_dma : wishbone.Interface
         Wishbone master interface for DMA access to memory
+    dma_masters : dict
+        DMA masters to connect to the SoC DMA bus, by name
+    ev : CoalescingEventManager
+        Completion event (pending/enable CSRs, interrupt coalescing)
     interrupt : Signal
-        Interrupt signal to notify CPU of completion
+        Interrupt request of `ev`
+    perf : PerfCounters
+        Performance counters (with `with_perf`)
     control : CSRStorage
         Control register (bit 0: start, bit 1: reset)
     status : CSRStatus
@@ -56,7 +75,7 @@ class UserAccelerator(LiteXModule):
         Error code (0 = no error)
     """
     
-    def __init__(self, data_width=32, address_width=32):
+    def __init__(self, data_width=32, address_width=32, with_perf=False):
         # ========================================================================================
         # CSR Registers - CPU can read/write these for control and status
         # ========================================================================================
@@ -72,11 +91,13 @@ class UserAccelerator(LiteXModule):
         # ========================================================================================
         # This Wishbone master interface allows the accelerator to read/write DDR memory
         self.wb_dma = wishbone.Interface(data_width=data_width, address_width=address_width)
+        self.dma_masters = {"dma": self.wb_dma}
         
         # ========================================================================================
         # Interrupt Signal - Alert CPU when operation completes
         # ========================================================================================
-        self.interrupt = Signal()
+        self.ev        = CoalescingEventManager()
+        self.interrupt = self.ev.irq
         
         # ========================================================================================
         # Internal Signals
@@ -127,7 +148,7 @@ class UserAccelerator(LiteXModule):
         )
         self.fsm.act("DONE",
             # Generate interrupt pulse
-            NextValue(self.interrupt, 1),
+            self.ev.completion.eq(1),
             NextState("IDLE")
         )
         
@@ -137,6 +158,20 @@ class UserAccelerator(LiteXModule):
             self.status.status[1].eq(done),
         ]
         
+        # ========================================================================================
+        # Performance Counters
+        # ========================================================================================
+        # Busy/stall/job profiling, read out through the `perf` CSRs
+        if with_perf:
+            self.perf = PerfCounters()
+            self.comb += [
+                self.perf.busy.eq(~self.fsm.ongoing("IDLE")),
+                self.perf.rd_stall.eq(self.wb_dma.cyc & self.wb_dma.stb & ~self.wb_dma.we & ~self.wb_dma.ack),
+                self.perf.wr_stall.eq(self.wb_dma.cyc & self.wb_dma.stb &  self.wb_dma.we & ~self.wb_dma.ack),
+                self.perf.job_start.eq(self.fsm.ongoing("IDLE") & start),
+                self.perf.job_done.eq(self.ev.completion),
+            ]
+        
         # ========================================================================================
         # TODO: Add your actual accelerator logic here
         # ========================================================================================
@@ -149,360 +184,3597 @@ class UserAccelerator(LiteXModule):
         
 
 # ====================================================================================================
-# Example: More Complete DMA Memory Copy Engine
+# Completion Interrupts - EventManager with Coalescing
 # ====================================================================================================
 
-class SimpleDMAEngine(LiteXModule):
+class CoalescingEventManager(EventManager):
     """
-    Simple DMA engine that copies data from source to destination.
+    Completion interrupt with coalescing.
     
-    This is a more complete example showing actual DMA read/write operations.
-    Use this as a reference for implementing real memory access in your accelerator.
+    An `EventManager` with a single `done` event, so the interrupt is pending until cleared
+    and can be masked through the usual `ev_status`/`ev_pending`/`ev_enable` CSRs. The
+    accelerator pulses `completion` once per finished job; the event is raised once
+    `coalesce_count` completions have accumulated, or `coalesce_timeout` cycles after the
+    first of them, whichever comes first. The defaults (count 1, no timeout) raise it for
+    every completion.
     """
     
-    def __init__(self, data_width=32, address_width=32):
-        # CSR Registers
-        self.control   = CSRStorage(32, description="Control: bit 0 = start")
-        self.status    = CSRStatus(32, description="Status: bit 0 = busy, bit 1 = done, bit 2 = error")
-        self.src_addr  = CSRStorage(address_width, description="Source address")
-        self.dst_addr  = CSRStorage(address_width, description="Destination address")
-        self.length    = CSRStorage(32, description="Length in bytes")
-        self.progress  = CSRStatus(32, description="Bytes transferred")
+    def __init__(self):
+        EventManager.__init__(self)
+        self.completion = Signal()
         
-        # DMA interface
-        self.wb_dma = wishbone.Interface(data_width=data_width, address_width=address_width)
+        self.coalesce_count   = CSRStorage(16, reset=1, description="Completions per interrupt (0 or 1 = every completion)")
+        self.coalesce_timeout = CSRStorage(32, description="Cycles from the first coalesced completion to the interrupt (0 = no timeout)")
         
-        # Interrupt
-        self.interrupt = Signal()
+        self.done = EventSourcePulse(description="Job completion(s), coalesced")
         
-        # Internal registers
-        src = Signal(address_width)
-        dst = Signal(address_width)
-        count = Signal(32)
-        data_buffer = Signal(data_width)
-        bytes_per_word = data_width // 8
+        # # #
         
-        # Detect start edge
-        start_d = Signal()
-        self.sync += start_d.eq(self.control.storage[0])
-        start_pulse = Signal()
-        self.comb += start_pulse.eq(self.control.storage[0] & ~start_d)
+        pending = Signal(16)  # Completions not signalled yet
+        total   = Signal(17)
+        timer   = Signal(32)  # Cycles since the first of them
+        fire    = Signal()
+        self.comb += [
+            total.eq(pending + self.completion),
+            fire.eq((total != 0) & (
+                (total >= self.coalesce_count.storage) |
+                ((self.coalesce_timeout.storage != 0) & (timer >= self.coalesce_timeout.storage)))),
+            self.done.trigger.eq(fire),
+        ]
+        self.sync += [
+            If(fire,
+                pending.eq(0),
+                timer.eq(0)
+            ).Elif(total != 0,
+                pending.eq(total),
+                timer.eq(timer + 1)
+            )
+        ]
         
-        # Status signals
-        busy = Signal()
-        done = Signal()
-        error = Signal()
+        self.finalize()
+
+
+# ====================================================================================================
+# Performance Counters - Busy/Stall/Throughput/Latency Profiling
+# ====================================================================================================
+
+class PerfCounters(LiteXModule):
+    """
+    Performance counters.
+    
+    Counts, since the last clear: elapsed cycles, cycles the accelerator was busy, cycles its
+    read and write DMA masters spent waiting on the memory (`ack` not returned yet), bytes
+    moved, jobs completed and the minimum/maximum job latency (cycles from `job_start` to
+    `job_done`). The counters run live; writing `control` bit 0 copies all of them at once to
+    the status CSRs, so 64-bit values and related counters are read consistently, and bit 1
+    clears them (after the snapshot when both are set).
+    
+    The accelerator drives the inputs: `busy`, `rd_stall`, `wr_stall`, `job_start` and
+    `job_done` are per-cycle flags, `bytes` the number of bytes moved in the cycle.
+    
+    Parameters
+    ----------
+    bytes_width : int
+        Width of the `bytes` input (default: 32 bits)
+    """
+    
+    def __init__(self, bytes_width=32):
+        self.busy      = Signal()
+        self.rd_stall  = Signal()
+        self.wr_stall  = Signal()
+        self.bytes     = Signal(bytes_width)
+        self.job_start = Signal()
+        self.job_done  = Signal()
         
-        # FSM for DMA operation
-        self.submodules.fsm = FSM(reset_state="IDLE")
+        self.control         = CSRStorage(2, description="Control: bit 0=snapshot, bit 1=clear (write 1)")
+        self.cycles          = CSRStatus(64, description="Cycles elapsed")
+        self.busy_cycles     = CSRStatus(64, description="Cycles busy")
+        self.rd_stall_cycles = CSRStatus(64, description="Cycles the read DMA waited on the memory")
+        self.wr_stall_cycles = CSRStatus(64, description="Cycles the write DMA waited on the memory")
+        self.bytes_moved     = CSRStatus(64, description="Bytes moved")
+        self.jobs            = CSRStatus(32, description="Jobs completed")
+        self.latency_min     = CSRStatus(32, reset=2**32 - 1, description="Minimum job latency in cycles (0xffffffff = no job yet)")
+        self.latency_max     = CSRStatus(32, description="Maximum job latency in cycles")
         
-        self.fsm.act("IDLE",
-            NextValue(busy, 0),
-            NextValue(done, 0),
-            NextValue(error, 0),
-            NextValue(self.interrupt, 0),  # Clear interrupt
-            If(start_pulse,
-                NextValue(src, self.src_addr.storage),
-                NextValue(dst, self.dst_addr.storage),
-                NextValue(count, 0),
-                NextValue(busy, 1),
-                NextState("READ_REQUEST")
+        # # #
+        
+        snapshot = Signal()
+        clear    = Signal()
+        self.comb += [
+            snapshot.eq(self.control.re & self.control.storage[0]),
+            clear.eq(self.control.re & self.control.storage[1]),
+        ]
+        
+        cycles      = Signal(64)
+        busy        = Signal(64)
+        rd_stall    = Signal(64)
+        wr_stall    = Signal(64)
+        bytes_moved = Signal(64)
+        jobs        = Signal(32)
+        latency_min = Signal(32, reset=2**32 - 1)
+        latency_max = Signal(32)
+        latency     = Signal(32)  # Cycles since the last job_start
+        
+        self.sync += [
+            If(self.job_start,
+                latency.eq(1)
+            ).Elif(latency != (2**32 - 1),
+                latency.eq(latency + 1)
+            ),
+            If(clear,
+                cycles.eq(0),
+                busy.eq(0),
+                rd_stall.eq(0),
+                wr_stall.eq(0),
+                bytes_moved.eq(0),
+                jobs.eq(0),
+                latency_min.eq(2**32 - 1),
+                latency_max.eq(0)
+            ).Else(
+                cycles.eq(cycles + 1),
+                busy.eq(busy + self.busy),
+                rd_stall.eq(rd_stall + self.rd_stall),
+                wr_stall.eq(wr_stall + self.wr_stall),
+                bytes_moved.eq(bytes_moved + self.bytes),
+                If(self.job_done,
+                    jobs.eq(jobs + 1),
+                    If(latency < latency_min,
+                        latency_min.eq(latency)
+                    ),
+                    If(latency > latency_max,
+                        latency_max.eq(latency)
+                    )
+                )
+            ),
+            If(snapshot,
+                self.cycles.status.eq(cycles),
+                self.busy_cycles.status.eq(busy),
+                self.rd_stall_cycles.status.eq(rd_stall),
+                self.wr_stall_cycles.status.eq(wr_stall),
+                self.bytes_moved.status.eq(bytes_moved),
+                self.jobs.status.eq(jobs),
+                self.latency_min.status.eq(latency_min),
+                self.latency_max.status.eq(latency_max),
             )
-        )
+        ]
+
+
+# ====================================================================================================
+# DMA Engines - Reusable Wishbone Read/Write Masters
+# ====================================================================================================
+
+def dma_cmd_layout(address_width=32):
+    return [
+        ("address", address_width),  # Byte address (word aligned)
+        ("length",  32),             # Length in bytes (rounded up to whole words)
+    ]
+
+def dma_tail_sel(length, bytes_per_word):
+    """Byte enables of the last word of a `length`-byte transfer (all bytes if a full word)."""
+    if bytes_per_word == 1:
+        return Constant(1, 1)
+    masks = [2**bytes_per_word - 1] + [2**n - 1 for n in range(1, bytes_per_word)]
+    return Array(Constant(m, bytes_per_word) for m in masks)[length[:log2_int(bytes_per_word)]]
+
+def dma_2d_cmd_layout(address_width=32):
+    return dma_cmd_layout(address_width) + [
+        ("rows",   32),  # Number of rows of `length` bytes (0 = 1)
+        ("stride", 32),  # Bytes from the start of a row to the start of the next one
+    ]
+
+class DMA2DAddressGenerator(LiteXModule):
+    """
+    2D (rectangular) DMA address generator.
+    
+    Splits each command of `sink` (`rows` rows of `length` bytes, `stride` bytes apart) into
+    one `dma_cmd_layout` command per row on `source`, for a read or write engine. The first
+    row goes straight through, and each next row is offered as soon as the engine accepts the
+    previous one, so a whole tile runs as one job. `last` marks the last row; a command of 0
+    or 1 row is passed through unchanged.
+    
+    Parameters
+    ----------
+    address_width : int
+        Width of the byte addresses (default: 32)
+    """
+    
+    def __init__(self, address_width=32):
+        self.sink   = stream.Endpoint(dma_2d_cmd_layout(address_width))
+        self.source = stream.Endpoint(dma_cmd_layout(address_width))
         
-        self.fsm.act("READ_REQUEST",
-            # Issue read request to memory
-            self.wb_dma.stb.eq(1),
-            self.wb_dma.cyc.eq(1),
-            self.wb_dma.we.eq(0),
-            self.wb_dma.adr.eq(src >> 2),  # Word address (assuming 32-bit words)
-            self.wb_dma.sel.eq(2**(data_width//8) - 1),  # All bytes
-            
-            If(self.wb_dma.ack,
-                NextValue(data_buffer, self.wb_dma.dat_r),
-                NextState("WRITE_REQUEST")
+        # # #
+        
+        address   = Signal(address_width)
+        length    = Signal(32)
+        stride    = Signal(32)
+        rows_left = Signal(32)
+        
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            # First row
+            self.source.valid.eq(self.sink.valid),
+            self.source.address.eq(self.sink.address),
+            self.source.length.eq(self.sink.length),
+            self.source.last.eq(self.sink.rows <= 1),
+            self.sink.ready.eq(self.source.ready),
+            If(self.sink.valid & self.source.ready & (self.sink.rows > 1),
+                NextValue(address,   self.sink.address + self.sink.stride),
+                NextValue(length,    self.sink.length),
+                NextValue(stride,    self.sink.stride),
+                NextValue(rows_left, self.sink.rows - 1),
+                NextState("ROWS")
             )
         )
-        
-        self.fsm.act("WRITE_REQUEST",
-            # Issue write request to memory
-            self.wb_dma.stb.eq(1),
-            self.wb_dma.cyc.eq(1),
-            self.wb_dma.we.eq(1),
-            self.wb_dma.adr.eq(dst >> 2),  # Word address
-            self.wb_dma.dat_w.eq(data_buffer),
-            self.wb_dma.sel.eq(2**(data_width//8) - 1),  # All bytes
-            
-            If(self.wb_dma.ack,
-                NextValue(src, src + bytes_per_word),
-                NextValue(dst, dst + bytes_per_word),
-                NextValue(count, count + bytes_per_word),
-                
-                # Check if done
-                If(count + bytes_per_word >= self.length.storage,
-                    NextValue(busy, 0),
-                    NextValue(done, 1),
-                    NextState("DONE")
-                ).Else(
-                    NextState("READ_REQUEST")
+        fsm.act("ROWS",
+            self.source.valid.eq(1),
+            self.source.address.eq(address),
+            self.source.length.eq(length),
+            self.source.last.eq(rows_left == 1),
+            If(self.source.ready,
+                NextValue(address,   address + stride),
+                NextValue(rows_left, rows_left - 1),
+                If(rows_left == 1,
+                    NextState("IDLE")
                 )
             )
         )
+
+class BurstDMAReader(LiteXModule):
+    """
+    Wishbone DMA read master.
+    
+    Accepts read commands on `cmd`, fetches the words from memory and streams them out on
+    `source` (with `last` on the final word of each command). With `burst` set, reads are
+    issued as incrementing-address bursts of up to `burst_beats` words; otherwise classic
+    single-beat cycles are used. The master inserts wait states (drops `stb`) while `source`
+    is not ready, so it can feed a FIFO directly. `stall` is high while a read waits for `ack`.
+    
+    Parameters
+    ----------
+    bus : wishbone.Interface
+        Wishbone master interface driven by this engine
+    burst_length : int
+        Maximum number of beats per burst (default: 16)
+    """
+    
+    def __init__(self, bus, burst_length=16):
+        data_width    = len(bus.dat_r)
+        address_width = len(bus.adr) + log2_int(data_width // 8)  # Byte addresses (bus: word addresses)
         
-        self.fsm.act("DONE",
-            # Generate interrupt and return to IDLE
-            NextValue(self.interrupt, 1),
-            NextState("IDLE")
-        )
+        self.bus    = bus
+        self.cmd    = stream.Endpoint(dma_cmd_layout(address_width))
+        self.source = stream.Endpoint([("data", data_width)])
+        self.stall  = Signal()
         
-        # Connect status outputs
+        # Burst configuration (static during a command)
+        self.burst       = Signal()                      # Enable incrementing bursts
+        self.burst_beats = Signal(bits_for(burst_length))  # Beats per burst (0 = burst_length)
+        
+        # # #
+        
+        word_shift = log2_int(data_width // 8)
+        
+        address    = Signal(address_width)
+        words_left = Signal(32)
+        beats_max  = Signal(bits_for(burst_length))
+        beats      = Signal(bits_for(burst_length))
+        beat       = Signal(bits_for(burst_length))
+        last_beat  = Signal()
         self.comb += [
-            self.status.status[0].eq(busy),
-            self.status.status[1].eq(done),
-            self.status.status[2].eq(error),
-            self.progress.status.eq(count),
+            If(~self.burst,
+                beats_max.eq(1)
+            ).Elif((self.burst_beats == 0) | (self.burst_beats > burst_length),
+                beats_max.eq(burst_length)
+            ).Else(
+                beats_max.eq(self.burst_beats)
+            ),
+            last_beat.eq(beat == (beats - 1)),
+            self.stall.eq(bus.cyc & bus.stb & ~bus.ack),
         ]
+        
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            self.cmd.ready.eq(1),
+            If(self.cmd.valid,
+                NextValue(address, self.cmd.address >> word_shift),
+                NextValue(words_left, (self.cmd.length + (2**word_shift - 1)) >> word_shift),
+                NextState("BURST_SETUP")
+            )
+        )
+        fsm.act("BURST_SETUP",
+            NextValue(beat, 0),
+            If(words_left == 0,
+                NextState("IDLE")
+            ).Elif(words_left < beats_max,
+                NextValue(beats, words_left),
+                NextState("READ")
+            ).Else(
+                NextValue(beats, beats_max),
+                NextState("READ")
+            )
+        )
+        fsm.act("READ",
+            bus.cyc.eq(1),
+            bus.stb.eq(self.source.ready),  # Wait state while the consumer is full
+            bus.we.eq(0),
+            bus.adr.eq(address + beat),
+            bus.sel.eq(2**len(bus.sel) - 1),
+            If(~self.burst,
+                bus.cti.eq(0b000)  # Classic cycle
+            ).Elif(last_beat,
+                bus.cti.eq(0b111)  # End of burst
+            ).Else(
+                bus.cti.eq(0b010)  # Incrementing-address burst
+            ),
+            bus.bte.eq(0b00),      # Linear burst
+            self.source.valid.eq(bus.stb & bus.ack),
+            self.source.last.eq(last_beat & (words_left == beats)),
+            self.source.data.eq(bus.dat_r),
+            If(bus.stb & bus.ack,
+                NextValue(beat, beat + 1),
+                If(last_beat,
+                    NextValue(address, address + beats),
+                    NextValue(words_left, words_left - beats),
+                    NextState("BURST_SETUP")
+                )
+            )
+        )
 
 
-# ====================================================================================================
-# Example: Stream-Based Processing
-# ====================================================================================================
-
-class StreamProcessor(LiteXModule):
+class BurstDMAWriter(LiteXModule):
     """
-    Example stream-based processor.
+    Wishbone DMA write master.
     
-    Use this pattern for video processing, DSP, or any streaming data application.
+    Accepts write commands on `cmd` and writes the words received on `sink` to memory, as
+    incrementing-address bursts when `burst` is set. The master inserts wait states while
+    `sink` has no data. When the length is not a multiple of the word size, only the valid
+    bytes of the last word are written (`sel`). `done` pulses once the last word of a command
+    has been acknowledged. `stall` is high while a write waits for `ack`.
+    
+    Parameters
+    ----------
+    bus : wishbone.Interface
+        Wishbone master interface driven by this engine
+    burst_length : int
+        Maximum number of beats per burst (default: 16)
     """
     
-    def __init__(self, data_width=32):
-        # Stream interfaces
-        self.sink = stream.Endpoint([("data", data_width)])
-        self.source = stream.Endpoint([("data", data_width)])
+    def __init__(self, bus, burst_length=16):
+        data_width    = len(bus.dat_w)
+        address_width = len(bus.adr) + log2_int(data_width // 8)  # Byte addresses (bus: word addresses)
         
-        # CSR for configuration
-        self.control = CSRStorage(32, description="Control register")
-        self.status = CSRStatus(32, description="Status register")
+        self.bus   = bus
+        self.cmd   = stream.Endpoint(dma_cmd_layout(address_width))
+        self.sink  = stream.Endpoint([("data", data_width)])
+        self.done  = Signal()
+        self.stall = Signal()
         
-        # TODO: Add your stream processing logic here
-        # Example: pass-through (just connect sink to source)
+        # Burst configuration (static during a command)
+        self.burst       = Signal()                      # Enable incrementing bursts
+        self.burst_beats = Signal(bits_for(burst_length))  # Beats per burst (0 = burst_length)
+        
+        # # #
+        
+        bytes_per_word = data_width // 8
+        word_shift     = log2_int(bytes_per_word)
+        
+        address    = Signal(address_width)
+        words_left = Signal(32)
+        tail_sel   = Signal(bytes_per_word)  # Byte enables of the last word
+        last_word  = Signal()
+        beats_max  = Signal(bits_for(burst_length))
+        beats      = Signal(bits_for(burst_length))
+        beat       = Signal(bits_for(burst_length))
+        last_beat  = Signal()
         self.comb += [
-            self.source.valid.eq(self.sink.valid),
-            self.source.data.eq(self.sink.data),  # Replace with your processing
-            self.sink.ready.eq(self.source.ready),
+            If(~self.burst,
+                beats_max.eq(1)
+            ).Elif((self.burst_beats == 0) | (self.burst_beats > burst_length),
+                beats_max.eq(burst_length)
+            ).Else(
+                beats_max.eq(self.burst_beats)
+            ),
+            last_beat.eq(beat == (beats - 1)),
+            last_word.eq(last_beat & (words_left == beats)),
+            self.stall.eq(bus.cyc & bus.stb & ~bus.ack),
         ]
+        
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            self.cmd.ready.eq(1),
+            If(self.cmd.valid,
+                NextValue(address, self.cmd.address >> word_shift),
+                NextValue(words_left, (self.cmd.length + (2**word_shift - 1)) >> word_shift),
+                NextValue(tail_sel, dma_tail_sel(self.cmd.length, bytes_per_word)),
+                NextState("BURST_SETUP")
+            )
+        )
+        fsm.act("BURST_SETUP",
+            NextValue(beat, 0),
+            If(words_left == 0,
+                self.done.eq(1),
+                NextState("IDLE")
+            ).Elif(words_left < beats_max,
+                NextValue(beats, words_left),
+                NextState("WRITE")
+            ).Else(
+                NextValue(beats, beats_max),
+                NextState("WRITE")
+            )
+        )
+        fsm.act("WRITE",
+            bus.cyc.eq(1),
+            bus.stb.eq(self.sink.valid),  # Wait state while the producer is empty
+            bus.we.eq(1),
+            bus.adr.eq(address + beat),
+            bus.sel.eq(Mux(last_word, tail_sel, 2**bytes_per_word - 1)),
+            bus.dat_w.eq(self.sink.data),
+            If(~self.burst,
+                bus.cti.eq(0b000)  # Classic cycle
+            ).Elif(last_beat,
+                bus.cti.eq(0b111)  # End of burst
+            ).Else(
+                bus.cti.eq(0b010)  # Incrementing-address burst
+            ),
+            bus.bte.eq(0b00),      # Linear burst
+            self.sink.ready.eq(bus.stb & bus.ack),
+            If(bus.stb & bus.ack,
+                NextValue(beat, beat + 1),
+                If(last_beat,
+                    NextValue(address, address + beats),
+                    NextValue(words_left, words_left - beats),
+                    NextState("BURST_SETUP")
+                )
+            )
+        )
 
 
-# ====================================================================================================
-# SHA3 Accelerator - Cryptographic Hash Function
-# ====================================================================================================
-
-class SHA3Accelerator(LiteXModule):
+class NativeDMAReader(LiteXModule):
     """
-    SHA3 (Keccak) Hardware Accelerator.
+    LiteDRAM native-port DMA read engine.
     
-    Placeholder implementation for SHA3 hashing accelerator with DMA support.
-    This accelerator can hash data from memory and return the digest.
-    
-    Supported SHA3 variants:
-    - SHA3-224 (224-bit output)
-    - SHA3-256 (256-bit output)
-    - SHA3-384 (384-bit output)
-    - SHA3-512 (512-bit output)
+    Same command/stream interface as `BurstDMAReader`, but reads straight from a LiteDRAM
+    crossbar port through `LiteDRAMDMAReader`, which keeps up to `fifo_depth` reads in flight.
+    This bypasses the SoC DMA bus and therefore CPU cache coherency. `stall` is high while
+    reads are outstanding and no data is returned.
     
     Parameters
     ----------
-    data_width : int
-        Width of the DMA data bus (default: 64 bits for efficiency)
+    port : LiteDRAMNativePort
+        Read (or read/write) port from `sdram.crossbar.get_port()`
     address_width : int
-        Width of the address bus (default: 32 bits)
-    
-    Attributes
-    ----------
-    wb_dma : wishbone.Interface
-        Wishbone master interface for reading input data via DMA
-    interrupt : Signal
-        Interrupt signal to notify CPU of completion
-    control : CSRStorage
-        Control register (bit 0: start, bits 2-1: mode)
-    status : CSRStatus
-        Status register (bit 0: busy, bit 1: done, bit 2: error)
-    input_addr : CSRStorage
-        Memory address of input data
-    input_length : CSRStorage
-        Length of input data in bytes
-    hash_output : CSRStatus (multiple)
-        Hash output registers (digest result)
+        Width of the byte addresses in commands (default: 32 bits)
+    dram_base : int
+        Bus address of the start of DRAM, subtracted from command addresses (default: 0x40000000)
+    fifo_depth : int
+        Maximum number of outstanding reads (default: 16)
     """
     
-    def __init__(self, data_width=64, address_width=32):
-        # ========================================================================================
-        # CSR Registers - Control Interface
-        # ========================================================================================
-        self.control      = CSRStorage(32, description="Control: bit 0=start, bits[2:1]=mode (00=SHA3-256, 01=SHA3-224, 10=SHA3-384, 11=SHA3-512)")
-        self.status       = CSRStatus(32, description="Status: bit 0=busy, bit 1=done, bit 2=error")
-        self.input_addr   = CSRStorage(address_width, description="Input data memory address")
-        self.input_length = CSRStorage(32, description="Input data length in bytes")
+    def __init__(self, port, address_width=32, dram_base=0x40000000, fifo_depth=16):
+        data_width = port.data_width
         
-        # Hash output registers (8x 64-bit = 512 bits max for SHA3-512)
-        # For SHA3-256, only first 4 registers are used (256 bits)
-        self.hash_out0 = CSRStatus(32, description="Hash output word 0 (bits 31:0)")
-        self.hash_out1 = CSRStatus(32, description="Hash output word 1 (bits 63:32)")
-        self.hash_out2 = CSRStatus(32, description="Hash output word 2 (bits 95:64)")
-        self.hash_out3 = CSRStatus(32, description="Hash output word 3 (bits 127:96)")
-        self.hash_out4 = CSRStatus(32, description="Hash output word 4 (bits 159:128)")
-        self.hash_out5 = CSRStatus(32, description="Hash output word 5 (bits 191:160)")
-        self.hash_out6 = CSRStatus(32, description="Hash output word 6 (bits 223:192)")
-        self.hash_out7 = CSRStatus(32, description="Hash output word 7 (bits 255:224)")
-        self.hash_out8 = CSRStatus(32, description="Hash output word 8 (bits 287:256)")
-        self.hash_out9 = CSRStatus(32, description="Hash output word 9 (bits 319:288)")
-        self.hash_out10 = CSRStatus(32, description="Hash output word 10 (bits 351:320)")
-        self.hash_out11 = CSRStatus(32, description="Hash output word 11 (bits 383:352)")
-        self.hash_out12 = CSRStatus(32, description="Hash output word 12 (bits 415:384)")
-        self.hash_out13 = CSRStatus(32, description="Hash output word 13 (bits 447:416)")
-        self.hash_out14 = CSRStatus(32, description="Hash output word 14 (bits 479:448)")
-        self.hash_out15 = CSRStatus(32, description="Hash output word 15 (bits 511:480)")
+        self.cmd    = stream.Endpoint(dma_cmd_layout(address_width))
+        self.source = stream.Endpoint([("data", data_width)])
+        self.stall  = Signal()
         
-        # ========================================================================================
-        # DMA Interface - For reading input data from memory
-        # ========================================================================================
-        self.wb_dma = wishbone.Interface(data_width=data_width, address_width=address_width)
+        # Burst configuration (unused: the native port pipelines every access)
+        self.burst       = Signal()
+        self.burst_beats = Signal(8)
         
-        # ========================================================================================
-        # Interrupt Signal
-        # ========================================================================================
-        self.interrupt = Signal()
+        # # #
         
-        # ========================================================================================
-        # Internal State
-        # ========================================================================================
-        # Keccak state array (1600 bits = 5x5x64 bits)
-        # This is the core SHA3 state that gets permuted
-        state = Array([Signal(64) for _ in range(25)])
+        word_shift = log2_int(data_width // 8)
         
-        # Hash output buffer (512 bits max)
-        hash_output = Signal(512)
+        self.dma = LiteDRAMDMAReader(port, fifo_depth=fifo_depth, fifo_buffered=True)
         
-        # Control signals
-        start = Signal()
-        busy = Signal()
-        done = Signal()
-        error = Signal()
+        address      = Signal(port.address_width)
+        words_issue  = Signal(32)  # Reads still to be issued
+        words_return = Signal(32)  # Reads still to be returned
         
-        # DMA state
-        bytes_read = Signal(32)
-        current_addr = Signal(address_width)
-        data_buffer = Signal(data_width)
+        # Accept a new command once the previous one has fully returned
+        self.comb += self.cmd.ready.eq(words_return == 0)
+        self.sync += [
+            If(self.cmd.valid & self.cmd.ready,
+                address.eq((self.cmd.address - dram_base) >> word_shift),
+                words_issue.eq((self.cmd.length + (2**word_shift - 1)) >> word_shift),
+                words_return.eq((self.cmd.length + (2**word_shift - 1)) >> word_shift),
+            ).Else(
+                If(self.dma.sink.valid & self.dma.sink.ready,
+                    address.eq(address + 1),
+                    words_issue.eq(words_issue - 1),
+                ),
+                If(self.source.valid & self.source.ready,
+                    words_return.eq(words_return - 1),
+                ),
+            )
+        ]
         
-        # SHA3 mode (00=256, 01=224, 10=384, 11=512)
-        sha3_mode = Signal(2)
+        # Issue addresses as fast as the port accepts them
+        self.comb += [
+            self.dma.sink.valid.eq(words_issue != 0),
+            self.dma.sink.last.eq(words_issue == 1),
+            self.dma.sink.address.eq(address),
+        ]
         
-        # Detect start edge
-        start_d = Signal()
-        self.sync += start_d.eq(self.control.storage[0])
+        # Return data
         self.comb += [
-            start.eq(self.control.storage[0] & ~start_d),
-            sha3_mode.eq(self.control.storage[2:1]),
+            self.dma.source.connect(self.source, omit={"last"}),
+            self.source.last.eq(words_return == 1),
+            self.stall.eq((words_return != 0) & ~self.dma.source.valid),
         ]
+
+
+class NativeDMAWriter(LiteXModule):
+    """
+    LiteDRAM native-port DMA write engine.
+    
+    Same command/stream interface as `BurstDMAWriter`, but writes straight to a LiteDRAM
+    crossbar port through `LiteDRAMDMAWriter`. Only the valid bytes of a partial last word
+    are written. `done` pulses once every word of the command has been handed to the port.
+    This bypasses the SoC DMA bus and therefore CPU cache coherency. `stall` is high while
+    the port holds off write data.
+    
+    Parameters
+    ----------
+    port : LiteDRAMNativePort
+        Write (or read/write) port from `sdram.crossbar.get_port()`
+    address_width : int
+        Width of the byte addresses in commands (default: 32 bits)
+    dram_base : int
+        Bus address of the start of DRAM, subtracted from command addresses (default: 0x40000000)
+    fifo_depth : int
+        Depth of the write data FIFO (default: 16)
+    """
+    
+    def __init__(self, port, address_width=32, dram_base=0x40000000, fifo_depth=16):
+        data_width = port.data_width
         
-        # ========================================================================================
-        # Placeholder FSM - Replace with actual SHA3 implementation
-        # ========================================================================================
-        # A real SHA3 accelerator would have states for:
-        # 1. INIT - Initialize Keccak state
-        # 2. ABSORB - Read input blocks via DMA and absorb into state
-        # 3. PERMUTE - Perform Keccak-f[1600] permutation rounds
-        # 4. SQUEEZE - Extract hash output from state
-        # 5. DONE - Signal completion
+        self.cmd   = stream.Endpoint(dma_cmd_layout(address_width))
+        self.sink  = stream.Endpoint([("data", data_width)])
+        self.done  = Signal()
+        self.stall = Signal()
         
-        round_counter = Signal(8)  # SHA3 uses 24 rounds
-        block_counter = Signal(32)
+        # Burst configuration (unused: the native port pipelines every access)
+        self.burst       = Signal()
+        self.burst_beats = Signal(8)
         
-        self.submodules.fsm = FSM(reset_state="IDLE")
+        # # #
         
-        self.fsm.act("IDLE",
-            NextValue(busy, 0),
-            NextValue(done, 0),
-            NextValue(error, 0),
-            If(start,
-                NextValue(busy, 1),
-                NextValue(current_addr, self.input_addr.storage),
-                NextValue(bytes_read, 0),
-                NextValue(round_counter, 0),
-                # Initialize state to zero
-                # TODO: Initialize all 25 state words to 0
-                NextState("INIT")
-            )
-        )
+        bytes_per_word = data_width // 8
+        word_shift     = log2_int(bytes_per_word)
         
-        self.fsm.act("INIT",
-            # Initialize Keccak state
-            # TODO: Implement proper initialization
-            NextState("ABSORB_READ")
-        )
+        address    = Signal(port.address_width)
+        words_left = Signal(32)
+        tail_sel   = Signal(bytes_per_word)
         
-        self.fsm.act("ABSORB_READ",
-            # Read input data from memory via DMA
-            self.wb_dma.stb.eq(1),
-            self.wb_dma.cyc.eq(1),
-            self.wb_dma.we.eq(0),
-            self.wb_dma.adr.eq(current_addr >> 3),  # 64-bit word address
-            self.wb_dma.sel.eq(0xFF if data_width == 64 else 0xF),
-            
-            If(self.wb_dma.ack,
-                NextValue(data_buffer, self.wb_dma.dat_r),
-                NextState("ABSORB_XOR")
+        # LiteDRAMDMAWriter always writes whole words: run it on an inner port and apply the
+        # byte enables of each word on the way out to the real port.
+        inner = LiteDRAMNativePort(port.mode, port.address_width, data_width)
+        self.dma     = LiteDRAMDMAWriter(inner, fifo_depth=fifo_depth, fifo_buffered=True)
+        self.we_fifo = stream.SyncFIFO([("we", bytes_per_word)], depth=fifo_depth + 2)
+        self.comb += [
+            inner.cmd.connect(port.cmd),
+            inner.wdata.connect(port.wdata, omit={"we"}),
+            port.wdata.we.eq(self.we_fifo.source.we),
+            self.we_fifo.source.ready.eq(port.wdata.valid & port.wdata.ready),
+            self.we_fifo.sink.valid.eq(self.dma.sink.valid & self.dma.sink.ready),
+            self.we_fifo.sink.we.eq(Mux(words_left == 1, tail_sel, 2**bytes_per_word - 1)),
+        ]
+        
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            self.cmd.ready.eq(1),
+            If(self.cmd.valid,
+                NextValue(address, (self.cmd.address - dram_base) >> word_shift),
+                NextValue(words_left, (self.cmd.length + (2**word_shift - 1)) >> word_shift),
+                NextValue(tail_sel, dma_tail_sel(self.cmd.length, bytes_per_word)),
+                NextState("WRITE")
             )
         )
-        
-        self.fsm.act("ABSORB_XOR",
-            # XOR input block into state
-            # TODO: Implement absorption (XOR input into state)
-            # state[block_index] ^= data_buffer
-            NextValue(current_addr, current_addr + (data_width // 8)),
-            NextValue(bytes_read, bytes_read + (data_width // 8)),
-            
-            # Check if we've processed all input or filled a rate block
-            If(bytes_read >= self.input_length.storage,
-                NextState("PERMUTE")
+        fsm.act("WRITE",
+            If(words_left == 0,
+                NextState("FLUSH")
             ).Else(
-                NextState("ABSORB_READ")
+                self.dma.sink.valid.eq(self.sink.valid),
+                self.dma.sink.address.eq(address),
+                self.dma.sink.data.eq(self.sink.data),
+                self.sink.ready.eq(self.dma.sink.ready),
+                If(self.sink.valid & self.sink.ready,
+                    NextValue(address, address + 1),
+                    NextValue(words_left, words_left - 1),
+                )
             )
         )
+        fsm.act("FLUSH",
+            # Wait until the write data FIFO has drained into the port
+            If(~self.dma.fifo.source.valid,
+                self.done.eq(1),
+                NextState("IDLE")
+            )
+        )
+        self.comb += self.stall.eq((self.dma.sink.valid & ~self.dma.sink.ready) | (fsm.ongoing("FLUSH") & self.dma.fifo.source.valid))
+
+
+class AXIDMAReader(LiteXModule):
+    """
+    AXI4 DMA read master with multiple outstanding bursts.
+    
+    Same command/stream interface as `BurstDMAReader`, on an AXI4 master that keeps up to
+    `max_outstanding` read bursts in flight, so the memory latency is paid once per command
+    instead of once per burst. Bursts are INCR, of up to `burst_beats` words with `burst` set
+    (single words otherwise), and never cross a 4 KB boundary. Each burst in flight has its
+    own ARID and its own slot of a reorder buffer: data returned out of order across IDs is
+    still streamed out on `source` in address order. A burst is only issued when its slot is
+    free, so R is never back-pressured. `stall` is high while reads are outstanding and no
+    data is available.
+    
+    Parameters
+    ----------
+    bus : axi.AXIInterface
+        AXI4 master interface driven by this engine (IDs 0 to `max_outstanding` - 1)
+    burst_length : int
+        Maximum number of beats per burst, up to 256 (default: 16)
+    max_outstanding : int
+        Maximum number of read bursts in flight (default: 4)
+    """
+    
+    def __init__(self, bus, burst_length=16, max_outstanding=4):
+        data_width    = len(bus.r.data)
+        address_width = len(bus.ar.addr)
+        assert burst_length <= 256
+        assert max_outstanding <= 2**len(bus.ar.id)
+        
+        self.bus    = bus
+        self.cmd    = stream.Endpoint(dma_cmd_layout(address_width))
+        self.source = stream.Endpoint([("data", data_width)])
+        self.stall  = Signal()
+        
+        # Burst configuration (static during a command)
+        self.burst       = Signal()                      # Enable incrementing bursts
+        self.burst_beats = Signal(bits_for(burst_length))  # Beats per burst (0 = burst_length)
+        
+        # # #
+        
+        bytes_per_word = data_width // 8
+        word_shift     = log2_int(bytes_per_word)
+        page_words     = 4096 // bytes_per_word
+        slots          = max_outstanding
+        
+        # Burst sizing: min(burst beats, words left, words to the next 4 KB boundary)
+        address    = Signal(address_width - word_shift)  # Word address
+        words_left = Signal(32)                          # Words not requested yet
+        beats_max  = Signal(bits_for(burst_length))
+        beats      = Signal(bits_for(burst_length))
+        page_left  = Signal(bits_for(page_words))
+        self.comb += [
+            If(~self.burst,
+                beats_max.eq(1)
+            ).Elif((self.burst_beats == 0) | (self.burst_beats > burst_length),
+                beats_max.eq(burst_length)
+            ).Else(
+                beats_max.eq(self.burst_beats)
+            ),
+            page_left.eq(page_words - address[:log2_int(page_words)]),
+            If((words_left < beats_max) & (words_left < page_left),
+                beats.eq(words_left)
+            ).Elif(page_left < beats_max,
+                beats.eq(page_left)
+            ).Else(
+                beats.eq(beats_max)
+            ),
+        ]
+        
+        # Reorder buffer: one slot of burst_length words per burst in flight, allocated in
+        # issue order (the slot index is the ARID) and streamed out in the same order
+        slot_beats = Array(Signal(bits_for(burst_length)) for _ in range(slots))  # Burst length
+        slot_count = Array(Signal(bits_for(burst_length)) for _ in range(slots))  # Beats received
+        slot_last  = Array(Signal() for _ in range(slots))                         # Last burst of a command
+        issue_slot = Signal(max=max(slots, 2))
+        head_slot  = Signal(max=max(slots, 2))
+        head_beat  = Signal(bits_for(burst_length))
+        in_flight  = Signal(bits_for(slots))  # Slots allocated and not fully streamed out
+        
+        mem    = Memory(data_width, slots*burst_length)  # Not an attribute: kept out of the CSR map
+        wrport = mem.get_port(write_capable=True)
+        rdport = mem.get_port(async_read=True)
+        self.specials += mem, wrport, rdport
+        
+        # Commands: accepted once the previous one is fully requested
+        ar = bus.ar
+        self.comb += self.cmd.ready.eq(words_left == 0)
+        
+        # AR: issue a burst whenever a slot is free
+        self.comb += [
+            ar.valid.eq((words_left != 0) & (in_flight != slots)),
+            ar.addr.eq(address << word_shift),
+            ar.burst.eq(0b01),  # INCR
+            ar.len.eq(beats - 1),
+            ar.size.eq(word_shift),
+            ar.id.eq(issue_slot),
+        ]
+        self.sync += [
+            If(self.cmd.valid & self.cmd.ready,
+                address.eq(self.cmd.address >> word_shift),
+                words_left.eq((self.cmd.length + (bytes_per_word - 1)) >> word_shift),
+            ),
+            If(ar.valid & ar.ready,
+                address.eq(address + beats),
+                words_left.eq(words_left - beats),
+                slot_beats[issue_slot].eq(beats),
+                slot_count[issue_slot].eq(0),
+                slot_last[issue_slot].eq(words_left == beats),
+                issue_slot.eq(Mux(issue_slot == (slots - 1), 0, issue_slot + 1)),
+            ),
+        ]
+        
+        # R: store each beat in the slot of its ID
+        r      = bus.r
+        r_slot = Signal(max=max(slots, 2))
+        self.comb += [
+            r.ready.eq(1),
+            r_slot.eq(r.id),
+            wrport.adr.eq(r_slot*burst_length + slot_count[r_slot]),
+            wrport.dat_w.eq(r.data),
+            wrport.we.eq(r.valid),
+        ]
+        self.sync += If(r.valid, slot_count[r_slot].eq(slot_count[r_slot] + 1))
+        
+        # Stream out the head slot as its beats arrive
+        head_valid = Signal()
+        head_end   = Signal()
+        self.comb += [
+            head_valid.eq((in_flight != 0) & (head_beat != slot_count[head_slot])),
+            head_end.eq(head_beat == (slot_beats[head_slot] - 1)),
+            rdport.adr.eq(head_slot*burst_length + head_beat),
+            self.source.valid.eq(head_valid),
+            self.source.last.eq(head_end & slot_last[head_slot]),
+            self.source.data.eq(rdport.dat_r),
+            self.stall.eq((in_flight != 0) & ~head_valid),
+        ]
+        self.sync += [
+            If(self.source.valid & self.source.ready,
+                head_beat.eq(head_beat + 1),
+                If(head_end,
+                    head_beat.eq(0),
+                    head_slot.eq(Mux(head_slot == (slots - 1), 0, head_slot + 1)),
+                )
+            ),
+            in_flight.eq(in_flight + (ar.valid & ar.ready) - (self.source.valid & self.source.ready & head_end)),
+        ]
+
+
+class AXIDMAWriter(LiteXModule):
+    """
+    AXI4 DMA write master with multiple outstanding bursts.
+    
+    Same command/stream interface as `BurstDMAWriter`, on an AXI4 master that keeps up to
+    `max_outstanding` write bursts waiting for their response. AW runs ahead of the data, so
+    the next burst is already addressed while the current one is written. Bursts are INCR,
+    sized as in `AXIDMAReader`, and tagged with rotating AWIDs. Only the valid bytes of a
+    partial last word are written (`strb`). `done` pulses once every burst of the command
+    has its write response. `stall` is high while AW or W is held off.
+    
+    Parameters
+    ----------
+    bus : axi.AXIInterface
+        AXI4 master interface driven by this engine (IDs 0 to `max_outstanding` - 1)
+    burst_length : int
+        Maximum number of beats per burst, up to 256 (default: 16)
+    max_outstanding : int
+        Maximum number of write bursts waiting for a response (default: 4)
+    """
+    
+    def __init__(self, bus, burst_length=16, max_outstanding=4):
+        data_width    = len(bus.w.data)
+        address_width = len(bus.aw.addr)
+        assert burst_length <= 256
+        assert max_outstanding <= 2**len(bus.aw.id)
+        
+        self.bus   = bus
+        self.cmd   = stream.Endpoint(dma_cmd_layout(address_width))
+        self.sink  = stream.Endpoint([("data", data_width)])
+        self.done  = Signal()
+        self.stall = Signal()
+        
+        # Burst configuration (static during a command)
+        self.burst       = Signal()                      # Enable incrementing bursts
+        self.burst_beats = Signal(bits_for(burst_length))  # Beats per burst (0 = burst_length)
+        
+        # # #
+        
+        bytes_per_word = data_width // 8
+        word_shift     = log2_int(bytes_per_word)
+        page_words     = 4096 // bytes_per_word
+        
+        # Burst sizing: min(burst beats, words left, words to the next 4 KB boundary)
+        address    = Signal(address_width - word_shift)  # Word address
+        words_left = Signal(32)                          # Words not addressed yet (AW)
+        beats_max  = Signal(bits_for(burst_length))
+        beats      = Signal(bits_for(burst_length))
+        page_left  = Signal(bits_for(page_words))
+        self.comb += [
+            If(~self.burst,
+                beats_max.eq(1)
+            ).Elif((self.burst_beats == 0) | (self.burst_beats > burst_length),
+                beats_max.eq(burst_length)
+            ).Else(
+                beats_max.eq(self.burst_beats)
+            ),
+            page_left.eq(page_words - address[:log2_int(page_words)]),
+            If((words_left < beats_max) & (words_left < page_left),
+                beats.eq(words_left)
+            ).Elif(page_left < beats_max,
+                beats.eq(page_left)
+            ).Else(
+                beats.eq(beats_max)
+            ),
+        ]
+        
+        busy        = Signal()                       # Command in progress
+        data_left   = Signal(32)                     # Words not written yet (W)
+        tail_sel    = Signal(bytes_per_word)         # Byte enables of the last word
+        aw_id       = Signal(max=max(max_outstanding, 2))
+        outstanding = Signal(bits_for(max_outstanding))  # Bursts addressed, response pending
+        
+        # Burst lengths, from AW to W (W follows the AW order)
+        self.bursts = stream.SyncFIFO([("beats", bits_for(burst_length))], depth=max_outstanding)
+        
+        # Commands: accepted once the previous one is done
+        self.comb += self.cmd.ready.eq(~busy)
+        
+        # AW: address a burst whenever a response slot is free
+        aw = bus.aw
+        self.comb += [
+            aw.valid.eq((words_left != 0) & (outstanding != max_outstanding) & self.bursts.sink.ready),
+            aw.addr.eq(address << word_shift),
+            aw.burst.eq(0b01),  # INCR
+            aw.len.eq(beats - 1),
+            aw.size.eq(word_shift),
+            aw.id.eq(aw_id),
+            self.bursts.sink.valid.eq(aw.valid & aw.ready),
+            self.bursts.sink.beats.eq(beats),
+        ]
+        
+        # W: stream the data of the addressed bursts
+        w    = bus.w
+        beat = Signal(bits_for(burst_length))
+        self.comb += [
+            w.valid.eq(self.sink.valid & self.bursts.source.valid),
+            w.data.eq(self.sink.data),
+            w.strb.eq(Mux(data_left == 1, tail_sel, 2**bytes_per_word - 1)),
+            w.last.eq(beat == (self.bursts.source.beats - 1)),
+            self.sink.ready.eq(w.ready & self.bursts.source.valid),
+            self.bursts.source.ready.eq(w.valid & w.ready & w.last),
+        ]
+        
+        # B: count the responses
+        b = bus.b
+        self.comb += b.ready.eq(1)
+        
+        self.sync += [
+            If(self.cmd.valid & self.cmd.ready,
+                busy.eq(1),
+                address.eq(self.cmd.address >> word_shift),
+                words_left.eq((self.cmd.length + (bytes_per_word - 1)) >> word_shift),
+                data_left.eq((self.cmd.length + (bytes_per_word - 1)) >> word_shift),
+                tail_sel.eq(dma_tail_sel(self.cmd.length, bytes_per_word)),
+            ),
+            If(aw.valid & aw.ready,
+                address.eq(address + beats),
+                words_left.eq(words_left - beats),
+                aw_id.eq(Mux(aw_id == (max_outstanding - 1), 0, aw_id + 1)),
+            ),
+            If(w.valid & w.ready,
+                beat.eq(beat + 1),
+                data_left.eq(data_left - 1),
+                If(w.last,
+                    beat.eq(0)
+                )
+            ),
+            outstanding.eq(outstanding + (aw.valid & aw.ready) - b.valid),
+            If(self.done,
+                busy.eq(0)
+            ),
+        ]
+        self.comb += [
+            self.done.eq(busy & (words_left == 0) & (data_left == 0) & (outstanding == 0)),
+            self.stall.eq((aw.valid & ~aw.ready) | (w.valid & ~w.ready)),
+        ]
+
+
+def _dma_engines(data_width, address_width, burst_length, bus_standard="wishbone", max_outstanding=4,
+    read_port=None, write_port=None, dram_base=0x40000000, with_compare=False, compare_port=None):
+    """
+    Read and write engines of a DMA accelerator (and the compare reader of `SimpleDMAEngine`).
+    
+    Each engine uses its LiteDRAM port when given (`NativeDMAReader`/`NativeDMAWriter`, the
+    compare reader `compare_port` with `read_port`), else a master of its own: AXI4
+    (`AXIDMAReader`/`AXIDMAWriter`) with `bus_standard="axi"`, Wishbone (`BurstDMAReader`/
+    `BurstDMAWriter`) otherwise.
+    
+    Returns `(reader, writer, cmp_reader, masters)`: `cmp_reader` is None without
+    `with_compare`, `masters` maps the `dma_masters` names (`dma_rd`, `dma_wr`, `dma_cmp`) to
+    the master buses.
+    """
+    # Masters in locals named after the accelerator attributes (wb_dma_rd, ...) for the signal names
+    assert bus_standard in ["wishbone", "axi"]
+    axi_id_width = bits_for(max_outstanding - 1)
+    masters = {}
+    if read_port is not None:
+        assert read_port.data_width == data_width
+        reader = NativeDMAReader(read_port, address_width=address_width, dram_base=dram_base)
+    elif bus_standard == "axi":
+        axi_dma_rd = axi.AXIInterface(data_width=data_width, address_width=address_width, id_width=axi_id_width, bursting=True)
+        masters["dma_rd"] = axi_dma_rd
+        reader = AXIDMAReader(axi_dma_rd, burst_length=burst_length, max_outstanding=max_outstanding)
+    else:
+        wb_dma_rd = wishbone.Interface(data_width=data_width, address_width=address_width)
+        masters["dma_rd"] = wb_dma_rd
+        reader = BurstDMAReader(wb_dma_rd, burst_length=burst_length)
+    if write_port is not None:
+        assert write_port.data_width == data_width
+        writer = NativeDMAWriter(write_port, address_width=address_width, dram_base=dram_base)
+    elif bus_standard == "axi":
+        axi_dma_wr = axi.AXIInterface(data_width=data_width, address_width=address_width, id_width=axi_id_width, bursting=True)
+        masters["dma_wr"] = axi_dma_wr
+        writer = AXIDMAWriter(axi_dma_wr, burst_length=burst_length, max_outstanding=max_outstanding)
+    else:
+        wb_dma_wr = wishbone.Interface(data_width=data_width, address_width=address_width)
+        masters["dma_wr"] = wb_dma_wr
+        writer = BurstDMAWriter(wb_dma_wr, burst_length=burst_length)
+    cmp_reader = None
+    if with_compare:
+        if read_port is not None:
+            assert compare_port is not None and compare_port.data_width == data_width
+            cmp_reader = NativeDMAReader(compare_port, address_width=address_width, dram_base=dram_base)
+        elif bus_standard == "axi":
+            axi_dma_cmp = axi.AXIInterface(data_width=data_width, address_width=address_width, id_width=axi_id_width, bursting=True)
+            masters["dma_cmp"] = axi_dma_cmp
+            cmp_reader = AXIDMAReader(axi_dma_cmp, burst_length=burst_length, max_outstanding=max_outstanding)
+        else:
+            wb_dma_cmp = wishbone.Interface(data_width=data_width, address_width=address_width)
+            masters["dma_cmp"] = wb_dma_cmp
+            cmp_reader = BurstDMAReader(wb_dma_cmp, burst_length=burst_length)
+    return reader, writer, cmp_reader, masters
+
+
+# Scatter-gather descriptor, 32 bytes in memory (8 little-endian 32-bit words):
+#   0x00 src    : Source address
+#   0x04 dst    : Destination address
+#   0x08 length : Length in bytes
+#   0x0C flags  : bit 0 = last descriptor of the chain
+#   0x10 next   : Address of the next descriptor (0 = end of chain)
+#   0x14 status : Written back by the engine (bit 0 = done, bit 1 = error)
+#   0x18-0x1C   : Reserved
+DMA_DESC_WORDS       = 5    # Words fetched per descriptor (src..next)
+DMA_DESC_STATUS      = 5    # Word index of the status field
+DMA_DESC_FLAG_LAST   = 0
+DMA_DESC_STATUS_DONE = 0
+DMA_DESC_STATUS_ERR  = 1
+
+def dma_desc_layout(address_width=32):
+    return [
+        ("src",     address_width),
+        ("dst",     address_width),
+        ("length",  32),
+        ("flags",   32),
+        ("next",    address_width),
+        ("address", address_width),  # Where the descriptor itself lives
+    ]
+
+class DescriptorFetcher(LiteXModule):
+    """
+    Scatter-gather descriptor fetcher.
+    
+    On `start`, walks the descriptor chain beginning at `head` and emits every descriptor on
+    `source`. The chain ends at a descriptor with the last flag set or a null `next` pointer.
+    The descriptor held on `source` doubles as a one-deep prefetch: the next descriptor is
+    already fetched while the current one is being executed. `stop` ends the walk after the
+    descriptor currently being fetched or presented.
+    
+    Parameters
+    ----------
+    bus : wishbone.Interface
+        32-bit Wishbone master used to read descriptors
+    """
+    
+    def __init__(self, bus):
+        assert len(bus.dat_r) == 32
+        address_width = len(bus.adr) + 2  # Byte addresses (bus: word addresses)
+        
+        self.bus    = bus
+        self.start  = Signal()
+        self.stop   = Signal()
+        self.head   = Signal(address_width)
+        self.source = stream.Endpoint(dma_desc_layout(address_width))
+        self.idle   = Signal()
+        
+        # # #
+        
+        address = Signal(address_width)
+        words   = Array([Signal(32) for _ in range(DMA_DESC_WORDS)])
+        index   = Signal(max=DMA_DESC_WORDS)
+        
+        self.comb += [
+            self.source.src.eq(words[0]),
+            self.source.dst.eq(words[1]),
+            self.source.length.eq(words[2]),
+            self.source.flags.eq(words[3]),
+            self.source.next.eq(words[4]),
+            self.source.address.eq(address),
+        ]
+        
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            self.idle.eq(1),
+            If(self.start,
+                NextValue(address, self.head),
+                NextValue(index, 0),
+                NextState("FETCH")
+            )
+        )
+        fsm.act("FETCH",
+            # Read the descriptor as one incrementing burst
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.we.eq(0),
+            bus.adr.eq((address >> 2) + index),
+            bus.sel.eq(0xf),
+            bus.cti.eq(Mux(index == (DMA_DESC_WORDS - 1), 0b111, 0b010)),
+            bus.bte.eq(0b00),
+            If(bus.ack,
+                NextValue(words[index], bus.dat_r),
+                NextValue(index, index + 1),
+                If(index == (DMA_DESC_WORDS - 1),
+                    NextState("PRESENT")
+                )
+            )
+        )
+        fsm.act("PRESENT",
+            self.source.valid.eq(1),
+            If(self.source.ready,
+                NextValue(index, 0),
+                If(self.stop | self.source.flags[DMA_DESC_FLAG_LAST] | (self.source.next == 0),
+                    NextState("IDLE")
+                ).Else(
+                    NextValue(address, self.source.next),
+                    NextState("FETCH")
+                )
+            )
+        )
+
+
+# ====================================================================================================
+# Job Queues - CSR-Fed Submission / Completion FIFOs
+# ====================================================================================================
+
+def job_cpl_layout():
+    """Completion record: cookie given at submission and job error flag."""
+    return [("cookie", 32), ("error", 1)]
+
+class JobQueue(LiteXModule):
+    """
+    CSR-fed job submission and completion queues.
+    
+    Software fills in the job record CSRs (one per field of `layout`) and writes a cookie to
+    `submit`, which pushes the record and the cookie into the submission FIFO. The record
+    CSRs keep their values, so only the fields that change between jobs need rewriting. The
+    engine takes jobs from `source` and reports each one on `sink`; completions are held in
+    a second FIFO whose head software reads from `cpl_cookie`/`cpl_status` and drops by
+    writing `cpl_pop`. An engine with a full completion FIFO stalls until software drains it.
+    
+    Parameters
+    ----------
+    layout : list
+        Job record fields, as (name, width, description) tuples
+    depth : int
+        Entries of each FIFO (default: 8)
+    """
+    
+    def __init__(self, layout, depth=8):
+        assert depth >= 2
+        job_layout  = [(name, width) for name, width, _ in layout] + [("cookie", 32)]
+        self.source = stream.Endpoint(job_layout)
+        self.sink   = stream.Endpoint(job_cpl_layout())
+        
+        # Job record CSRs (named after the fields)
+        for name, width, description in layout:
+            setattr(self, name, CSRStorage(width, name=name, description=description))
+        self.submit     = CSRStorage(32, description="Write: queue the job record, tagged with the written cookie")
+        self.status     = CSRStatus(32, description="Status: bit 0 = submission queue full, bit 1 = completion available, bit 2 = last submission dropped (queue full)")
+        self.sub_level  = CSRStatus(32, description="Jobs waiting in the submission queue")
+        self.cpl_level  = CSRStatus(32, description="Completions waiting in the completion queue")
+        self.cpl_cookie = CSRStatus(32, description="Cookie of the oldest completion")
+        self.cpl_status = CSRStatus(32, description="Oldest completion: bit 0 = valid, bit 1 = error")
+        self.cpl_pop    = CSRStorage(1, description="Write: drop the oldest completion")
+        
+        # # #
+        
+        self.sub_fifo = stream.SyncFIFO(job_layout, depth)
+        self.cpl_fifo = stream.SyncFIFO(job_cpl_layout(), depth)
+        
+        # Submission: one record per write to `submit`
+        dropped = Signal()
+        self.comb += [
+            self.sub_fifo.sink.valid.eq(self.submit.re),
+            self.sub_fifo.sink.cookie.eq(self.submit.storage),
+            [getattr(self.sub_fifo.sink, name).eq(getattr(self, name).storage) for name, _, _ in layout],
+            self.sub_fifo.source.connect(self.source),
+        ]
+        self.sync += If(self.submit.re, dropped.eq(~self.sub_fifo.sink.ready))
+        
+        # Completion: popped by writes to `cpl_pop`
+        self.comb += [
+            self.sink.connect(self.cpl_fifo.sink),
+            self.cpl_fifo.source.ready.eq(self.cpl_pop.re),
+        ]
+        
+        self.comb += [
+            self.status.status[0].eq(~self.sub_fifo.sink.ready),
+            self.status.status[1].eq(self.cpl_fifo.source.valid),
+            self.status.status[2].eq(dropped),
+            self.sub_level.status.eq(self.sub_fifo.level),
+            self.cpl_level.status.eq(self.cpl_fifo.level),
+            self.cpl_cookie.status.eq(self.cpl_fifo.source.cookie),
+            self.cpl_status.status[0].eq(self.cpl_fifo.source.valid),
+            self.cpl_status.status[1].eq(self.cpl_fifo.source.error),
+        ]
+
+class JobQueueArbiter(LiteXModule):
+    """
+    Round-robin arbiter feeding the jobs of several `JobQueue`s to one engine.
+    
+    Queues with jobs waiting are served in turn, so no queue waits for more than one job of
+    every other queue. The engine runs one job at a time: the completion it reports on `sink`
+    is routed back to the queue the job was taken from (`owner`). With one queue per hart,
+    each hart submits and collects its own jobs without a software lock.
+    
+    Parameters
+    ----------
+    queues : list
+        `JobQueue`s with the same record layout
+    """
+    
+    def __init__(self, queues):
+        self.source = stream.Endpoint(queues[0].source.description)
+        self.sink   = stream.Endpoint(job_cpl_layout())
+        self.owner  = Signal(max=max(2, len(queues)))  # Queue of the job in flight
+        
+        # # #
+        
+        self.rr = RoundRobin(len(queues), SP_CE)
+        self.comb += [
+            self.rr.request.eq(Cat(*[queue.source.valid for queue in queues])),
+            # Move on after every job taken, or when the granted queue is empty
+            self.rr.ce.eq(self.source.ready | ~self.source.valid),
+            Case(self.rr.grant, {i: queue.source.connect(self.source) for i, queue in enumerate(queues)}),
+            Case(self.owner,    {i: self.sink.connect(queue.sink)     for i, queue in enumerate(queues)}),
+        ]
+        self.sync += If(self.source.valid & self.source.ready, self.owner.eq(self.rr.grant))
+
+
+# ====================================================================================================
+# CRC32C - Parallel Checksum Engine
+# ====================================================================================================
+
+CRC32C_POLY = 0x82F63B78  # Castagnoli polynomial, bit-reflected (iSCSI, ext4, SSE4.2 crc32)
+
+def crc32c_xor_matrix(data_bytes):
+    """
+    CRC32C update equations for 1 to `data_bytes` input bytes.
+    
+    Returns one list of 32 masks per byte count: bit i of the new CRC is the XOR of the inputs
+    selected by mask i, the inputs being the 32 CRC bits followed by the data bits (byte 0
+    first, each byte LSB first, as the bit-serial reflected CRC consumes them).
+    """
+    state = [1 << i for i in range(32)]
+    steps = []
+    for n in range(data_bytes):
+        for b in range(8):
+            feedback = state[0] ^ (1 << (32 + 8*n + b))
+            state = state[1:] + [0]
+            state = [s ^ feedback if (CRC32C_POLY >> i) & 1 else s for i, s in enumerate(state)]
+        steps.append(state)
+    return steps
+
+class CRC32C(LiteXModule):
+    """
+    Parallel CRC32C (Castagnoli), one data word per cycle (combinational).
+    
+    `crc_out` is `crc_in` updated with the first `bytes` bytes of `data` (little-endian byte
+    order, 1 to data_width/8 bytes; 0 leaves the CRC unchanged). The register is used as is:
+    start from 0xFFFFFFFF and invert the final value, as software crc32c() does.
+    
+    Parameters
+    ----------
+    data_width : int
+        Width of the data word in bits (multiple of 8)
+    """
+    
+    def __init__(self, data_width=32):
+        bytes_per_word = data_width // 8
+        
+        self.data    = Signal(data_width)
+        self.bytes   = Signal(bits_for(bytes_per_word))  # Valid bytes of `data`
+        self.crc_in  = Signal(32)
+        self.crc_out = Signal(32)
+        
+        # # #
+        
+        inputs = Cat(self.crc_in, self.data)
+        cases  = {"default": self.crc_out.eq(self.crc_in)}
+        for n, masks in enumerate(crc32c_xor_matrix(bytes_per_word)):
+            cases[n + 1] = self.crc_out.eq(Cat(*[
+                reduce(xor, [inputs[j] for j in range(len(inputs)) if (mask >> j) & 1])
+                for mask in masks]))
+        self.comb += Case(self.bytes, cases)
+
+
+# ====================================================================================================
+# Example: More Complete DMA Memory Copy Engine
+# ====================================================================================================
+
+# SimpleDMAEngine operations (control bits[17:16])
+DMA_OP_COPY    = 0  # Copy src -> dst
+DMA_OP_FILL    = 1  # Fill dst with `fill_pattern` (write path only)
+DMA_OP_CRC32C  = 2  # CRC32C of src into `crc` (read path only)
+DMA_OP_COMPARE = 3  # Compare src with dst, first differing byte in `mismatch`
+
+class SimpleDMAEngine(LiteXModule):
+    """
+    Simple DMA engine that copies data from source to destination.
+    
+    This is a more complete example showing actual DMA read/write operations.
+    Use this as a reference for implementing real memory access in your accelerator.
+    
+    The read and write paths are independent masters (`wb_dma_rd`, `wb_dma_wr`) connected
+    by an on-chip FIFO, so reads for the next words are in flight while earlier words are
+    being written. In burst mode (control bit 1) both masters use incrementing-address
+    Wishbone bursts (cti/bte) of up to `burst_length` words.
+    
+    In scatter-gather mode (control bit 2) the job comes from a chain of descriptors in
+    memory starting at `desc_addr` instead of the `src_addr`/`dst_addr`/`length` CSRs. The
+    descriptors are executed back-to-back and each one gets its status word written back
+    (see `DescriptorFetcher` for the layout).
+    
+    When LiteDRAM ports are passed in, the data path uses `NativeDMAReader`/`NativeDMAWriter`
+    on those ports instead of the Wishbone masters, bypassing the DMA bus (not coherent with
+    the CPU caches). With `bus_standard="axi"` the masters are AXI4 (`axi_dma_rd`,
+    `axi_dma_wr`, see `AXIDMAReader`/`AXIDMAWriter`) and keep up to `max_outstanding` bursts
+    in flight, instead of the one access at a time of a Wishbone master bridged to AXI.
+    Descriptors always go through `wb_dma_desc`.
+    
+    With `queue_depth` set, copies can also be queued through `queue` (a `JobQueue` with
+    `src`/`dst`/`length` record CSRs): the engine starts the next queued copy as soon as the
+    current one completes, and reports each one in the completion queue. CSR-started jobs
+    take priority over queued ones; the burst settings of `control` apply to both. With
+    `queue_count` > 1 there is one queue per hart (`queue0`, `queue1`, ...), served in
+    round-robin order, each receiving the completions of its own jobs.
+    
+    Besides copies, the operation field of `control` (bits[17:16], `DMA_OP_*`) selects:
+    
+    - fill: write `fill_pattern` (64-bit, or its low 32 bits repeated with control bit 3)
+      to `length` bytes at the destination, without reading anything. The pattern is laid
+      out on 8-byte aligned addresses: the byte at address a gets pattern byte (a % 8).
+    - CRC32C: read `length` bytes from the source and leave their CRC32C in `crc`. A
+      scatter-gather chain gives the CRC of all its source buffers, in order.
+    - compare: read the source and the destination (through the compare reader, `wb_dma_cmp`)
+      and set status bit 3 and `mismatch` (the byte offset from the start of the job or
+      chain) on the first difference. The rest of the buffers is still read.
+    
+    Each one moves a word per cycle like a copy. The operation is taken at the start of a job
+    or chain and also applies to queued jobs; compare needs `with_compare`.
+    
+    With `rows` > 1, a CSR-started job is 2D (rectangular): `rows` rows of `length` bytes,
+    `src_stride` bytes apart in the source and `dst_stride` bytes apart in the destination
+    (e.g. a tile of a matrix or a sub-image of a framebuffer). `DMA2DAddressGenerator`s split
+    it into row commands that the engines take back-to-back. `progress` (and `mismatch`)
+    count the bytes of the rows, packed. Descriptors and queued jobs are linear.
+    
+    Parameters
+    ----------
+    data_width : int
+        Width of the DMA data bus (default: 32 bits)
+    address_width : int
+        Width of the address bus (default: 32 bits for byte-addressable)
+    burst_length : int
+        Maximum number of beats per burst (default: 16)
+    fifo_depth : int
+        Depth in words of the FIFO between the read and write masters (default: 64)
+    read_port : LiteDRAMNativePort
+        Optional LiteDRAM port for the read engine (default: None, use `wb_dma_rd`)
+    write_port : LiteDRAMNativePort
+        Optional LiteDRAM port for the write engine (default: None, use `wb_dma_wr`)
+    dram_base : int
+        Bus address of the start of DRAM, for the native ports (default: 0x40000000)
+    bus_standard : str
+        Data path masters without LiteDRAM ports: "wishbone" or "axi" (default: "wishbone")
+    max_outstanding : int
+        Maximum number of bursts in flight per AXI master (default: 4)
+    with_compare : bool
+        Add the compare reader for the compare operation (default: True)
+    compare_port : LiteDRAMNativePort
+        LiteDRAM port of the compare reader with `read_port` (required with `with_compare`)
+    queue_depth : int
+        Depth of the job submission/completion queues, 0 for none (default: 0)
+    queue_count : int
+        Number of independent job queues, e.g. one per hart (default: 1)
+    with_perf : bool
+        Add performance counters (`perf`, see `PerfCounters`) (default: False)
+    
+    Attributes
+    ----------
+    queue : JobQueue
+        Job submission/completion queues (with `queue_depth`; `queue0`... with `queue_count` > 1)
+    wb_dma_rd : wishbone.Interface
+        Wishbone master used by the read engine (without `read_port`)
+    wb_dma_wr : wishbone.Interface
+        Wishbone master used by the write engine (without `write_port`)
+    wb_dma_cmp : wishbone.Interface
+        Wishbone master used by the compare reader (with `with_compare`, without `read_port`)
+    axi_dma_rd, axi_dma_wr, axi_dma_cmp : axi.AXIInterface
+        AXI4 masters used instead with `bus_standard="axi"`
+    wb_dma_desc : wishbone.Interface
+        32-bit Wishbone master used to fetch descriptors and write back their status
+    dma_masters : dict
+        DMA masters to connect to the SoC DMA bus, by name
+    ev : CoalescingEventManager
+        Completion event (one per CSR-started job or chain, one per queued job)
+    interrupt : Signal
+        Interrupt request of `ev`
+    perf : PerfCounters
+        Performance counters (with `with_perf`)
+    """
+    
+    def __init__(self, data_width=32, address_width=32, burst_length=16, fifo_depth=64,
+        read_port=None, write_port=None, dram_base=0x40000000, bus_standard="wishbone",
+        max_outstanding=4, with_compare=True, compare_port=None, queue_depth=0, queue_count=1,
+        with_perf=False):
+        # CSR Registers
+        self.control   = CSRStorage(32, description="Control: bit 0 = start, bit 1 = burst mode, bit 2 = scatter-gather mode, bit 3 = 32-bit fill pattern, bits[15:8] = burst length in beats (0 = max), bits[17:16] = operation (0 = copy, 1 = fill, 2 = CRC32C, 3 = compare)")
+        self.status    = CSRStatus(32, description="Status: bit 0 = busy, bit 1 = done, bit 2 = error, bit 3 = mismatch (compare)")
+        self.src_addr  = CSRStorage(address_width, description="Source address")
+        self.dst_addr  = CSRStorage(address_width, description="Destination address")
+        self.length    = CSRStorage(32, description="Length in bytes")
+        self.progress  = CSRStatus(32, description="Bytes transferred")
+        self.desc_addr = CSRStorage(address_width, description="Address of the first descriptor (scatter-gather mode)")
+        self.desc_current = CSRStatus(address_width, description="Address of the descriptor being executed")
+        self.fill_pattern = CSRStorage(64, description="Fill pattern (fill operation), byte (address % 8) at each address")
+        self.crc       = CSRStatus(32, description="CRC32C of the source data (CRC32C operation)")
+        self.mismatch  = CSRStatus(32, description="Byte offset of the first difference (compare operation, status bit 3)")
+        self.rows       = CSRStorage(32, description="Rows of `length` bytes of a 2D job (0 or 1 = linear job)")
+        self.src_stride = CSRStorage(32, description="Bytes from one source row to the next (2D job)")
+        self.dst_stride = CSRStorage(32, description="Bytes from one destination row to the next (2D job)")
+        
+        # DMA interfaces (one master per engine)
+        self.wb_dma_desc = wishbone.Interface(data_width=32, address_width=address_width)
+        self.dma_masters = {"dma_desc": self.wb_dma_desc}
+        
+        # Interrupt
+        self.ev        = CoalescingEventManager()
+        self.interrupt = self.ev.irq
+        
+        # Internal registers
+        count      = Signal(32)
+        count_base = Signal(32)  # Bytes of the jobs already completed
+        bytes_per_word = data_width // 8
+        word_shift     = log2_int(bytes_per_word)
+        
+        # Current job (from the CSRs or from a descriptor)
+        job_src   = Signal(address_width)
+        job_dst   = Signal(address_width)
+        job_len   = Signal(32)
+        job_desc  = Signal(address_width)
+        job_last  = Signal()
+        job_op    = Signal(2)
+        job_rows  = Signal(32)  # Rows of a 2D job (0 or 1: linear)
+        rows_left = Signal(32)
+        chain     = Signal()
+        queued    = Signal()  # Job taken from the submission queue
+        cookie    = Signal(32)
+        
+        # Queued jobs (without a queue the endpoints stay idle)
+        if queue_depth:
+            queues = []
+            for i in range(queue_count):
+                queue = JobQueue([
+                    ("src",    address_width, "Queued job source address"),
+                    ("dst",    address_width, "Queued job destination address"),
+                    ("length", 32,            "Queued job length in bytes"),
+                ], depth=queue_depth)
+                setattr(self, "queue" if queue_count == 1 else f"queue{i}", queue)
+                queues.append(queue)
+            self.queue_arbiter = JobQueueArbiter(queues)
+            jobs = self.queue_arbiter.source
+            cpls = self.queue_arbiter.sink
+        else:
+            jobs = stream.Endpoint([("src", address_width), ("dst", address_width), ("length", 32), ("cookie", 32)])
+            cpls = stream.Endpoint(job_cpl_layout())
+        
+        # Read engine -> FIFO -> Write engine, compare reader (destination side of the compare
+        # operation) -> FIFO
+        self.reader, self.writer, cmp_reader, masters = _dma_engines(data_width, address_width, burst_length,
+            bus_standard, max_outstanding, read_port, write_port, dram_base, with_compare, compare_port)
+        for name, bus in masters.items():
+            setattr(self, f"{'axi' if bus_standard == 'axi' else 'wb'}_{name}", bus)  # wb_dma_rd, axi_dma_rd, ...
+            self.dma_masters[name] = bus
+        self.fifo   = stream.SyncFIFO([("data", data_width)], depth=fifo_depth, buffered=True)
+        self.comb += self.reader.source.connect(self.fifo.sink)
+        
+        if with_compare:
+            self.cmp_reader = cmp_reader
+            self.cmp_fifo   = stream.SyncFIFO([("data", data_width)], depth=fifo_depth, buffered=True)
+            self.comb += self.cmp_reader.source.connect(self.cmp_fifo.sink)
+        
+        # 2D address generators -> engine commands (the destination one feeds the compare
+        # reader for compare)
+        self.src_gen = DMA2DAddressGenerator(address_width)
+        self.dst_gen = DMA2DAddressGenerator(address_width)
+        self.comb += self.src_gen.source.connect(self.reader.cmd)
+        
+        # Operation data paths: the FIFO feeds the writer (copy), the CRC or the comparator;
+        # fill feeds the writer from the pattern.
+        op_reads   = Signal()  # Source read by `reader`
+        op_writes  = Signal()  # Destination written by `writer`
+        op_compare = Signal()  # Destination read by `cmp_reader`
+        self.comb += [
+            op_reads.eq(job_op != DMA_OP_FILL),
+            op_writes.eq((job_op == DMA_OP_COPY) | (job_op == DMA_OP_FILL)),
+            op_compare.eq(job_op == DMA_OP_COMPARE),
+        ]
+        if with_compare:
+            self.comb += If(op_compare,
+                self.dst_gen.source.connect(self.cmp_reader.cmd)
+            ).Else(
+                self.dst_gen.source.connect(self.writer.cmd)
+            )
+        else:
+            self.comb += self.dst_gen.source.connect(self.writer.cmd)
+        
+        pattern   = Signal(64)
+        fill_data = Signal(data_width)
+        self.comb += pattern.eq(Mux(self.control.storage[3],
+            Replicate(self.fill_pattern.storage[:32], 2), self.fill_pattern.storage))
+        if data_width == 32:
+            # Alternate the pattern halves, starting with the one of each row's address
+            fill_high     = Signal()
+            fill_row_high = Signal()
+            fill_words    = Signal(32)  # Words left in the row
+            self.comb += fill_data.eq(Mux(fill_high, pattern[32:], pattern[:32]))
+        else:
+            self.comb += fill_data.eq(Replicate(pattern, data_width // 64))
+        
+        # Words consumed from the FIFO by the CRC / comparator
+        check_ready = Signal()
+        check_beat  = Signal()
+        self.comb += [
+            If(job_op == DMA_OP_COPY,
+                self.fifo.source.connect(self.writer.sink)
+            ).Elif(job_op == DMA_OP_FILL,
+                self.writer.sink.valid.eq(1),
+                self.writer.sink.data.eq(fill_data)
+            ).Else(
+                self.fifo.source.ready.eq(check_ready)
+            ),
+            check_beat.eq(self.fifo.source.valid & check_ready),
+        ]
+        
+        # Valid bytes of the current word (only the last word of a job can be partial)
+        check_sel = Signal(bytes_per_word)
+        self.comb += If(self.fifo.source.last,
+            check_sel.eq(dma_tail_sel(job_len, bytes_per_word))
+        ).Else(
+            check_sel.eq(2**bytes_per_word - 1)
+        )
+        
+        # CRC32C (restarted with each CSR-started job/chain or queued job)
+        op_init   = Signal()
+        crc_state = Signal(32)
+        self.crc_engine = CRC32C(data_width)
+        self.comb += [
+            self.crc_engine.data.eq(self.fifo.source.data),
+            self.crc_engine.bytes.eq(Mux(self.fifo.source.last & (job_len[:word_shift] != 0),
+                job_len[:word_shift], bytes_per_word)),
+            self.crc_engine.crc_in.eq(crc_state),
+            self.crc.status.eq(~crc_state),
+        ]
+        self.sync += If(op_init,
+            crc_state.eq(2**32 - 1)
+        ).Elif(check_beat & (job_op == DMA_OP_CRC32C),
+            crc_state.eq(self.crc_engine.crc_out)
+        )
+        
+        # Comparator: first differing byte (lowest address) of the word
+        mismatch   = Signal()
+        differ     = Signal(bytes_per_word)
+        first_byte = Signal(max(word_shift, 1))
+        if with_compare:
+            self.comb += [
+                If(op_compare,
+                    check_ready.eq(self.cmp_fifo.source.valid),
+                    self.cmp_fifo.source.ready.eq(self.fifo.source.valid)
+                ).Else(
+                    check_ready.eq(1)
+                ),
+                differ.eq(Cat(*[
+                    (self.fifo.source.data[8*i:8*(i + 1)] != self.cmp_fifo.source.data[8*i:8*(i + 1)]) & check_sel[i]
+                    for i in range(bytes_per_word)])),
+            ]
+            for i in reversed(range(bytes_per_word)):
+                self.comb += If(differ[i], first_byte.eq(i))
+        else:
+            self.comb += check_ready.eq(1)
+        
+        # Descriptor fetcher and status writeback share the descriptor master
+        fetch_bus  = wishbone.Interface(data_width=32, address_width=address_width)
+        status_bus = wishbone.Interface(data_width=32, address_width=address_width)
+        self.fetcher = DescriptorFetcher(fetch_bus)
+        self.desc_arbiter = wishbone.Arbiter([fetch_bus, status_bus], self.wb_dma_desc)
+        
+        # Burst configuration (control bit 1 / bits[15:8])
+        self.comb += [
+            self.reader.burst.eq(self.control.storage[1]),
+            self.reader.burst_beats.eq(self.control.storage[8:16]),
+            self.writer.burst.eq(self.control.storage[1]),
+            self.writer.burst_beats.eq(self.control.storage[8:16]),
+        ]
+        if with_compare:
+            self.comb += [
+                self.cmp_reader.burst.eq(self.control.storage[1]),
+                self.cmp_reader.burst_beats.eq(self.control.storage[8:16]),
+            ]
+        
+        # Detect start edge
+        start_d = Signal()
+        self.sync += start_d.eq(self.control.storage[0])
+        start_pulse = Signal()
+        self.comb += start_pulse.eq(self.control.storage[0] & ~start_d)
+        
+        # Status signals
+        busy = Signal()
+        done = Signal()
+        error = Signal()
+        
+        def take_job():
+            # Start the copy at the head of the submission queue
+            return [
+                jobs.ready.eq(1),
+                op_init.eq(1),
+                NextValue(job_op, self.control.storage[16:18]),
+                NextValue(job_rows, 0),
+                NextValue(job_src, jobs.src),
+                NextValue(job_dst, jobs.dst),
+                NextValue(job_len, jobs.length),
+                NextValue(job_last, 1),
+                NextValue(cookie, jobs.cookie),
+                NextValue(queued, 1),
+                NextValue(chain, 0),
+                NextValue(count, 0),
+                NextValue(count_base, 0),
+                NextValue(error, 0),
+                NextState("ISSUE")
+            ]
+        
+        # FSM for DMA operation
+        self.submodules.fsm = FSM(reset_state="IDLE")
+        
+        self.fsm.act("IDLE",
+            NextValue(busy, 0),
+            If(start_pulse,
+                op_init.eq(1),
+                NextValue(job_op, self.control.storage[16:18]),
+                NextValue(count, 0),
+                NextValue(count_base, 0),
+                NextValue(busy, 1),
+                NextValue(done, 0),
+                NextValue(error, 0),
+                NextValue(queued, 0),
+                NextValue(chain, self.control.storage[2]),
+                If(self.control.storage[2],
+                    # Scatter-gather: walk the descriptor chain
+                    NextValue(job_rows, 0),
+                    self.fetcher.start.eq(1),
+                    self.fetcher.head.eq(self.desc_addr.storage),
+                    NextState("NEXT_DESCRIPTOR")
+                ).Else(
+                    # Single (linear or 2D) job from the CSRs
+                    NextValue(job_src, self.src_addr.storage),
+                    NextValue(job_dst, self.dst_addr.storage),
+                    NextValue(job_len, self.length.storage),
+                    NextValue(job_rows, self.rows.storage),
+                    NextValue(job_last, 1),
+                    NextState("ISSUE")
+                )
+            ).Elif(jobs.valid,
+                NextValue(busy, 1),
+                NextValue(done, 0),
+                take_job()
+            )
+        )
+        
+        self.fsm.act("NEXT_DESCRIPTOR",
+            # Take the (usually already prefetched) next descriptor
+            self.fetcher.source.ready.eq(1),
+            If(self.fetcher.source.valid,
+                NextValue(job_src,  self.fetcher.source.src),
+                NextValue(job_dst,  self.fetcher.source.dst),
+                NextValue(job_len,  self.fetcher.source.length),
+                NextValue(job_desc, self.fetcher.source.address),
+                NextValue(job_last, self.fetcher.source.flags[DMA_DESC_FLAG_LAST] | (self.fetcher.source.next == 0)),
+                NextState("ISSUE")
+            )
+        )
+        
+        # Source and destination (and the strides of a 2D job) must be aligned to the data path
+        # width when accessed
+        misaligned = Signal()
+        if word_shift:
+            src_unaligned = (job_src[:word_shift] != 0) | ((job_rows > 1) & (self.src_stride.storage[:word_shift] != 0))
+            dst_unaligned = (job_dst[:word_shift] != 0) | ((job_rows > 1) & (self.dst_stride.storage[:word_shift] != 0))
+            self.comb += misaligned.eq((src_unaligned & op_reads) | (dst_unaligned & (op_writes | op_compare)))
+        
+        # Compare without the compare reader
+        unsupported = Signal()
+        if not with_compare:
+            self.comb += unsupported.eq(op_compare)
+        
+        # Job for the address generators of the engines used by the operation
+        self.comb += [
+            self.src_gen.sink.address.eq(job_src),
+            self.src_gen.sink.length.eq(job_len),
+            self.src_gen.sink.rows.eq(job_rows),
+            self.src_gen.sink.stride.eq(self.src_stride.storage),
+            self.dst_gen.sink.address.eq(job_dst),
+            self.dst_gen.sink.length.eq(job_len),
+            self.dst_gen.sink.rows.eq(job_rows),
+            self.dst_gen.sink.stride.eq(self.dst_stride.storage),
+        ]
+        cmd_ready = Signal()
+        self.comb += cmd_ready.eq((self.src_gen.sink.ready | ~op_reads) &
+                                  (self.dst_gen.sink.ready | ~(op_writes | op_compare)))
+        
+        # Word moved (written, or checked when nothing is written) and end of a row
+        beat    = Signal()
+        row_end = Signal()
+        self.comb += If(op_writes,
+            beat.eq(self.writer.sink.valid & self.writer.sink.ready),
+            row_end.eq(self.writer.done)
+        ).Else(
+            beat.eq(check_beat),
+            row_end.eq(check_beat & self.fifo.source.last)
+        )
+        if data_width == 32:
+            row_words = (job_len + 3) >> 2
+            self.sync += If(self.fsm.ongoing("ISSUE"),
+                fill_high.eq(job_dst[2]),
+                fill_row_high.eq(job_dst[2]),
+                fill_words.eq(row_words)
+            ).Elif(beat,
+                If(fill_words == 1,
+                    # First word of the next row
+                    fill_high.eq(fill_row_high ^ self.dst_stride.storage[2]),
+                    fill_row_high.eq(fill_row_high ^ self.dst_stride.storage[2]),
+                    fill_words.eq(row_words)
+                ).Else(
+                    fill_high.eq(~fill_high),
+                    fill_words.eq(fill_words - 1)
+                )
+            )
+        self.sync += If(op_init,
+            mismatch.eq(0)
+        ).Elif(check_beat & op_compare & ~mismatch & (differ != 0),
+            mismatch.eq(1),
+            self.mismatch.status.eq(count + first_byte)
+        )
+        
+        self.fsm.act("ISSUE",
+            # Hand the job to the engines of the operation; they run concurrently from here on
+            If(misaligned | unsupported,
+                NextValue(error, 1),
+                NextState("JOB_DONE")
+            ).Elif(~op_writes & (job_len == 0),
+                # Nothing to read (the readers produce no word to end the job on)
+                NextState("JOB_DONE")
+            ).Elif(cmd_ready,
+                self.src_gen.sink.valid.eq(op_reads),
+                self.dst_gen.sink.valid.eq(op_writes | op_compare),
+                NextValue(rows_left, Mux(job_rows > 1, job_rows, 1)),
+                NextState("RUN")
+            )
+        )
+        
+        self.fsm.act("RUN",
+            If(beat,
+                NextValue(count, count + bytes_per_word)
+            ),
+            If(row_end,
+                # Report the exact byte count (the last word of a row may be partial)
+                NextValue(count, count_base + job_len),
+                NextValue(count_base, count_base + job_len),
+                NextValue(rows_left, rows_left - 1),
+                If(rows_left == 1,
+                    NextState("JOB_DONE")
+                )
+            )
+        )
+        
+        self.fsm.act("JOB_DONE",
+            If(chain,
+                NextState("WRITEBACK")
+            ).Elif(queued,
+                # Report the queued job and go straight on with the next one
+                cpls.valid.eq(1),
+                cpls.cookie.eq(cookie),
+                cpls.error.eq(error),
+                If(cpls.ready,
+                    self.ev.completion.eq(1),
+                    If(jobs.valid,
+                        take_job()
+                    ).Else(
+                        NextValue(busy, 0),
+                        NextValue(done, 1),
+                        NextState("DONE")
+                    )
+                )
+            ).Else(
+                NextValue(busy, 0),
+                NextValue(done, 1),
+                NextState("DONE")
+            )
+        )
+        
+        self.fsm.act("WRITEBACK",
+            # Mark the descriptor as done in memory
+            status_bus.cyc.eq(1),
+            status_bus.stb.eq(1),
+            status_bus.we.eq(1),
+            status_bus.adr.eq((job_desc >> 2) + DMA_DESC_STATUS),
+            status_bus.sel.eq(0xf),
+            status_bus.dat_w.eq((1 << DMA_DESC_STATUS_DONE) | (error << DMA_DESC_STATUS_ERR)),
+            If(status_bus.ack,
+                If(job_last | error,
+                    NextState("FLUSH_CHAIN")
+                ).Else(
+                    NextState("NEXT_DESCRIPTOR")
+                )
+            )
+        )
+        
+        self.fsm.act("FLUSH_CHAIN",
+            # Stop the fetcher (after any descriptor read in flight) before completing
+            self.fetcher.stop.eq(1),
+            self.fetcher.source.ready.eq(1),
+            If(self.fetcher.idle,
+                NextValue(busy, 0),
+                NextValue(done, 1),
+                NextState("DONE")
+            )
+        )
+        
+        self.fsm.act("DONE",
+            # Signal completion (queued jobs were signalled one by one) and return to IDLE
+            self.ev.completion.eq(~queued),
+            NextState("IDLE")
+        )
+        
+        # Connect status outputs
+        self.comb += [
+            self.status.status[0].eq(busy),
+            self.status.status[1].eq(done),
+            self.status.status[2].eq(error),
+            self.status.status[3].eq(mismatch),
+            self.progress.status.eq(count),
+            self.desc_current.status.eq(job_desc),
+        ]
+        
+        # Performance counters (bytes counted per completed copy, jobs as signalled by `ev`)
+        if with_perf:
+            self.perf = PerfCounters()
+            self.comb += [
+                self.perf.busy.eq(~self.fsm.ongoing("IDLE")),
+                self.perf.rd_stall.eq(self.reader.stall | (self.cmp_reader.stall if with_compare else 0)),
+                self.perf.wr_stall.eq(self.writer.stall),
+                If(self.fsm.ongoing("RUN") & row_end,
+                    self.perf.bytes.eq(job_len)
+                ),
+                self.perf.job_start.eq((self.fsm.ongoing("IDLE") & start_pulse) | (jobs.valid & jobs.ready)),
+                self.perf.job_done.eq(self.ev.completion),
+            ]
+
+
+# ====================================================================================================
+# Example: Stream-Based Processing
+# ====================================================================================================
+
+class StreamProcessor(LiteXModule):
+    """
+    Example stream-based processor.
+    
+    Use this pattern for video processing, DSP, or any streaming data application. As a stage
+    of a `StreamPipeline` it is fed from memory by DMA and its output written back.
+    """
+    
+    def __init__(self, data_width=32):
+        # Stream interfaces
+        self.sink = stream.Endpoint([("data", data_width)])
+        self.source = stream.Endpoint([("data", data_width)])
+        
+        # CSR for configuration
+        self.control = CSRStorage(32, description="Control register")
+        self.status = CSRStatus(32, description="Status register")
+        
+        # TODO: Add your stream processing logic here
+        # Example: pass-through (just connect sink to source)
+        self.comb += [
+            self.source.valid.eq(self.sink.valid),
+            self.source.data.eq(self.sink.data),  # Replace with your processing
+            self.sink.ready.eq(self.source.ready),
+        ]
+
+
+# ====================================================================================================
+# Clock Domain Crossing - CSR Bridge
+# ====================================================================================================
+
+class CSRClockDomainBridge(LiteXModule):
+    """
+    CSR bridge for a module running in another clock domain.
+    
+    Moves `module` to `clock_domain` and exposes a `sys` twin of each of its CSRs, with the same
+    name, so the module's registers keep their place in the CSR map (the twins take the place
+    of the module's CSRs, which are not seen by the CSR bank).
+    
+    Control side: every write to a twin `CSRStorage` (or writable `CSRStatus`, `r`) is queued
+    with its index in an asynchronous FIFO and applied in `clock_domain` in write order, the
+    whole value at once, with the `re` strobe. A register written to start a job therefore
+    never overtakes the registers written before it. CSR accesses cannot be stalled, so a write
+    that finds the FIFO full (more than `fifo_depth` writes in flight, e.g. back-to-back
+    writes with a slower `clock_domain`) is dropped: `cdc_status` bit 0 then records it
+    (sticky, write 1 to clear). Bit 1 is set while writes are in flight: software waits for it
+    to clear before writing more than `fifo_depth` registers in a row, or before starting a
+    job (from `sys` CSRs) that needs them applied.
+    
+    Status side: the `CSRStatus` values are brought back to `sys` together, through a
+    `BusSynchronizer`, with the number of writes applied `status_delay` cycles earlier. The
+    twins only take a snapshot taken after all the writes issued so far, so a status read
+    right after a start cannot return the `done` of the previous job.
+    
+    Only `CSRStorage`/`CSRStatus` without `fields` or `write_from_dev` are supported; the
+    read strobe (`CSRStatus.we`), EventManagers and memories are not bridged.
+    
+    Parameters
+    ----------
+    module : Module
+        Module to move to `clock_domain`, with `CSRStorage`/`CSRStatus` registers
+    clock_domain : str
+        Clock domain of `module`
+    fifo_depth : int
+        Depth of the write FIFO, i.e. of the CSR writes in flight (default: 8)
+    status_delay : int
+        Cycles of `clock_domain` for a write to show in the status registers (default: 4)
+    
+    Attributes
+    ----------
+    module : Module
+        The module, in `clock_domain`
+    cdc_status : CSRStatus
+        Write status (with writable registers): bit 0 = write dropped, bit 1 = writes in flight
+    """
+    
+    def __init__(self, module, clock_domain, fifo_depth=8, status_delay=4):
+        self.module = ClockDomainsRenamer(clock_domain)(module)
+        
+        self._twins = []
+        writable    = [] # (module CSR, twin, value written)
+        statuses    = [] # (module CSR, twin)
+        for csr in module.get_csrs():
+            assert isinstance(csr, (CSRStorage, CSRStatus))
+            assert not hasattr(csr, "fields") and not hasattr(csr, "dat_w")
+            if isinstance(csr, CSRStorage):
+                twin = CSRStorage(csr.size, reset=csr.storage.reset, name=csr.name, description=csr.description)
+                writable.append((csr, twin, twin.storage))
+            else:
+                twin = CSRStatus(csr.size, reset=csr.status.reset, name=csr.name, description=csr.description, read_only=csr.read_only)
+                statuses.append((csr, twin))
+                if not csr.read_only:
+                    writable.append((csr, twin, twin.r))
+            setattr(self, csr.name, twin)
+            self._twins.append(twin)
+        
+        # Writes issued (sys) / applied (clock_domain), modulo 256
+        issued  = Signal(8)
+        applied = Signal(8)
+        sync    = getattr(self.sync, clock_domain)
+        
+        # ========================================================================================
+        # Control: sys writes -> async FIFO -> clock_domain
+        # ========================================================================================
+        if writable:
+            data_width = max(csr.size for csr, _, _ in writable)
+            self.cdc = stream.ClockDomainCrossing([("index", bits_for(len(writable) - 1)), ("data", data_width)],
+                cd_from = "sys",
+                cd_to   = clock_domain,
+                depth   = fifo_depth)
+            
+            # Twin writes (at most one per cycle) -> FIFO
+            write = None
+            for i, (csr, twin, value) in enumerate(writable):
+                push = [
+                    self.cdc.sink.valid.eq(1),
+                    self.cdc.sink.index.eq(i),
+                    self.cdc.sink.data.eq(value),
+                ]
+                write = If(twin.re, *push) if write is None else write.Elif(twin.re, *push)
+            self.comb += write
+            self.sync += If(self.cdc.sink.valid & self.cdc.sink.ready, issued.eq(issued + 1))
+            
+            # FIFO -> module CSRs: value and `re` strobe (as the CSR bank would do it)
+            cases = {}
+            for i, (csr, _, _) in enumerate(writable):
+                target   = csr.storage if isinstance(csr, CSRStorage) else csr.r
+                cases[i] = [target.eq(self.cdc.source.data), csr.re.eq(1)]
+            self.comb += self.cdc.source.ready.eq(1)
+            sync += [csr.re.eq(0) for csr, _, _ in writable]
+            sync += If(self.cdc.source.valid,
+                Case(self.cdc.source.index, cases),
+                applied.eq(applied + 1)
+            )
+        
+        # ========================================================================================
+        # Status: clock_domain snapshot -> sys, once it includes all the issued writes
+        # ========================================================================================
+        if writable or statuses:
+            # Writes applied status_delay cycles ago (their effect on the status has settled)
+            applied_seen = applied
+            for _ in range(status_delay):
+                applied_d = Signal(8)
+                sync += applied_d.eq(applied_seen)
+                applied_seen = applied_d
+            
+            snapshot = Cat(applied_seen, *[csr.status for csr, _ in statuses])
+            self.status_cdc = BusSynchronizer(len(snapshot), clock_domain, "sys")
+            self.comb += self.status_cdc.i.eq(snapshot)
+            seen   = self.status_cdc.o[:8]
+            values = []
+            offset = 8
+            for csr, twin in statuses:
+                values.append(twin.status.eq(self.status_cdc.o[offset:offset + csr.size]))
+                offset += csr.size
+            self.sync += If(seen == issued, *values)
+        
+        # ========================================================================================
+        # Write status: writes with the FIFO full are lost (and not issued), report them
+        # ========================================================================================
+        if writable:
+            assert not hasattr(module, "cdc_status")
+            self.cdc_status = CSRStatus(2, read_only=False, description="CDC: bit 0 = CSR write dropped, write FIFO full (sticky, write 1 to clear), bit 1 = writes in flight (not yet applied)")
+            self._twins.append(self.cdc_status)
+            dropped = Signal()
+            self.sync += If(self.cdc.sink.valid & ~self.cdc.sink.ready,
+                dropped.eq(1)
+            ).Elif(self.cdc_status.re & self.cdc_status.r[0],
+                dropped.eq(0)
+            )
+            self.comb += [
+                self.cdc_status.status[0].eq(dropped),
+                self.cdc_status.status[1].eq(seen != issued),
+            ]
+    
+    def get_csrs(self):
+        # The twins, not the module's CSRs
+        return list(self._twins)
+
+
+# ====================================================================================================
+# Stream Pipeline - DMA -> Stream Stages -> DMA
+# ====================================================================================================
+
+class StreamPipeline(LiteXModule):
+    """
+    DMA -> stream stages -> DMA pipeline.
+    
+    Runs a chain of stream stages over a buffer in memory. A DMA read engine streams the
+    `length` input bytes at `src_addr` into the first stage, each stage feeds the next one
+    through an elastic buffer, and a DMA write engine stores the output of the last stage at
+    `dst_addr`. valid/ready backpressure runs end to end: stages that take and produce one
+    word per cycle keep the whole pipeline at one word per cycle, and a slower stage (or a
+    stalled write) throttles the reads.
+    
+    A stage is any module with `sink` and `source` stream endpoints carrying a `data` field,
+    like `StreamProcessor`. The stages are added as `stage0`, `stage1`, ..., so their own
+    CSRs appear next to the pipeline's (e.g. `stage0_control`). A stage whose data width
+    differs from the previous one is connected through a `stream.Converter`. The final input
+    word carries `last`, which stages may use (e.g. to flush), but the writer counts words:
+    the stages must produce exactly `out_length` bytes (`length` when 0), rounded up to whole
+    words. With no stages the pipeline is a plain copy.
+    
+    The DMA engines are those of `SimpleDMAEngine`: Wishbone masters `wb_dma_rd`/`wb_dma_wr`
+    (incrementing bursts with control bit 1), AXI4 masters `axi_dma_rd`/`axi_dma_wr` with
+    `bus_standard="axi"`, or `NativeDMAReader`/`NativeDMAWriter` when LiteDRAM ports are
+    passed in. Buffers must be aligned to the data path width.
+    
+    The stages may run in their own `clock_domain` (e.g. `accel`, see `--accel-clk-freq` in
+    alinx_ax7203.py) while the DMA engines and the job control stay in `sys` with the memory
+    bus: the streams cross through asynchronous FIFOs (`cdc_in`, `cdc_out`) and each stage sits
+    behind a `CSRClockDomainBridge`, which keeps its CSRs in the map under the same names.
+    
+    Parameters
+    ----------
+    stages : list
+        Stream stages in pipeline order (default: one pass-through `StreamProcessor`)
+    data_width : int
+        Width of the DMA data bus (default: 32 bits)
+    address_width : int
+        Width of the address bus (default: 32 bits for byte-addressable)
+    burst_length : int
+        Maximum number of beats per burst (default: 16)
+    fifo_depth : int
+        Depth in words of the read-ahead FIFO in front of the first stage (default: 64)
+    buffer_depth : int
+        Depth in words of the elastic buffers between stages and in front of the writer,
+        at least 2 for full throughput (default: 4)
+    read_port : LiteDRAMNativePort
+        Optional LiteDRAM port for the read engine (default: None, use `wb_dma_rd`)
+    write_port : LiteDRAMNativePort
+        Optional LiteDRAM port for the write engine (default: None, use `wb_dma_wr`)
+    dram_base : int
+        Bus address of the start of DRAM, for the native ports (default: 0x40000000)
+    bus_standard : str
+        DMA masters without LiteDRAM ports: "wishbone" or "axi" (default: "wishbone")
+    max_outstanding : int
+        Maximum number of bursts in flight per AXI master (default: 4)
+    with_perf : bool
+        Add performance counters (`perf`, see `PerfCounters`) (default: False)
+    clock_domain : str
+        Clock domain of the stages (default: "sys")
+    cdc_depth : int
+        Depth in words of the asynchronous FIFOs to and from the stages, with `clock_domain`
+        other than "sys" (default: 16)
+    
+    Attributes
+    ----------
+    stages : list
+        The stream stages (`stage0`, `stage1`, ..., or their `CSRClockDomainBridge` with
+        `clock_domain` other than "sys")
+    wb_dma_rd : wishbone.Interface
+        Wishbone master used by the read engine (without `read_port`)
+    wb_dma_wr : wishbone.Interface
+        Wishbone master used by the write engine (without `write_port`)
+    axi_dma_rd, axi_dma_wr : axi.AXIInterface
+        AXI4 masters used instead with `bus_standard="axi"`
+    dma_masters : dict
+        DMA masters to connect to the SoC DMA bus, by name
+    ev : CoalescingEventManager
+        Completion event (one per job)
+    interrupt : Signal
+        Interrupt request of `ev`
+    perf : PerfCounters
+        Performance counters (with `with_perf`)
+    control : CSRStorage
+        Control register (bit 0: start, bit 1: burst mode, bits 15-8: burst length)
+    status : CSRStatus
+        Status register (bit 0: busy, bit 1: done, bit 2: error)
+    src_addr, dst_addr : CSRStorage
+        Input and output buffer addresses
+    length, out_length : CSRStorage
+        Input and output lengths in bytes (`out_length` 0: same as `length`)
+    progress : CSRStatus
+        Output bytes written
+    """
+    
+    def __init__(self, stages=None, data_width=32, address_width=32, burst_length=16,
+        fifo_depth=64, buffer_depth=4, read_port=None, write_port=None, dram_base=0x40000000,
+        bus_standard="wishbone", max_outstanding=4, with_perf=False, clock_domain="sys", cdc_depth=16):
+        if stages is None:
+            stages = [StreamProcessor(data_width=data_width)]
+        
+        # CSR Registers
+        self.control    = CSRStorage(32, description="Control: bit 0 = start, bit 1 = burst mode, bits[15:8] = burst length in beats (0 = max)")
+        self.status     = CSRStatus(32, description="Status: bit 0 = busy, bit 1 = done, bit 2 = error")
+        self.src_addr   = CSRStorage(address_width, description="Input buffer address")
+        self.dst_addr   = CSRStorage(address_width, description="Output buffer address")
+        self.length     = CSRStorage(32, description="Input length in bytes")
+        self.out_length = CSRStorage(32, description="Output length in bytes (0 = same as length)")
+        self.progress   = CSRStatus(32, description="Output bytes written")
+        
+        # DMA interfaces (one master per engine)
+        self.dma_masters = {}
+        
+        # Interrupt
+        self.ev        = CoalescingEventManager()
+        self.interrupt = self.ev.irq
+        
+        bytes_per_word = data_width // 8
+        word_shift     = log2_int(bytes_per_word)
+        
+        # ========================================================================================
+        # Data Path: Read engine -> FIFO -> stage0 -> buffer -> stage1 ... -> buffer -> Write engine
+        # (with the stages in clock_domain: ... FIFO -> CDC -> stage0 ... -> CDC -> buffer ...)
+        # ========================================================================================
+        self.reader, self.writer, _, masters = _dma_engines(data_width, address_width, burst_length,
+            bus_standard, max_outstanding, read_port, write_port, dram_base)
+        for name, bus in masters.items():
+            setattr(self, f"{'axi' if bus_standard == 'axi' else 'wb'}_{name}", bus)  # wb_dma_rd, axi_dma_rd, ...
+            self.dma_masters[name] = bus
+        
+        self.fifo = stream.SyncFIFO([("data", data_width)], depth=fifo_depth, buffered=True)
+        self.comb += self.reader.source.connect(self.fifo.sink)
+        
+        # The stages and the buffers/converters between them run in clock_domain
+        in_stages = ClockDomainsRenamer(clock_domain)
+        
+        self.cdc_in = stream.ClockDomainCrossing([("data", data_width)],
+            cd_from = "sys",
+            cd_to   = clock_domain,
+            depth   = cdc_depth)
+        self.comb += self.fifo.source.connect(self.cdc_in.sink)
+        
+        self.stages = []
+        source = self.cdc_in.source
+        for i, stage in enumerate(stages):
+            if clock_domain != "sys":
+                # Stage CSRs written/read in sys (the bridge moves the stage to clock_domain)
+                self.stages.append(CSRClockDomainBridge(stage, clock_domain))
+            else:
+                self.stages.append(stage)
+            setattr(self, f"stage{i}", self.stages[-1])
+            if i > 0:
+                # Elastic buffer: registers valid/data and ready between the stages
+                buffer = in_stages(stream.SyncFIFO([("data", len(source.data))], depth=buffer_depth, buffered=True))
+                setattr(self, f"buffer{i}", buffer)
+                self.comb += source.connect(buffer.sink)
+                source = buffer.source
+            self._connect(source, stage.sink, f"converter{i}", clock_domain)
+            source = stage.source
+        
+        self.cdc_out = stream.ClockDomainCrossing([("data", len(source.data))],
+            cd_from = clock_domain,
+            cd_to   = "sys",
+            depth   = cdc_depth)
+        self.comb += source.connect(self.cdc_out.sink)
+        source = self.cdc_out.source
+        
+        self.out_buffer = stream.SyncFIFO([("data", len(source.data))], depth=buffer_depth, buffered=True)
+        self.comb += source.connect(self.out_buffer.sink)
+        self._connect(self.out_buffer.source, self.writer.sink, "out_converter")
+        
+        # Burst configuration (control bit 1 / bits[15:8])
+        self.comb += [
+            self.reader.burst.eq(self.control.storage[1]),
+            self.reader.burst_beats.eq(self.control.storage[8:16]),
+            self.writer.burst.eq(self.control.storage[1]),
+            self.writer.burst_beats.eq(self.control.storage[8:16]),
+        ]
+        
+        # ========================================================================================
+        # Job Control
+        # ========================================================================================
+        # Detect start edge
+        start_d = Signal()
+        self.sync += start_d.eq(self.control.storage[0])
+        start_pulse = Signal()
+        self.comb += start_pulse.eq(self.control.storage[0] & ~start_d)
+        
+        # Status signals
+        busy  = Signal()
+        done  = Signal()
+        error = Signal()
+        count = Signal(32)
+        
+        job_len = Signal(32)
+        out_len = Signal(32)
+        
+        # Buffers must be aligned to the data path width
+        misaligned = Signal()
+        if word_shift:
+            self.comb += misaligned.eq((self.src_addr.storage[:word_shift] != 0) | (self.dst_addr.storage[:word_shift] != 0))
+        
+        # 1. IDLE  - Wait for start
+        # 2. ISSUE - Hand the input to the reader and the output to the writer
+        # 3. RUN   - Stream until the writer has stored the last output word
+        # 4. DONE  - Signal completion
+        self.submodules.fsm = FSM(reset_state="IDLE")
+        
+        self.fsm.act("IDLE",
+            NextValue(busy, 0),
+            If(start_pulse,
+                NextValue(count, 0),
+                NextValue(busy, 1),
+                NextValue(done, 0),
+                NextValue(error, 0),
+                NextValue(job_len, self.length.storage),
+                NextValue(out_len, Mux(self.out_length.storage != 0, self.out_length.storage, self.length.storage)),
+                NextState("ISSUE")
+            )
+        )
+        
+        self.fsm.act("ISSUE",
+            self.reader.cmd.address.eq(self.src_addr.storage),
+            self.reader.cmd.length.eq(job_len),
+            self.writer.cmd.address.eq(self.dst_addr.storage),
+            self.writer.cmd.length.eq(out_len),
+            If(misaligned,
+                NextValue(error, 1),
+                NextState("DONE")
+            ).Elif(self.reader.cmd.ready & self.writer.cmd.ready,
+                self.reader.cmd.valid.eq(1),
+                self.writer.cmd.valid.eq(1),
+                NextState("RUN")
+            )
+        )
+        
+        self.fsm.act("RUN",
+            If(self.writer.sink.valid & self.writer.sink.ready,
+                NextValue(count, count + bytes_per_word)
+            ),
+            If(self.writer.done,
+                # Report the exact byte count (the last word may be partial)
+                NextValue(count, out_len),
+                NextState("DONE")
+            )
+        )
+        
+        self.fsm.act("DONE",
+            NextValue(busy, 0),
+            NextValue(done, 1),
+            self.ev.completion.eq(1),
+            NextState("IDLE")
+        )
+        
+        # Connect status outputs
+        self.comb += [
+            self.status.status[0].eq(busy),
+            self.status.status[1].eq(done),
+            self.status.status[2].eq(error),
+            self.progress.status.eq(count),
+        ]
+        
+        # Performance counters (bytes: input bytes of each completed job)
+        if with_perf:
+            self.perf = PerfCounters()
+            self.comb += [
+                self.perf.busy.eq(~self.fsm.ongoing("IDLE")),
+                self.perf.rd_stall.eq(self.reader.stall),
+                self.perf.wr_stall.eq(self.writer.stall),
+                If(self.fsm.ongoing("RUN") & self.writer.done,
+                    self.perf.bytes.eq(job_len)
+                ),
+                self.perf.job_start.eq(self.fsm.ongoing("IDLE") & start_pulse),
+                self.perf.job_done.eq(self.ev.completion),
+            ]
+    
+    def _connect(self, source, sink, name, clock_domain="sys"):
+        # Direct, or through a stream.Converter when the data widths differ
+        if len(source.data) == len(sink.data):
+            self.comb += source.connect(sink)
+        else:
+            converter = ClockDomainsRenamer(clock_domain)(stream.Converter(len(source.data), len(sink.data)))
+            setattr(self, name, converter)
+            self.comb += [
+                source.connect(converter.sink),
+                converter.source.connect(sink),
+            ]
+
+
+# ====================================================================================================
+# Keccak-f[1600] Permutation Datapath
+# ====================================================================================================
+
+# Round constants, rotation offsets and pi lane order (same tables as keccakf() in sha3_bench.c)
+KECCAK_RC = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808a, 0x8000000080008000,
+    0x000000000000808b, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008a, 0x0000000000000088, 0x0000000080008009, 0x000000008000000a,
+    0x000000008000808b, 0x800000000000008b, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800a, 0x800000008000000a,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+KECCAK_ROTC = [
+     1,  3,  6, 10, 15, 21, 28, 36, 45, 55,  2, 14,
+    27, 41, 56,  8, 25, 43, 62, 18, 39, 61, 20, 44,
+]
+KECCAK_PILN = [
+    10,  7, 11, 17, 18,  3,  5, 16,  8, 21, 24,  4,
+    15, 23, 19, 13, 12,  2, 20, 14, 22,  9,  6,  1,
+]
+
+# SHA3Accelerator modes: mode -> (name, rate in bytes, padding byte, digest bytes; 0 = XOF)
+SHA3_MODES = {
+    0b000: ("SHA3-256", 136, 0x06, 32),
+    0b001: ("SHA3-224", 144, 0x06, 28),
+    0b010: ("SHA3-384", 104, 0x06, 48),
+    0b011: ("SHA3-512",  72, 0x06, 64),
+    0b100: ("SHAKE128", 168, 0x1f,  0),
+    0b101: ("SHAKE256", 136, 0x1f,  0),
+}
+
+def _rotl64(x, n):
+    return Cat(x[64-n:], x[:64-n])
+
+class KeccakF1600(LiteXModule):
+    """
+    Keccak-f[1600] permutation datapath.
+    
+    Purely combinational: `state_out` is `state_in` after `unroll` rounds, starting at round
+    `step*unroll`. The owner registers `state_out` back into its state and steps `step` from 0
+    to `nsteps - 1` to run the 24 rounds, so a permutation takes 24/`unroll` cycles. Lanes are
+    indexed x + 5*y as in the FIPS 202 / sha3_bench.c state array.
+    
+    Parameters
+    ----------
+    unroll : int
+        Rounds per clock cycle: 1, 2, 3, 4, 6, 8, 12 or 24 (default: 1)
+    """
+    
+    def __init__(self, unroll=1):
+        assert 24 % unroll == 0
+        self.unroll = unroll
+        self.nsteps = nsteps = 24 // unroll
+        
+        self.state_in  = [Signal(64) for _ in range(25)]
+        self.state_out = [Signal(64) for _ in range(25)]
+        self.step      = Signal(max=max(nsteps, 2))
+        self.last      = Signal()  # Current step completes the permutation
+        
+        # # #
+        
+        self.comb += self.last.eq(self.step == (nsteps - 1))
+        
+        lanes = self.state_in
+        for r in range(unroll):
+            if nsteps == 1:
+                rc = Constant(KECCAK_RC[r], 64)
+            else:
+                rc = Array(Constant(KECCAK_RC[s*unroll + r], 64) for s in range(nsteps))[self.step]
+            lanes = self.add_round(lanes, rc)
+        self.comb += [o.eq(i) for o, i in zip(self.state_out, lanes)]
+    
+    def add_round(self, a, rc):
+        # Theta: column parities
+        bc = [Signal(64) for _ in range(5)]
+        self.comb += [bc[i].eq(a[i] ^ a[i + 5] ^ a[i + 10] ^ a[i + 15] ^ a[i + 20]) for i in range(5)]
+        d = [Signal(64) for _ in range(5)]
+        self.comb += [d[i].eq(bc[(i + 4) % 5] ^ _rotl64(bc[(i + 1) % 5], 1)) for i in range(5)]
+        st = [a[j] ^ d[j % 5] for j in range(25)]
+        
+        # Rho + Pi: rotate lanes and move them along the pi lane cycle
+        t = st[1]
+        for i in range(24):
+            j = KECCAK_PILN[i]
+            t, st[j] = st[j], _rotl64(t, KECCAK_ROTC[i])
+        b = [Signal(64) for _ in range(25)]
+        self.comb += [b[j].eq(st[j]) for j in range(25)]
+        
+        # Chi + Iota
+        out = [Signal(64) for _ in range(25)]
+        for y in range(0, 25, 5):
+            for x in range(5):
+                chi = b[y + x] ^ (~b[y + (x + 1) % 5] & b[y + (x + 2) % 5])
+                self.comb += out[y + x].eq(chi ^ rc if (y + x) == 0 else chi)
+        return out
+
+# ====================================================================================================
+# SHA3 Accelerator - Cryptographic Hash Function
+# ====================================================================================================
+
+class SHA3Accelerator(LiteXModule):
+    """
+    SHA3 (Keccak) Hardware Accelerator.
+    
+    Hashes a message read from memory by DMA and returns the digest in CSRs. The input is
+    absorbed one 64-bit lane per cycle, padded in hardware, and each block is permuted by a
+    KeccakF1600 datapath running `unroll` rounds per cycle.
+    
+    Supported variants (mode = {`control` bit 5, bits 2-1}, see `SHA3_MODES`):
+    - 000: SHA3-256 (136-byte rate, 32-byte digest)
+    - 001: SHA3-224 (144-byte rate, 28-byte digest)
+    - 010: SHA3-384 (104-byte rate, 48-byte digest)
+    - 011: SHA3-512 (72-byte rate, 64-byte digest)
+    - 100: SHAKE128 (168-byte rate, `output_length` bytes)
+    - 101: SHAKE256 (136-byte rate, `output_length` bytes)
+    
+    Modes 110 and 111 are reserved: starting with one of them completes immediately with
+    the error bit set. The rate and the padding byte (0x06 for SHA3, 0x1F for SHAKE) are
+    selected per job. SHAKE output of any length is streamed to `output_addr` by digest
+    writeback, permuting the state again after every `rate` bytes; the `hash_outN` CSRs
+    hold its first 64 bytes.
+    
+    Midstate: for messages sharing a constant prefix, a job with `midstate` bit 0 (load)
+    absorbs only the prefix (a multiple of the mode's rate) and saves the permuted state
+    on-chip instead of producing a digest. Jobs with bit 1 (reuse) start from that state, so
+    only the variable tail is read and permuted; they must select the same mode. Writing bit
+    2 invalidates the midstate.
+    
+    Digest writeback (`control` bit 4): the digest is also written by DMA to `output_addr`,
+    so software reads it from memory instead of through 16 uncached CSR loads. The
+    `hash_outN` CSRs remain as a debug view and can be left out with `with_hash_csrs=False`.
+    
+    Batch mode (`control` bit 3): hashes every message of a table of {addr, len} entries
+    (two 32-bit words each) at `batch_table`, writing digest i by DMA to `output_addr` +
+    i*stride, with a single interrupt at the end. The stride is the digest (or SHAKE output)
+    length rounded up to 32 bytes: 32 for SHA3-224/256, 64 for SHA3-384/512. Message and
+    output addresses must be aligned to the DMA data width.
+    
+    Parameters
+    ----------
+    data_width : int
+        Width of the DMA data bus (default: 64 bits for efficiency)
+    address_width : int
+        Width of the address bus (default: 32 bits)
+    read_port : LiteDRAMNativePort
+        Optional LiteDRAM port to read input data from, bypassing the DMA bus (default: None)
+    write_port : LiteDRAMNativePort
+        Optional LiteDRAM port to write digests to, bypassing the DMA bus (default: None)
+    dram_base : int
+        Bus address of the start of DRAM, for the native port (default: 0x40000000)
+    unroll : int
+        Keccak rounds per clock cycle, a divisor of 24 (default: 1). Higher values shorten the
+        permutation (24/`unroll` cycles per block) at the cost of area and Fmax.
+    with_hash_csrs : bool
+        Provide the `hash_outN` CSR view of the digest (default: True)
+    with_perf : bool
+        Add performance counters (`perf`, see `PerfCounters`) (default: False)
+    
+    Attributes
+    ----------
+    wb_dma : wishbone.Interface
+        Wishbone master interface for reading input data via DMA (without `read_port`)
+    wb_dma_wr : wishbone.Interface
+        Wishbone master interface for writing digests via DMA (without `write_port`)
+    wb_dma_table : wishbone.Interface
+        32-bit Wishbone master interface for reading the batch table
+    dma_masters : dict
+        DMA masters to connect to the SoC DMA bus, by name
+    ev : CoalescingEventManager
+        Completion event (pending/enable CSRs, interrupt coalescing)
+    interrupt : Signal
+        Interrupt request of `ev`
+    perf : PerfCounters
+        Performance counters (with `with_perf`)
+    control : CSRStorage
+        Control register (bit 0: start, bits 2-1: mode, bit 3: batch, bit 4: digest writeback,
+        bit 5: SHAKE)
+    status : CSRStatus
+        Status register (bit 0: busy, bit 1: done, bit 2: error, bit 3: midstate valid)
+    input_addr : CSRStorage
+        Memory address of input data
+    input_length : CSRStorage
+        Length of input data in bytes
+    midstate : CSRStorage
+        Midstate control (bit 0: load, bit 1: reuse, bit 2: invalidate)
+    batch_table, batch_count : CSRStorage
+        Address and number of entries of the batch message table
+    output_addr : CSRStorage
+        Digest output address (writeback) or buffer address (batch mode)
+    output_length : CSRStorage
+        SHAKE output length in bytes
+    batch_progress : CSRStatus
+        Messages hashed in the current batch
+    hash_output : CSRStatus (multiple)
+        Hash output registers (digest result, with `with_hash_csrs`)
+    """
+    
+    def __init__(self, data_width=64, address_width=32, read_port=None, write_port=None,
+        dram_base=0x40000000, unroll=1, with_hash_csrs=True, with_perf=False):
+        # ========================================================================================
+        # CSR Registers - Control Interface
+        # ========================================================================================
+        self.control      = CSRStorage(32, description="Control: bit 0=start, bits[2:1]=mode (00=SHA3-256, 01=SHA3-224, 10=SHA3-384, 11=SHA3-512; with bit 5: 00=SHAKE128, 01=SHAKE256), bit 3=batch, bit 4=digest writeback, bit 5=SHAKE")
+        self.status       = CSRStatus(32, description="Status: bit 0=busy, bit 1=done, bit 2=error, bit 3=midstate valid")
+        self.input_addr   = CSRStorage(address_width, description="Input data memory address")
+        self.input_length = CSRStorage(32, description="Input data length in bytes")
+        self.midstate     = CSRStorage(32, description="Midstate: bit 0=load (absorb a rate-aligned prefix and save the state), bit 1=reuse (start from the saved state), bit 2=invalidate (write 1)")
+        
+        # Batch mode
+        self.batch_table    = CSRStorage(address_width, description="Address of the {addr, len} message table")
+        self.batch_count    = CSRStorage(32, description="Number of messages in the table")
+        self.output_addr    = CSRStorage(address_width, description="Digest output address (batch mode: digest i at output_addr + i*stride, stride = output length rounded up to 32 bytes)")
+        self.output_length  = CSRStorage(32, description="SHAKE output length in bytes")
+        self.batch_progress = CSRStatus(32, description="Messages hashed in the current batch")
+        
+        # Hash output registers (8x 64-bit = 512 bits max for SHA3-512)
+        # For SHA3-256, only first 4 registers are used (256 bits)
+        # Debug view: digests can be written back to memory instead (control bit 4)
+        if with_hash_csrs:
+            self.hash_out0 = CSRStatus(32, description="Hash output word 0 (bits 31:0)")
+            self.hash_out1 = CSRStatus(32, description="Hash output word 1 (bits 63:32)")
+            self.hash_out2 = CSRStatus(32, description="Hash output word 2 (bits 95:64)")
+            self.hash_out3 = CSRStatus(32, description="Hash output word 3 (bits 127:96)")
+            self.hash_out4 = CSRStatus(32, description="Hash output word 4 (bits 159:128)")
+            self.hash_out5 = CSRStatus(32, description="Hash output word 5 (bits 191:160)")
+            self.hash_out6 = CSRStatus(32, description="Hash output word 6 (bits 223:192)")
+            self.hash_out7 = CSRStatus(32, description="Hash output word 7 (bits 255:224)")
+            self.hash_out8 = CSRStatus(32, description="Hash output word 8 (bits 287:256)")
+            self.hash_out9 = CSRStatus(32, description="Hash output word 9 (bits 319:288)")
+            self.hash_out10 = CSRStatus(32, description="Hash output word 10 (bits 351:320)")
+            self.hash_out11 = CSRStatus(32, description="Hash output word 11 (bits 383:352)")
+            self.hash_out12 = CSRStatus(32, description="Hash output word 12 (bits 415:384)")
+            self.hash_out13 = CSRStatus(32, description="Hash output word 13 (bits 447:416)")
+            self.hash_out14 = CSRStatus(32, description="Hash output word 14 (bits 479:448)")
+            self.hash_out15 = CSRStatus(32, description="Hash output word 15 (bits 511:480)")
+        
+        # ========================================================================================
+        # DMA Interface - For reading input data and writing digests
+        # ========================================================================================
+        # Input words are fetched by a read engine and digests stored by a write engine:
+        # Wishbone bursts on the DMA bus, or LiteDRAM native ports when given.
+        self.dma_masters = {}
+        if read_port is None:
+            self.wb_dma = wishbone.Interface(data_width=data_width, address_width=address_width)
+            self.dma_masters["dma"] = self.wb_dma
+            self.reader = BurstDMAReader(self.wb_dma)
+            self.comb += self.reader.burst.eq(1)
+        else:
+            assert read_port.data_width == data_width
+            self.reader = NativeDMAReader(read_port, address_width=address_width, dram_base=dram_base)
+        if write_port is None:
+            self.wb_dma_wr = wishbone.Interface(data_width=data_width, address_width=address_width)
+            self.dma_masters["dma_wr"] = self.wb_dma_wr
+            self.writer = BurstDMAWriter(self.wb_dma_wr)
+            self.comb += self.writer.burst.eq(1)
+        else:
+            assert write_port.data_width == data_width
+            self.writer = NativeDMAWriter(write_port, address_width=address_width, dram_base=dram_base)
+        
+        # Batch table entries are read on their own 32-bit master (like the DMA descriptors)
+        self.wb_dma_table = wishbone.Interface(data_width=32, address_width=address_width)
+        self.dma_masters["dma_table"] = self.wb_dma_table
+        self.table_reader = BurstDMAReader(self.wb_dma_table, burst_length=2)
+        self.comb += self.table_reader.burst.eq(1)
+        
+        # ========================================================================================
+        # Interrupt Signal
+        # ========================================================================================
+        self.ev        = CoalescingEventManager()
+        self.interrupt = self.ev.irq
+        
+        # ========================================================================================
+        # Internal State
+        # ========================================================================================
+        # Keccak state array (1600 bits = 5x5x64 bits)
+        # This is the core SHA3 state that gets permuted
+        state = Array([Signal(64) for _ in range(25)])
+        
+        # Hash output buffer (512 bits max)
+        hash_output = Signal(512)
+        
+        # Control signals
+        start = Signal()
+        busy = Signal()
+        done = Signal()
+        error = Signal()
+        
+        # SHA3 mode ({control[5], control[2:1]}, latched at start)
+        mode     = Signal(3)
+        mode_sel = Signal(3)
+        
+        # Midstate flags, latched at start
+        prefix = Signal()  # Job absorbs a prefix into the midstate
+        
+        # Current message (from the CSRs or from a batch table entry)
+        job_addr    = Signal(address_width)
+        job_length  = Signal(32)
+        batch       = Signal()
+        writeback   = Signal()
+        batch_index = Signal(32)
+        out_addr    = Signal(address_width)  # Output address of the current message
+        
+        # Detect start edge
+        start_d = Signal()
+        self.sync += start_d.eq(self.control.storage[0])
+        self.comb += [
+            start.eq(self.control.storage[0] & ~start_d),
+            # Decode the CSR mode when starting, the latched one during the job
+            If(busy,
+                mode_sel.eq(mode)
+            ).Else(
+                mode_sel.eq(Cat(self.control.storage[1:3], self.control.storage[5]))
+            ),
+        ]
+        
+        # ========================================================================================
+        # Mode Parameters
+        # ========================================================================================
+        mode_valid = Signal()
+        rate_lanes = Signal(max=22)    # Rate in 64-bit lanes
+        pad_byte   = Signal(8)         # Domain separation + first padding bit
+        out_bytes  = Signal(32)        # Digest / output length
+        out_stride = Signal(32)        # Batch output stride (out_bytes rounded up to 32)
+        mode_cases = {}
+        for value, (name, rate, pad, size) in SHA3_MODES.items():
+            mode_cases[value] = [
+                mode_valid.eq(1),
+                rate_lanes.eq(rate // 8),
+                pad_byte.eq(pad),
+                out_bytes.eq(size if size else self.output_length.storage),  # SHAKE: from the CSR
+            ]
+        self.comb += [
+            Case(mode_sel, mode_cases),
+            out_stride.eq(Cat(Constant(0, 5), (out_bytes + 31)[5:32])),
+        ]
+        
+        # ========================================================================================
+        # Input Lanes
+        # ========================================================================================
+        # Absorption works on 64-bit lanes: buffer the DMA words (so the next block is fetched
+        # while the current one is permuted) and convert them (little-endian, so the first lane
+        # is in the low bits) to a stream of lanes.
+        self.fifo      = stream.SyncFIFO([("data", data_width)], 16, buffered=True)
+        self.converter = stream.Converter(data_width, 64)
+        self.comb += [
+            self.reader.source.connect(self.fifo.sink),
+            self.fifo.source.connect(self.converter.sink),
+        ]
+        lanes = self.converter.source
+        
+        # ========================================================================================
+        # Digest Output
+        # ========================================================================================
+        # Output is streamed from the rate part of the state to the write engine, in words of
+        # min(64, data_width) bits so that no word beyond the output length is produced
+        out_width     = min(64, data_width)
+        out_parts     = 64 // out_width
+        out_lane      = Signal(max=21)                 # Lane index within the current output block
+        out_part      = Signal(max=max(out_parts, 2))  # Word index within the lane
+        out_remaining = Signal(32)                     # Output bytes not queued yet
+        out_lane_data = Signal(64)
+        self.digest_converter = stream.Converter(out_width, data_width)
+        digest = self.digest_converter.sink
+        self.comb += [
+            out_lane_data.eq(state[out_lane]),
+            digest.data.eq(Array(out_lane_data[i*out_width:(i+1)*out_width] for i in range(out_parts))[out_part]),
+            digest.last.eq(out_remaining <= (out_width // 8)),
+            self.digest_converter.source.connect(self.writer.sink),
+        ]
+        
+        # Messages and digests must be aligned to the DMA data width
+        word_shift = log2_int(data_width // 8)
+        job_misaligned    = Signal()
+        output_misaligned = Signal()
+        if word_shift:
+            self.comb += [
+                job_misaligned.eq(job_addr[:word_shift] != 0),
+                output_misaligned.eq(self.output_addr.storage[:word_shift] != 0),
+            ]
+        
+        # ========================================================================================
+        # Keccak-f[1600] Permutation
+        # ========================================================================================
+        self.keccak = KeccakF1600(unroll=unroll)
+        self.comb += [self.keccak.state_in[i].eq(state[i]) for i in range(25)]
+        
+        # ========================================================================================
+        # Absorb / Pad
+        # ========================================================================================
+        # Block of `rate_lanes` lanes, padding = pad_byte (0x06 / 0x1F) ... 0x80
+        lane       = Signal(max=21)  # Lane index within the current block
+        remaining  = Signal(32)      # Message bytes not absorbed yet
+        padded     = Signal()        # Padding start (pad_byte) has been absorbed
+        seen_last  = Signal()        # Last DMA lane has been consumed
+        
+        need_data  = Signal()
+        pad_now    = Signal()
+        lane_value = Signal(64)
+        lane_mask  = Array(Constant(2**(8*n) - 1, 64) for n in range(8))
+        self.comb += [
+            need_data.eq(remaining != 0),
+            pad_now.eq(~padded & (remaining < 8)),
+            If(remaining >= 8,
+                lane_value.eq(lanes.data)
+            ).Elif(need_data,
+                # Partial last lane: keep the message bytes, then the padding byte
+                lane_value.eq((lanes.data & lane_mask[remaining[:3]]) | (pad_byte << (remaining[:3] * 8)))
+            ).Elif(pad_now,
+                lane_value.eq(pad_byte)
+            ),
+            # Final bit of the padding goes in the last byte of the block
+            If(pad_now & (lane == (rate_lanes - 1)),
+                lane_value[56:64].eq(lane_value[56:64] | 0x80)
+            ),
+        ]
+        
+        # ========================================================================================
+        # Midstate
+        # ========================================================================================
+        # Keccak state after a constant prefix, restored at the start of reuse jobs
+        midstate         = [Signal(64) for _ in range(25)]
+        midstate_valid   = Signal()
+        midstate_capture = Signal()
+        self.sync += [
+            If(midstate_capture,
+                [midstate[i].eq(state[i]) for i in range(25)]
+            ),
+            If(self.midstate.re & self.midstate.storage[2],
+                midstate_valid.eq(0)
+            )
+        ]
+        
+        # State updates (clear or restore / absorb one lane / permute)
+        state_clear   = Signal()
+        state_absorb  = Signal()
+        absorb_index  = Signal(max=25)
+        absorb_value  = Signal(64)
+        state_permute = Signal()
+        self.sync += [
+            If(state_clear,
+                If(self.midstate.storage[1],
+                    [state[i].eq(midstate[i]) for i in range(25)]
+                ).Else(
+                    [state[i].eq(0) for i in range(25)]
+                )
+            ).Elif(state_permute,
+                [state[i].eq(self.keccak.state_out[i]) for i in range(25)]
+            ).Elif(state_absorb,
+                state[absorb_index].eq(state[absorb_index] ^ absorb_value)
+            )
+        ]
+        
+        # ========================================================================================
+        # Main FSM
+        # ========================================================================================
+        # 1. IDLE/INIT - Clear the Keccak state and start the DMA read
+        #    (batch mode: TABLE_* first reads the next {addr, len} entry)
+        # 2. ABSORB    - XOR one 64-bit lane per cycle into the state, padding the last block
+        # 3. PERMUTE   - Keccak-f[1600], `unroll` rounds per cycle
+        # 4. SQUEEZE   - Copy the digest lanes to the output registers
+        # 5. WRITE_*   - Writeback / batch mode: store the digest (or SHAKE output, permuting
+        #                again between output blocks) in the output buffer
+        # 6. COMPLETE  - Signal completion
+        
+        def start_job(length):
+            return [
+                NextValue(remaining, length),
+                NextValue(padded, 0),
+                NextValue(seen_last, length == 0),
+                NextValue(lane, 0),
+                NextValue(self.keccak.step, 0),
+                state_clear.eq(1),
+            ]
+        
+        self.submodules.fsm = FSM(reset_state="IDLE")
+        
+        self.fsm.act("IDLE",
+            NextValue(busy, 0),
+            If(start,
+                NextValue(busy, 1),
+                NextValue(done, 0),
+                NextValue(error, 0),
+                NextValue(batch, self.control.storage[3]),
+                NextValue(writeback, self.control.storage[3] | self.control.storage[4]),
+                NextValue(batch_index, 0),
+                NextValue(mode, mode_sel),
+                NextValue(out_addr, self.output_addr.storage),
+                NextValue(job_addr, self.input_addr.storage),
+                NextValue(job_length, self.input_length.storage),
+                # Midstate load only applies to single jobs
+                NextValue(prefix, self.midstate.storage[0] & ~self.control.storage[3]),
+                If(self.midstate.storage[0] & ~self.control.storage[3],
+                    # Saved again when the prefix completes
+                    NextValue(midstate_valid, 0)
+                ),
+                If(~mode_valid |
+                   (self.midstate.storage[1] & ~midstate_valid) |                  # Nothing to reuse
+                   (self.midstate.storage[0] & ~self.control.storage[3] &
+                    (self.input_length.storage[:3] != 0)) |                         # Prefix not lane-aligned
+                   ((self.control.storage[3] | self.control.storage[4]) & output_misaligned) |
+                   ((self.control.storage[3] | self.control.storage[4]) & (out_bytes == 0)),  # Empty SHAKE output
+                    NextValue(error, 1),
+                    NextState("FINISH")
+                ).Elif(self.control.storage[3],
+                    If(self.batch_count.storage == 0,
+                        NextState("FINISH")
+                    ).Else(
+                        NextState("TABLE_READ")
+                    )
+                ).Else(
+                    start_job(self.input_length.storage),
+                    NextState("INIT")
+                )
+            )
+        )
+        
+        self.fsm.act("TABLE_READ",
+            # Fetch the {addr, len} entry of the next message
+            self.table_reader.cmd.valid.eq(1),
+            self.table_reader.cmd.address.eq(self.batch_table.storage + (batch_index << 3)),
+            self.table_reader.cmd.length.eq(8),
+            If(self.table_reader.cmd.ready,
+                NextState("TABLE_ADDR")
+            )
+        )
+        
+        self.fsm.act("TABLE_ADDR",
+            self.table_reader.source.ready.eq(1),
+            If(self.table_reader.source.valid,
+                NextValue(job_addr, self.table_reader.source.data),
+                NextState("TABLE_LENGTH")
+            )
+        )
+        
+        self.fsm.act("TABLE_LENGTH",
+            self.table_reader.source.ready.eq(1),
+            If(self.table_reader.source.valid,
+                NextValue(job_length, self.table_reader.source.data),
+                start_job(self.table_reader.source.data),
+                NextState("INIT")
+            )
+        )
+        
+        self.fsm.act("INIT",
+            If(job_misaligned,
+                NextValue(error, 1),
+                NextState("FINISH")
+            ).Elif(job_length == 0,
+                NextState("ABSORB")
+            ).Else(
+                NextState("ABSORB_READ")
+            )
+        )
+        
+        self.fsm.act("ABSORB_READ",
+            # Ask the read engine for the whole input; words stream back in order
+            self.reader.cmd.valid.eq(1),
+            self.reader.cmd.address.eq(job_addr),
+            self.reader.cmd.length.eq(job_length),
+            If(self.reader.cmd.ready,
+                NextState("ABSORB")
+            )
+        )
+        
+        self.fsm.act("ABSORB",
+            If(prefix & ~need_data,
+                # End of the prefix: must end on a block boundary, no padding
+                If(lane == 0,
+                    midstate_capture.eq(1),
+                    NextValue(midstate_valid, 1)
+                ).Else(
+                    NextValue(error, 1)
+                ),
+                NextState("SQUEEZE")
+            ).Elif(padded,
+                # Rest of the padded block is zero apart from the final 0x80
+                state_absorb.eq(1),
+                absorb_index.eq(rate_lanes - 1),
+                absorb_value.eq(0x80 << 56),
+                NextState("PERMUTE")
+            ).Else(
+                lanes.ready.eq(need_data),
+                If(~need_data | lanes.valid,
+                    # XOR the next lane (message, partial + padding, or padding only)
+                    state_absorb.eq(1),
+                    absorb_index.eq(lane),
+                    absorb_value.eq(lane_value),
+                    If(remaining >= 8,
+                        NextValue(remaining, remaining - 8)
+                    ).Else(
+                        NextValue(remaining, 0)
+                    ),
+                    If(pad_now,
+                        NextValue(padded, 1)
+                    ),
+                    If(need_data & lanes.last,
+                        NextValue(seen_last, 1)
+                    ),
+                    NextValue(lane, lane + 1),
+                    If(lane == (rate_lanes - 1),
+                        NextValue(lane, 0),
+                        NextState("PERMUTE")
+                    )
+                )
+            )
+        )
+        
+        self.fsm.act("PERMUTE",
+            # Perform Keccak-f[1600] permutation (theta, rho, pi, chi, iota)
+            state_permute.eq(1),
+            NextValue(self.keccak.step, self.keccak.step + 1),
+            If(self.keccak.last,
+                NextValue(self.keccak.step, 0),
+                If(padded,
+                    NextState("SQUEEZE")
+                ).Else(
+                    NextState("ABSORB")
+                )
+            )
+        )
+        
+        self.fsm.act("SQUEEZE",
+            # Extract hash output from state (first 512 bits, truncated per mode by software)
+            If(~prefix,
+                NextValue(hash_output, Cat(*state[:8]))
+            ),
+            If(seen_last,
+                NextState("DIGEST")
+            ).Else(
+                NextState("DRAIN")
+            )
+        )
+        
+        self.fsm.act("DRAIN",
+            # Drop the unused lanes of the last (wide) DMA word
+            lanes.ready.eq(1),
+            If(lanes.valid & lanes.last,
+                NextState("DIGEST")
+            )
+        )
+        
+        self.fsm.act("DIGEST",
+            NextValue(out_lane, 0),
+            NextValue(out_part, 0),
+            NextValue(out_remaining, out_bytes),
+            If(writeback & ~prefix,
+                NextState("WRITE_CMD")
+            ).Else(
+                NextState("FINISH")
+            )
+        )
+        
+        self.fsm.act("WRITE_CMD",
+            self.writer.cmd.valid.eq(1),
+            self.writer.cmd.address.eq(out_addr),
+            self.writer.cmd.length.eq(out_bytes),
+            If(self.writer.cmd.ready,
+                NextState("WRITE_DIGEST")
+            )
+        )
+        
+        self.fsm.act("WRITE_DIGEST",
+            # Once the last lane is queued the state is free for the next message
+            digest.valid.eq(1),
+            If(digest.ready,
+                NextValue(out_remaining, out_remaining - (out_width // 8)),
+                NextValue(out_part, out_part + 1),
+                If(out_part == (out_parts - 1),
+                    NextValue(out_part, 0),
+                    NextValue(out_lane, out_lane + 1)
+                ),
+                If(digest.last,
+                    NextValue(out_addr, out_addr + out_stride),
+                    NextValue(batch_index, batch_index + batch),
+                    If(~batch | (batch_index == (self.batch_count.storage - 1)),
+                        NextState("WRITE_WAIT")
+                    ).Else(
+                        NextState("TABLE_READ")
+                    )
+                ).Elif((out_lane == (rate_lanes - 1)) & (out_part == (out_parts - 1)),
+                    # SHAKE: output block exhausted, permute for the next one
+                    NextValue(out_lane, 0),
+                    NextState("SQUEEZE_PERMUTE")
+                )
+            )
+        )
+        
+        self.fsm.act("SQUEEZE_PERMUTE",
+            state_permute.eq(1),
+            NextValue(self.keccak.step, self.keccak.step + 1),
+            If(self.keccak.last,
+                NextValue(self.keccak.step, 0),
+                NextState("WRITE_DIGEST")
+            )
+        )
+        
+        self.fsm.act("WRITE_WAIT",
+            # Interrupt only once the (last) digest is in memory
+            If(self.writer.done,
+                NextState("FINISH")
+            )
+        )
+        
+        self.fsm.act("FINISH",
+            NextValue(busy, 0),
+            NextValue(done, 1),
+            NextState("COMPLETE")
+        )
+        
+        self.fsm.act("COMPLETE",
+            # Generate interrupt
+            self.ev.completion.eq(1),
+            NextState("IDLE")
+        )
+        
+        # ========================================================================================
+        # Connect outputs
+        # ========================================================================================
+        self.comb += [
+            # Status register
+            self.status.status[0].eq(busy),
+            self.status.status[1].eq(done),
+            self.status.status[2].eq(error),
+            self.status.status[3].eq(midstate_valid),
+            self.batch_progress.status.eq(batch_index),
+        ]
         
-        self.fsm.act("PERMUTE",
-            # Perform Keccak-f[1600] permutation
-            # TODO: Implement 24 rounds of Keccak-f permutation
-            # This is the core cryptographic operation:
-            # - Theta (θ): XOR each bit with parities
-            # - Rho (ρ): Rotate lanes
-            # - Pi (π): Permute lanes
-            # - Chi (χ): Non-linear mixing
-            # - Iota (ι): Add round constant
-            
-            NextValue(round_counter, round_counter + 1),
-            If(round_counter >= 24,  # 24 rounds for Keccak-f[1600]
-                NextValue(round_counter, 0),
-                NextState("SQUEEZE")
+        if with_hash_csrs:
+            self.comb += [
+                # Hash output to CSR registers (split 512-bit output into 16x 32-bit words)
+                self.hash_out0.status.eq(hash_output[0:32]),
+                self.hash_out1.status.eq(hash_output[32:64]),
+                self.hash_out2.status.eq(hash_output[64:96]),
+                self.hash_out3.status.eq(hash_output[96:128]),
+                self.hash_out4.status.eq(hash_output[128:160]),
+                self.hash_out5.status.eq(hash_output[160:192]),
+                self.hash_out6.status.eq(hash_output[192:224]),
+                self.hash_out7.status.eq(hash_output[224:256]),
+                self.hash_out8.status.eq(hash_output[256:288]),
+                self.hash_out9.status.eq(hash_output[288:320]),
+                self.hash_out10.status.eq(hash_output[320:352]),
+                self.hash_out11.status.eq(hash_output[352:384]),
+                self.hash_out12.status.eq(hash_output[384:416]),
+                self.hash_out13.status.eq(hash_output[416:448]),
+                self.hash_out14.status.eq(hash_output[448:480]),
+                self.hash_out15.status.eq(hash_output[480:512]),
+            ]
+        
+        # ========================================================================================
+        # Performance Counters
+        # ========================================================================================
+        # Bytes are counted as message reads are issued; a batch counts as one job
+        if with_perf:
+            self.perf = PerfCounters()
+            self.comb += [
+                self.perf.busy.eq(~self.fsm.ongoing("IDLE")),
+                self.perf.rd_stall.eq(self.reader.stall | self.table_reader.stall),
+                self.perf.wr_stall.eq(self.writer.stall),
+                If(self.reader.cmd.valid & self.reader.cmd.ready,
+                    self.perf.bytes.eq(self.reader.cmd.length)
+                ),
+                self.perf.job_start.eq(self.fsm.ongoing("IDLE") & start),
+                self.perf.job_done.eq(self.ev.completion),
+            ]
+
+
+# ====================================================================================================
+# SHA3 Accelerator - DMA-fed sha3_ctrl.sv Core
+# ====================================================================================================
+
+class SHA3CtrlAccelerator(LiteXModule):
+    """
+    DMA front-end for the SystemVerilog SHA3-256 core (sha3_ctrl.sv + keccak_core.sv).
+    
+    Same register interface as SHA3Accelerator (SHA3-256 only), but the hashing is done by the
+    existing `sha3_ctrl` core instantiated as a black box. Instead of one CPU store per 32-bit
+    word (as with the avs_SHA_3.sv Avalon front-end), the input is read by DMA and streamed
+    into `data_in_strobe`/`data_in_data` whenever the core can accept a word.
+    
+    Parameters
+    ----------
+    platform : Platform
+        Platform the .sv sources are added to
+    data_width : int
+        Width of the DMA data bus (default: 32 bits, the core's input width)
+    address_width : int
+        Width of the address bus (default: 32 bits)
+    read_port : LiteDRAMNativePort
+        Optional LiteDRAM port to read input data from, bypassing the DMA bus (default: None)
+    dram_base : int
+        Bus address of the start of DRAM, for the native port (default: 0x40000000)
+    with_perf : bool
+        Add performance counters (`perf`, see `PerfCounters`) (default: False)
+    
+    Attributes
+    ----------
+    wb_dma : wishbone.Interface
+        Wishbone master interface for reading input data via DMA (without `read_port`)
+    dma_masters : dict
+        DMA masters to connect to the SoC DMA bus, by name
+    ev : CoalescingEventManager
+        Completion event (pending/enable CSRs, interrupt coalescing)
+    interrupt : Signal
+        Interrupt request of `ev`
+    perf : PerfCounters
+        Performance counters (with `with_perf`)
+    control : CSRStorage
+        Control register (bit 0: start)
+    status : CSRStatus
+        Status register (bit 0: busy, bit 1: done)
+    input_addr : CSRStorage
+        Memory address of input data
+    input_length : CSRStorage
+        Length of input data in bytes
+    core_status : CSRStatus
+        `csr_status` of the sha3_ctrl core (debug)
+    hash_out0-7 : CSRStatus
+        Hash output registers (digest result, same layout as SHA3Accelerator)
+    """
+    
+    def __init__(self, platform, data_width=32, address_width=32, read_port=None, dram_base=0x40000000,
+        with_perf=False):
+        # ========================================================================================
+        # CSR Registers - Control Interface
+        # ========================================================================================
+        self.control      = CSRStorage(32, description="Control: bit 0=start")
+        self.status       = CSRStatus(32, description="Status: bit 0=busy, bit 1=done")
+        self.input_addr   = CSRStorage(address_width, description="Input data memory address")
+        self.input_length = CSRStorage(32, description="Input data length in bytes")
+        self.core_status  = CSRStatus(32, description="sha3_ctrl csr_status (debug)")
+        
+        # Hash output registers (SHA3-256)
+        self.hash_out0 = CSRStatus(32, description="Hash output word 0 (bits 31:0)")
+        self.hash_out1 = CSRStatus(32, description="Hash output word 1 (bits 63:32)")
+        self.hash_out2 = CSRStatus(32, description="Hash output word 2 (bits 95:64)")
+        self.hash_out3 = CSRStatus(32, description="Hash output word 3 (bits 127:96)")
+        self.hash_out4 = CSRStatus(32, description="Hash output word 4 (bits 159:128)")
+        self.hash_out5 = CSRStatus(32, description="Hash output word 5 (bits 191:160)")
+        self.hash_out6 = CSRStatus(32, description="Hash output word 6 (bits 223:192)")
+        self.hash_out7 = CSRStatus(32, description="Hash output word 7 (bits 255:224)")
+        
+        # ========================================================================================
+        # DMA Interface - For reading input data from memory
+        # ========================================================================================
+        if read_port is None:
+            self.wb_dma = wishbone.Interface(data_width=data_width, address_width=address_width)
+            self.dma_masters = {"dma": self.wb_dma}
+            self.reader = BurstDMAReader(self.wb_dma)
+            self.comb += self.reader.burst.eq(1)
+        else:
+            assert read_port.data_width == data_width
+            self.dma_masters = {}
+            self.reader = NativeDMAReader(read_port, address_width=address_width, dram_base=dram_base)
+        
+        # DMA words -> 32-bit core words (first word in the low bits)
+        self.fifo      = stream.SyncFIFO([("data", data_width)], 16, buffered=True)
+        self.converter = stream.Converter(data_width, 32)
+        self.comb += [
+            self.reader.source.connect(self.fifo.sink),
+            self.fifo.source.connect(self.converter.sink),
+        ]
+        words = self.converter.source
+        
+        # ========================================================================================
+        # Interrupt Signal
+        # ========================================================================================
+        self.ev        = CoalescingEventManager()
+        self.interrupt = self.ev.irq
+        
+        # ========================================================================================
+        # sha3_ctrl Core
+        # ========================================================================================
+        core_reset         = Signal()
+        core_last_word     = Signal()
+        core_empty_message = Signal()
+        data_in_strobe     = Signal()
+        data_in_data       = Signal(32)
+        data_in_byteenable = Signal(4)
+        core_busy          = Signal()
+        core_done          = Signal()
+        core_waitrequest   = Signal()
+        hash_out_data      = Signal(256)
+        csr_status         = Signal(32)
+        core_ready         = Signal()
+        
+        self.specials += Instance("sha3_ctrl",
+            i_clk                = ClockSignal(),
+            i_reset              = ResetSignal(),
+            i_core_reset         = core_reset,
+            i_core_last_word     = core_last_word,
+            i_core_empty_message = core_empty_message,
+            i_data_in_strobe     = data_in_strobe,
+            i_data_in_data       = data_in_data,
+            i_data_in_byteenable = data_in_byteenable,
+            o_core_busy          = core_busy,
+            o_core_done          = core_done,
+            o_core_waitrequest   = core_waitrequest,
+            o_hash_out_data      = hash_out_data,
+            o_csr_status         = csr_status,
+            o_core_ready         = core_ready,
+        )
+        sv_dir = os.path.dirname(os.path.abspath(__file__))
+        for sv in ["keccak_core.sv", "sha3_ctrl.sv"]:
+            platform.add_source(os.path.join(sv_dir, sv))
+        
+        # The core only absorbs a word in IDLE, or in ABSORB while its block buffer has room;
+        # words written while it permutes would be dropped.
+        core_absorb = Signal()
+        core_accept = Signal()
+        self.comb += [
+            core_absorb.eq(csr_status[2:5] == 1),  # FSM_ABSORB
+            core_accept.eq(core_ready | (core_absorb & ~core_waitrequest)),
+        ]
+        
+        # ========================================================================================
+        # Control
+        # ========================================================================================
+        start = Signal()
+        busy  = Signal()
+        done  = Signal()
+        
+        start_d = Signal()
+        self.sync += start_d.eq(self.control.storage[0])
+        self.comb += start.eq(self.control.storage[0] & ~start_d)
+        
+        # Message bytes not sent to the core yet (sets the byte enables of the last word)
+        remaining = Signal(32)
+        be_tail   = Array(Constant(m, 4) for m in [0b0000, 0b0001, 0b0011, 0b0111])
+        self.comb += [
+            data_in_data.eq(words.data),
+            If(remaining >= 4,
+                data_in_byteenable.eq(0b1111)
+            ).Else(
+                data_in_byteenable.eq(be_tail[remaining[:2]])
+            ),
+        ]
+        
+        hash_output = Signal(256)
+        
+        # ========================================================================================
+        # Main FSM
+        # ========================================================================================
+        # 1. IDLE   - Wait for start
+        # 2. RESET  - Return the core to its IDLE state (clears a previous DONE)
+        # 3. READ   - Start the DMA read (or flag an empty message)
+        # 4. FEED   - Stream 32-bit words into the core, `last` on the final one
+        # 5. WAIT   - Wait for the core to pad, permute and squeeze
+        
+        self.submodules.fsm = FSM(reset_state="IDLE")
+        
+        self.fsm.act("IDLE",
+            If(start,
+                NextValue(busy, 1),
+                NextValue(done, 0),
+                NextValue(remaining, self.input_length.storage),
+                NextState("RESET")
             )
         )
         
-        self.fsm.act("SQUEEZE",
-            # Extract hash output from state
-            # TODO: Implement squeezing (copy state to output)
-            # For SHA3-256: extract first 256 bits
-            # For SHA3-512: extract first 512 bits
+        self.fsm.act("RESET",
+            core_reset.eq(1),
+            NextState("READ")
+        )
+        
+        self.fsm.act("READ",
+            If(self.input_length.storage == 0,
+                core_empty_message.eq(1),
+                NextState("WAIT")
+            ).Else(
+                self.reader.cmd.valid.eq(1),
+                self.reader.cmd.address.eq(self.input_addr.storage),
+                self.reader.cmd.length.eq(self.input_length.storage),
+                If(self.reader.cmd.ready,
+                    NextState("FEED")
+                )
+            )
+        )
+        
+        self.fsm.act("FEED",
+            # Wide DMA words may end with unused 32-bit words: they are sent with no byte
+            # enabled, which the core ignores apart from `last`.
+            words.ready.eq(core_accept),
+            data_in_strobe.eq(words.valid & core_accept),
+            core_last_word.eq(words.last),
+            If(words.valid & core_accept,
+                If(remaining >= 4,
+                    NextValue(remaining, remaining - 4)
+                ).Else(
+                    NextValue(remaining, 0)
+                ),
+                If(words.last,
+                    NextState("WAIT")
+                )
+            )
+        )
+        
+        self.fsm.act("WAIT",
+            If(core_done,
+                NextValue(hash_output, hash_out_data),
+                NextValue(busy, 0),
+                NextValue(done, 1),
+                NextState("COMPLETE")
+            )
+        )
+        
+        self.fsm.act("COMPLETE",
+            # Generate interrupt
+            self.ev.completion.eq(1),
+            NextState("IDLE")
+        )
+        
+        # ========================================================================================
+        # Connect outputs
+        # ========================================================================================
+        self.comb += [
+            # Status register
+            self.status.status[0].eq(busy),
+            self.status.status[1].eq(done),
+            self.core_status.status.eq(csr_status),
+            
+            # Hash output to CSR registers
+            self.hash_out0.status.eq(hash_output[0:32]),
+            self.hash_out1.status.eq(hash_output[32:64]),
+            self.hash_out2.status.eq(hash_output[64:96]),
+            self.hash_out3.status.eq(hash_output[96:128]),
+            self.hash_out4.status.eq(hash_output[128:160]),
+            self.hash_out5.status.eq(hash_output[160:192]),
+            self.hash_out6.status.eq(hash_output[192:224]),
+            self.hash_out7.status.eq(hash_output[224:256]),
+        ]
+        
+        # ========================================================================================
+        # Performance Counters
+        # ========================================================================================
+        if with_perf:
+            self.perf = PerfCounters()
+            self.comb += [
+                self.perf.busy.eq(~self.fsm.ongoing("IDLE")),
+                self.perf.rd_stall.eq(self.reader.stall),
+                If(self.reader.cmd.valid & self.reader.cmd.ready,
+                    self.perf.bytes.eq(self.reader.cmd.length)
+                ),
+                self.perf.job_start.eq(self.fsm.ongoing("IDLE") & start),
+                self.perf.job_done.eq(self.ev.completion),
+            ]
+
+
+# ====================================================================================================
+# TxPoW Accelerator - Parallel SHA3-256 Nonce Search
+# ====================================================================================================
+
+class TxPoWCore(LiteXModule):
+    """
+    TxPoW nonce-search engine (see `TxPoWAccelerator`).
+    
+    Searches a nonce range for a header whose SHA3-256 digest is below a difficulty target,
+    without the CPU in the loop. The header template (up to 135 bytes, one SHA3-256 block) is
+    written through `header_addr`/`header_data`; the engine pads it once, then `lanes` Keccak
+    cores hash consecutive nonces in lockstep. Each batch takes 24/`unroll` + 1 cycles, so the
+    hash rate is `lanes` * clk / (24/`unroll` + 1).
+    
+    The nonce is a 64-bit little-endian value that replaces header lane `nonce_lane` (bytes
+    8*`nonce_lane` to 8*`nonce_lane`+7). The digest is compared as a 256-bit big-endian number
+    (first digest byte most significant) against `target`: a winner has digest < target.
+    
+    The search stops, and `completion` is pulsed, when a winner is found (the lowest winning
+    nonce is reported), at the end of the range, or after a stop request.
+    
+    Parameters
+    ----------
+    lanes : int
+        Number of parallel Keccak cores (default: 4)
+    unroll : int
+        Keccak rounds per clock cycle in each core, a divisor of 24 (default: 1)
+    with_perf : bool
+        Add performance counters (`perf`, see `PerfCounters`) (default: False)
+    
+    Attributes
+    ----------
+    completion : Signal
+        Pulsed when a search finishes (winner found, range exhausted or stopped)
+    perf : PerfCounters
+        Performance counters (with `with_perf`)
+    control : CSRStorage
+        Control register (bit 0: start, bit 1: stop)
+    status : CSRStatus
+        Status register (bit 0: busy, bit 1: done, bit 2: found, bit 3: error)
+    nonce_start, nonce_end : CSRStorage
+        Nonce range to search, [nonce_start, nonce_end)
+    target0-7 : CSRStorage
+        Difficulty target, target0 = bits 31:0 (least significant)
+    nonce_current : CSRStatus
+        First nonce of the batch being hashed
+    nonce_found : CSRStatus
+        Winning nonce (valid when found)
+    hash_out0-7 : CSRStatus
+        Winning digest, same layout as SHA3Accelerator
+    """
+    
+    def __init__(self, lanes=4, unroll=1, with_perf=False):
+        rate_bytes = 136  # SHA3-256
+        
+        # ========================================================================================
+        # CSR Registers - Control Interface
+        # ========================================================================================
+        self.control       = CSRStorage(32, description="Control: bit 0=start, bit 1=stop")
+        self.status        = CSRStatus(32, description="Status: bit 0=busy, bit 1=done, bit 2=found, bit 3=error")
+        self.header_addr   = CSRStorage(8,  description="Header template word index (32-bit words) for header_data")
+        self.header_data   = CSRStorage(32, description="Header template data, written to word header_addr")
+        self.header_length = CSRStorage(8,  description="Header length in bytes (max 135)")
+        self.nonce_lane    = CSRStorage(5,  description="Header lane (8-byte word) replaced by the 64-bit nonce")
+        self.nonce_start   = CSRStorage(64, description="First nonce of the search range")
+        self.nonce_end     = CSRStorage(64, description="End of the search range (exclusive)")
+        
+        # Difficulty target (256-bit number, target0 = least significant word)
+        self.target0 = CSRStorage(32, description="Target bits 31:0")
+        self.target1 = CSRStorage(32, description="Target bits 63:32")
+        self.target2 = CSRStorage(32, description="Target bits 95:64")
+        self.target3 = CSRStorage(32, description="Target bits 127:96")
+        self.target4 = CSRStorage(32, description="Target bits 159:128")
+        self.target5 = CSRStorage(32, description="Target bits 191:160")
+        self.target6 = CSRStorage(32, description="Target bits 223:192")
+        self.target7 = CSRStorage(32, description="Target bits 255:224")
+        
+        self.nonce_current = CSRStatus(64, description="First nonce of the batch being hashed")
+        self.nonce_found   = CSRStatus(64, description="Winning nonce")
+        
+        # Winning digest (SHA3-256)
+        self.hash_out0 = CSRStatus(32, description="Hash output word 0 (bits 31:0)")
+        self.hash_out1 = CSRStatus(32, description="Hash output word 1 (bits 63:32)")
+        self.hash_out2 = CSRStatus(32, description="Hash output word 2 (bits 95:64)")
+        self.hash_out3 = CSRStatus(32, description="Hash output word 3 (bits 127:96)")
+        self.hash_out4 = CSRStatus(32, description="Hash output word 4 (bits 159:128)")
+        self.hash_out5 = CSRStatus(32, description="Hash output word 5 (bits 191:160)")
+        self.hash_out6 = CSRStatus(32, description="Hash output word 6 (bits 223:192)")
+        self.hash_out7 = CSRStatus(32, description="Hash output word 7 (bits 255:224)")
+        
+        self.completion = Signal()
+        
+        # ========================================================================================
+        # Control
+        # ========================================================================================
+        start = Signal()
+        stop  = Signal()
+        busy  = Signal()
+        done  = Signal()
+        found = Signal()
+        error = Signal()
+        
+        start_d = Signal()
+        self.sync += start_d.eq(self.control.storage[0])
+        self.comb += [
+            start.eq(self.control.storage[0] & ~start_d),
+            stop.eq(self.control.storage[1]),
+        ]
+        
+        target = Signal(256)
+        self.comb += target.eq(Cat(
+            self.target0.storage, self.target1.storage, self.target2.storage, self.target3.storage,
+            self.target4.storage, self.target5.storage, self.target6.storage, self.target7.storage))
+        
+        # ========================================================================================
+        # Header Template
+        # ========================================================================================
+        header = Array(Signal(32) for _ in range(rate_bytes // 4))
+        self.sync += If(self.header_data.re & (self.header_addr.storage < len(header)),
+            header[self.header_addr.storage].eq(self.header_data.storage)
+        )
+        
+        # Padded block: header bytes, 0x06 after the last one, 0x80 in the last byte of the block.
+        # Registered: it only changes with the CSRs, not during a search.
+        length = self.header_length.storage
+        block  = Signal(8*rate_bytes)
+        for i in range(rate_bytes):
+            data = header[i // 4][8*(i % 4):8*(i % 4 + 1)]
+            pad  = 0x80 if i == (rate_bytes - 1) else 0x00
+            self.sync += [
+                If(length > i,
+                    block[8*i:8*(i + 1)].eq(data | pad)
+                ).Elif(length == i,
+                    block[8*i:8*(i + 1)].eq(0x06 | pad)
+                ).Else(
+                    block[8*i:8*(i + 1)].eq(pad)
+                )
+            ]
+        
+        # Nonce lane must lie inside the header
+        config_ok = Signal()
+        self.comb += config_ok.eq(
+            (length < rate_bytes) &
+            ((Cat(C(0, 3), self.nonce_lane.storage) + 8) <= length))
+        
+        # ========================================================================================
+        # Keccak Lanes
+        # ========================================================================================
+        base  = Signal(64)  # Nonce of lane 0 in the current batch
+        step  = Signal(max=max(24 // unroll, 2))
+        load  = Signal()    # Load the next batch (nonce load_base + j in lane j)
+        load_base = Signal(64)
+        permute   = Signal()
+        
+        nonces  = []
+        wins    = []
+        digests = []
+        for j in range(lanes):
+            keccak = KeccakF1600(unroll=unroll)
+            self.submodules += keccak
+            state = keccak.state_in
+            self.comb += keccak.step.eq(step)
+            
+            nonce = Signal(64)
+            self.comb += nonce.eq(base + j)
+            new_nonce = Signal(64)
+            self.comb += new_nonce.eq(load_base + j)
+            
+            for l in range(25):
+                if l < rate_bytes // 8:
+                    value = Mux(self.nonce_lane.storage == l, new_nonce, block[64*l:64*(l + 1)])
+                else:
+                    value = 0
+                self.sync += [
+                    If(load,
+                        state[l].eq(value)
+                    ).Elif(permute,
+                        state[l].eq(keccak.state_out[l])
+                    )
+                ]
             
-            # Placeholder: just store some values
-            NextValue(hash_output, Cat(*state[:8])),  # First 512 bits of state
+            # Digest as a big-endian number for the target compare
+            digest = Signal(256)
+            self.comb += digest.eq(Cat(*state[:4]))
+            digest_be = Cat(*[digest[8*(31 - k):8*(32 - k)] for k in range(32)])
+            win = Signal()
+            self.comb += win.eq((digest_be < target) & (nonce < self.nonce_end.storage))
+            
+            nonces.append(nonce)
+            wins.append(win)
+            digests.append(digest)
+        
+        # Lowest winning lane (= lowest nonce)
+        any_win   = Signal()
+        win_index = Signal(max=max(lanes, 2))
+        self.comb += any_win.eq(reduce(or_, wins))
+        for j in reversed(range(lanes)):
+            self.comb += If(wins[j], win_index.eq(j))
+        
+        next_base = Signal(65)
+        self.comb += next_base.eq(base + lanes)
+        
+        hash_output = Signal(256)
+        
+        # ========================================================================================
+        # Main FSM
+        # ========================================================================================
+        # 1. IDLE    - Wait for start, check the configuration
+        # 2. LOAD    - Load the padded header with nonces base..base+lanes-1 into the cores
+        # 3. PERMUTE - Keccak-f[1600], `unroll` rounds per cycle
+        # 4. CHECK   - Compare the digests, then stop or load the next batch
+        
+        self.submodules.fsm = FSM(reset_state="IDLE")
+        
+        self.fsm.act("IDLE",
             NextValue(busy, 0),
-            NextValue(done, 1),
-            NextState("COMPLETE")
+            If(start,
+                NextValue(busy, 1),
+                NextValue(done, 0),
+                NextValue(found, 0),
+                NextValue(error, 0),
+                NextValue(base, self.nonce_start.storage),
+                If(~config_ok,
+                    NextValue(error, 1),
+                    NextState("COMPLETE")
+                ).Elif(self.nonce_start.storage >= self.nonce_end.storage,
+                    NextState("COMPLETE")
+                ).Else(
+                    NextState("LOAD")
+                )
+            )
+        )
+        
+        self.fsm.act("LOAD",
+            load.eq(1),
+            load_base.eq(base),
+            NextValue(step, 0),
+            NextState("PERMUTE")
+        )
+        
+        self.fsm.act("PERMUTE",
+            permute.eq(1),
+            NextValue(step, step + 1),
+            If(step == (24 // unroll - 1),
+                NextState("CHECK")
+            )
+        )
+        
+        self.fsm.act("CHECK",
+            If(any_win,
+                NextValue(self.nonce_found.status, base + win_index),
+                NextValue(hash_output, Array(digests)[win_index]),
+                NextValue(found, 1),
+                NextState("COMPLETE")
+            ).Elif(stop | (next_base >= self.nonce_end.storage),
+                NextState("COMPLETE")
+            ).Else(
+                # Next batch straight away (no LOAD cycle)
+                load.eq(1),
+                load_base.eq(next_base),
+                NextValue(base, next_base),
+                NextValue(step, 0),
+                NextState("PERMUTE")
+            )
         )
         
         self.fsm.act("COMPLETE",
-            # Generate interrupt
-            NextValue(self.interrupt, 1),
+            # Completion (interrupt in TxPoWAccelerator)
+            NextValue(busy, 0),
+            NextValue(done, 1),
+            self.completion.eq(1),
             NextState("IDLE")
         )
         
@@ -513,9 +3785,11 @@ class SHA3Accelerator(LiteXModule):
             # Status register
             self.status.status[0].eq(busy),
             self.status.status[1].eq(done),
-            self.status.status[2].eq(error),
+            self.status.status[2].eq(found),
+            self.status.status[3].eq(error),
+            self.nonce_current.status.eq(base),
             
-            # Hash output to CSR registers (split 512-bit output into 16x 32-bit words)
+            # Winning digest
             self.hash_out0.status.eq(hash_output[0:32]),
             self.hash_out1.status.eq(hash_output[32:64]),
             self.hash_out2.status.eq(hash_output[64:96]),
@@ -524,27 +3798,77 @@ class SHA3Accelerator(LiteXModule):
             self.hash_out5.status.eq(hash_output[160:192]),
             self.hash_out6.status.eq(hash_output[192:224]),
             self.hash_out7.status.eq(hash_output[224:256]),
-            self.hash_out8.status.eq(hash_output[256:288]),
-            self.hash_out9.status.eq(hash_output[288:320]),
-            self.hash_out10.status.eq(hash_output[320:352]),
-            self.hash_out11.status.eq(hash_output[352:384]),
-            self.hash_out12.status.eq(hash_output[384:416]),
-            self.hash_out13.status.eq(hash_output[416:448]),
-            self.hash_out14.status.eq(hash_output[448:480]),
-            self.hash_out15.status.eq(hash_output[480:512]),
-        ]
-        
-        # ========================================================================================
-        # TODO: Implement actual SHA3/Keccak algorithm
-        # ========================================================================================
-        # Key components to implement:
-        # 1. Keccak-f[1600] permutation function (5 sub-rounds x 24 rounds)
-        # 2. Padding function (append 0x06 for SHA3, then 10*1 padding)
-        # 3. Rate/capacity handling (depends on SHA3 variant)
-        # 4. Multi-block processing (for inputs > rate size)
-        #
-        # Resources:
-        # - NIST FIPS 202: SHA-3 Standard
-        # - Keccak reference: https://keccak.team/keccak.html
-        # - Existing FPGA implementations on GitHub
+        ]
+        
+        # ========================================================================================
+        # Performance Counters
+        # ========================================================================================
+        # No DMA: bytes are the header bytes hashed by the lanes of each batch
+        if with_perf:
+            self.perf = PerfCounters()
+            self.comb += [
+                self.perf.busy.eq(~self.fsm.ongoing("IDLE")),
+                If(load,
+                    self.perf.bytes.eq(self.header_length.storage * lanes)
+                ),
+                self.perf.job_start.eq(self.fsm.ongoing("IDLE") & start),
+                self.perf.job_done.eq(self.completion),
+            ]
+
 
+class TxPoWAccelerator(LiteXModule):
+    """
+    TxPoW nonce-search accelerator: a `TxPoWCore` with its completion interrupt.
+    
+    The core may run in its own `clock_domain` (e.g. `accel`, see `--accel-clk-freq` in
+    alinx_ax7203.py), so the Keccak lanes can be clocked above `sys`: the search has no DMA,
+    only CSRs. The core then sits behind a `CSRClockDomainBridge` (hash rate and `perf` cycles
+    in `clock_domain`), and its completion pulse is synchronized to `sys` for `ev`. Either way
+    the core's registers keep their names (`control`, `status`, `nonce_start`, ...).
+    
+    Parameters
+    ----------
+    lanes : int
+        Number of parallel Keccak cores (default: 4)
+    unroll : int
+        Keccak rounds per clock cycle in each core, a divisor of 24 (default: 1)
+    with_perf : bool
+        Add performance counters (`perf`, see `PerfCounters`) (default: False)
+    clock_domain : str
+        Clock domain of the core (default: "sys")
+    
+    Attributes
+    ----------
+    core : TxPoWCore or CSRClockDomainBridge
+        The search engine (its registers, or their `sys` twins)
+    ev : CoalescingEventManager
+        Completion event: search finished (winner found, range exhausted or stopped)
+    interrupt : Signal
+        Interrupt request of `ev`
+    """
+    
+    def __init__(self, lanes=4, unroll=1, with_perf=False, clock_domain="sys"):
+        core = TxPoWCore(lanes=lanes, unroll=unroll, with_perf=with_perf)
+        
+        # ========================================================================================
+        # Interrupt Signal
+        # ========================================================================================
+        self.ev        = CoalescingEventManager()
+        self.interrupt = self.ev.irq
+        
+        if clock_domain == "sys":
+            self.core = core
+            self.comb += self.ev.completion.eq(core.completion)
+        else:
+            self.core = CSRClockDomainBridge(core, clock_domain)
+            self.completion_cdc = PulseSynchronizer(clock_domain, "sys")
+            self.comb += [
+                self.completion_cdc.i.eq(core.completion),
+                self.ev.completion.eq(self.completion_cdc.o),
+            ]
+        
+        # The core's registers without a `core_` prefix (see get_csrs)
+        self.autocsr_exclude = {"core"}
+    
+    def get_csrs(self):
+        return self.core.get_csrs() + LiteXModule.get_csrs(self)
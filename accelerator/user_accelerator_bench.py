@@ -0,0 +1,814 @@
+#!/usr/bin/env python3
+
+#
+# User Accelerator Benchmarks
+#
+# Cycle-accurate benchmarks of the accelerators in user_accelerator.py, run in Migen's
+# simulator against a Wishbone memory model with configurable latency. No FPGA or vendor
+# tools are needed:
+#
+#   python3 user_accelerator_bench.py
+#   python3 user_accelerator_bench.py --accelerators dma-burst --sizes 64 4096 --read-latency 8
+#
+# Each accelerator is driven through its CSRs the way the software does (see
+# dma_performance.c / sha3_bench.c), the results are checked against the source data,
+# hashlib, a software CRC32C or the sha3_golden.py model, and cycles per word and throughput are reported for
+# every transfer size.
+#
+
+import argparse
+import hashlib
+import random
+import struct
+import sys
+
+from migen import *
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect.csr import CSRStorage, CSRStatus
+from litex.soc.interconnect import stream
+from litex.soc.interconnect import axi
+
+from litex.build.generic_platform import GenericPlatform
+
+from user_accelerator import UserAccelerator, SimpleDMAEngine, SHA3Accelerator, SHA3CtrlAccelerator, TxPoWAccelerator
+from user_accelerator import StreamProcessor, StreamPipeline, KeccakF1600
+from user_accelerator import CRC32C_POLY, DMA_OP_FILL, DMA_OP_CRC32C, DMA_OP_COMPARE
+
+import sha3_golden
+
+# ====================================================================================================
+# Memory Model
+# ====================================================================================================
+
+class WishboneMemoryModel:
+    """
+    Wishbone slave memory model for `run_simulation`.
+
+    Byte-addressed memory shared by any number of Wishbone masters (of any data width), each
+    served by its own generator from `slave()`. A cycle is acknowledged `read_latency` or
+    `write_latency` cycles after `stb` is first seen; the following beats of an incrementing
+    burst (cti=010) then take 1 + `wait_states` cycles each, so with no wait states a burst
+    moves one word per cycle. Only the bytes enabled by `sel` are written.
+
+    AXI4 masters are served by `axi_slave()` with the same timings, per burst: any number of
+    bursts can be pending, each one returning its first beat `read_latency` cycles after AR
+    (write response `write_latency` cycles after the last W beat). `slaves()` picks the
+    right generator for each master of a `dma_masters` dict.
+
+    Parameters
+    ----------
+    size : int
+        Memory size in bytes
+    base : int
+        Bus address of the first byte (default: 0)
+    read_latency : int
+        Cycles from `stb` to `ack` for reads, at least 1 (default: 1)
+    write_latency : int
+        Cycles from `stb` to `ack` for writes, at least 1 (default: 1)
+    wait_states : int
+        Extra cycles between the beats of a burst (default: 0)
+    """
+
+    def __init__(self, size, base=0, read_latency=1, write_latency=1, wait_states=0):
+        assert read_latency >= 1 and write_latency >= 1 and wait_states >= 0
+        self.data          = bytearray(size)
+        self.base          = base
+        self.read_latency  = read_latency
+        self.write_latency = write_latency
+        self.wait_states   = wait_states
+        self.reads         = 0  # Beats served
+        self.writes        = 0
+
+    def write(self, address, data):
+        offset = self._offset(address, len(data))
+        self.data[offset:offset + len(data)] = data
+
+    def read(self, address, length):
+        offset = self._offset(address, length)
+        return bytes(self.data[offset:offset + length])
+
+    def _offset(self, address, length):
+        offset = address - self.base
+        if offset < 0 or offset + length > len(self.data):
+            raise ValueError(f"Access outside of the memory model: 0x{address:08x} ({length} bytes)")
+        return offset
+
+    @passive
+    def slave(self, bus):
+        bytes_per_word = len(bus.dat_w) // 8
+        ack     = 0     # ack driven in the current cycle
+        pending = None  # Word address being served (the next beat in a burst)
+        write   = 0
+        delay   = 0     # Cycles before ack
+        while True:
+            cyc = yield bus.cyc
+            stb = yield bus.stb
+            adr = yield bus.adr
+            if not cyc:
+                pending = None
+            elif ack and stb:
+                # Beat completed in this cycle
+                if adr != pending:
+                    raise RuntimeError(f"Wishbone address 0x{adr:x} changed while served (expected 0x{pending:x})")
+                if write:
+                    sel  = yield bus.sel
+                    data = (yield bus.dat_w).to_bytes(bytes_per_word, "little")
+                    for i in range(bytes_per_word):
+                        if (sel >> i) & 1:
+                            self.write(adr*bytes_per_word + i, data[i:i+1])
+                    self.writes += 1
+                else:
+                    self.reads += 1
+                if (yield bus.cti) == 0b010:
+                    pending = adr + 1
+                    delay   = self.wait_states
+                else:
+                    pending = None
+            elif pending is None and stb:
+                # New cycle
+                pending = adr
+                write   = yield bus.we
+                delay   = (self.write_latency if write else self.read_latency) - 1
+
+            # Drive the next cycle
+            if pending is not None and delay == 0:
+                ack = 1
+                if not write:
+                    yield bus.dat_r.eq(int.from_bytes(self.read(pending*bytes_per_word, bytes_per_word), "little"))
+            else:
+                ack = 0
+                if pending is not None:
+                    delay -= 1
+            yield bus.ack.eq(ack)
+            yield
+
+    @passive
+    def axi_slave(self, bus, reorder=False):
+        """
+        AXI4 slave generator for `bus` (INCR bursts). With `reorder`, read bursts of different
+        IDs are returned newest first once their latency has elapsed (bursts of the same ID
+        always in order), as an interconnect with several slaves may do.
+        """
+        bytes_per_word = len(bus.w.data) // 8
+        cycle     = 0
+        reads     = []    # Pending read bursts: [cycle ready, id, word address, beats]
+        burst     = None  # Read burst being returned: [id, word address, beats left]
+        gap       = 0     # Wait states before the next beat
+        r_valid   = 0
+        writes    = []    # Addressed write bursts, in AW order: [id, word address]
+        w_ready   = 0
+        responses = []    # Write responses: [cycle ready, id]
+        b_valid   = 0
+        yield bus.ar.ready.eq(1)
+        yield bus.aw.ready.eq(1)
+        while True:
+            # Handshakes of the current cycle
+            for ax, name in [(bus.ar, "AR"), (bus.aw, "AW")]:
+                if (yield ax.valid):
+                    addr  = yield ax.addr
+                    beats = (yield ax.len) + 1
+                    if (addr // 4096) != ((addr + beats*bytes_per_word - 1) // 4096):
+                        raise RuntimeError(f"AXI {name} burst 0x{addr:08x} ({beats} beats) crosses a 4 KB boundary")
+            if (yield bus.ar.valid):
+                reads.append([cycle + self.read_latency, (yield bus.ar.id),
+                    (yield bus.ar.addr) // bytes_per_word, (yield bus.ar.len) + 1])
+            if r_valid and (yield bus.r.ready):
+                self.reads += 1
+                burst[1] += 1
+                burst[2] -= 1
+                gap = self.wait_states
+                if burst[2] == 0:
+                    burst = None
+            if (yield bus.aw.valid):
+                writes.append([(yield bus.aw.id), (yield bus.aw.addr) // bytes_per_word])
+            if w_ready and (yield bus.w.valid):
+                strb = yield bus.w.strb
+                data = (yield bus.w.data).to_bytes(bytes_per_word, "little")
+                for i in range(bytes_per_word):
+                    if (strb >> i) & 1:
+                        self.write(writes[0][1]*bytes_per_word + i, data[i:i+1])
+                self.writes += 1
+                writes[0][1] += 1
+                if (yield bus.w.last):
+                    responses.append([cycle + self.write_latency, writes.pop(0)[0]])
+            if b_valid and (yield bus.b.ready):
+                responses.pop(0)
+
+            # Drive the next cycle
+            if burst is None:
+                ready = [r for i, r in enumerate(reads)
+                    if r[0] <= cycle and not any(o[1] == r[1] for o in reads[:i])]
+                if ready:
+                    pick = ready[-1] if reorder else ready[0]
+                    reads.remove(pick)
+                    burst = pick[1:]
+            r_valid = int(burst is not None and gap == 0)
+            if r_valid:
+                yield bus.r.id.eq(burst[0])
+                yield bus.r.data.eq(int.from_bytes(self.read(burst[1]*bytes_per_word, bytes_per_word), "little"))
+                yield bus.r.last.eq(burst[2] == 1)
+            elif gap:
+                gap -= 1
+            yield bus.r.valid.eq(r_valid)
+            w_ready = int(len(writes) > 0)
+            yield bus.w.ready.eq(w_ready)
+            b_valid = int(len(responses) > 0 and responses[0][0] <= cycle)
+            if b_valid:
+                yield bus.b.id.eq(responses[0][1])
+            yield bus.b.valid.eq(b_valid)
+            cycle += 1
+            yield
+
+    def slaves(self, masters):
+        """Slave generators for the DMA masters `masters` (dict, e.g. `dma_masters`)."""
+        return [self.axi_slave(bus, reorder=True) if isinstance(bus, axi.AXIInterface) else self.slave(bus)
+            for bus in masters.values()]
+
+# ====================================================================================================
+# CSR Helpers
+# ====================================================================================================
+
+def csr_write(csr, value):
+    yield csr.storage.eq(value)
+    yield csr.re.eq(1)
+    yield
+    yield csr.re.eq(0)
+
+def perf_snapshot(perf):
+    yield from csr_write(perf.control, 0b01)
+    yield
+    return {
+        "rd_stall": (yield perf.rd_stall_cycles.status),
+        "wr_stall": (yield perf.wr_stall_cycles.status),
+    }
+
+def run_job(dut, control, timeout, perf_control=None):
+    """Start a job with `control`, wait until `status` busy falls and return the cycle count."""
+    yield from csr_write(dut.perf.control if perf_control is None else perf_control, 0b10)
+    yield dut.control.storage.eq(control)
+    yield dut.control.re.eq(1)
+    yield
+    yield dut.control.re.eq(0)
+    cycles = 1
+    started = False
+    while True:
+        busy = (yield dut.status.status) & 0b1
+        if busy:
+            started = True
+        elif started:
+            break
+        if cycles >= timeout:
+            raise RuntimeError(f"Timeout after {cycles} cycles")
+        yield
+        cycles += 1
+    yield dut.control.storage.eq(0)
+    return cycles
+
+def timeout_for(size, bytes_per_word):
+    return 20000 + 64*(size // bytes_per_word)
+
+def crc32c(data, crc=0):
+    """Bitwise software CRC32C (reference for the DMA CRC32C operation)."""
+    crc ^= 0xffffffff
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ (CRC32C_POLY if crc & 1 else 0)
+    return crc ^ 0xffffffff
+
+# ====================================================================================================
+# Benchmarks
+# ====================================================================================================
+
+SRC_BASE = 0x40000000
+
+def bench_dma(size, data_width, burst, memory, bus_standard="wishbone", max_outstanding=4):
+    """Copy `size` bytes with `SimpleDMAEngine` (Wishbone or AXI4 masters) and check the destination."""
+    bytes_per_word = data_width // 8
+    dst_base = SRC_BASE + ((size + 0xfff) & ~0xfff)
+    src_data = bytes(random.randrange(256) for _ in range(size))
+    memory.write(SRC_BASE, src_data)
+    memory.write(dst_base, bytes(size))
+
+    dut = SimpleDMAEngine(data_width=data_width, bus_standard=bus_standard, max_outstanding=max_outstanding,
+        with_perf=True)
+    result = {}
+    def generator():
+        yield from csr_write(dut.src_addr, SRC_BASE)
+        yield from csr_write(dut.dst_addr, dst_base)
+        yield from csr_write(dut.length, size)
+        result["cycles"] = yield from run_job(dut, (burst << 1) | 1, timeout_for(size, bytes_per_word))
+        result.update((yield from perf_snapshot(dut.perf)))
+        result["ok"] = not ((yield dut.status.status) & 0b100)
+    run_simulation(dut, [generator()] + memory.slaves(dut.dma_masters))
+    result["ok"] &= memory.read(dst_base, size) == src_data
+    return result
+
+def bench_dma_op(size, data_width, op, memory, bus_standard="wishbone", max_outstanding=4):
+    """
+    Run a fill, CRC32C or compare job of `size` bytes with `SimpleDMAEngine` (burst mode).
+
+    Fill uses a random 64-bit pattern and checks the destination (and the byte after it);
+    CRC32C checks `crc` against `crc32c()`; compare makes the destination differ from the
+    source from a random byte on and checks `mismatch`.
+    """
+    bytes_per_word = data_width // 8
+    dst_base = SRC_BASE + ((size + 0xfff) & ~0xfff)
+    src_data = bytes(random.randrange(256) for _ in range(size))
+    pattern  = random.getrandbits(64)
+    differ   = random.randrange(size)
+    memory.write(SRC_BASE, src_data)
+    if op == DMA_OP_COMPARE:
+        memory.write(dst_base, src_data[:differ] + bytes(b ^ 0xff for b in src_data[differ:]))
+    else:
+        memory.write(dst_base, bytes(size + 1))
+
+    dut = SimpleDMAEngine(data_width=data_width, bus_standard=bus_standard, max_outstanding=max_outstanding,
+        with_perf=True)
+    result = {}
+    def generator():
+        yield from csr_write(dut.src_addr, SRC_BASE)
+        yield from csr_write(dut.dst_addr, dst_base)
+        yield from csr_write(dut.length, size)
+        yield from csr_write(dut.fill_pattern, pattern)
+        result["cycles"] = yield from run_job(dut, (op << 16) | 0b11, timeout_for(size, bytes_per_word))
+        result.update((yield from perf_snapshot(dut.perf)))
+        status = yield dut.status.status
+        result["ok"] = not (status & 0b100)
+        if op == DMA_OP_CRC32C:
+            result["ok"] &= (yield dut.crc.status) == crc32c(src_data)
+        elif op == DMA_OP_COMPARE:
+            result["ok"] &= bool(status & 0b1000) and (yield dut.mismatch.status) == differ
+    run_simulation(dut, [generator()] + memory.slaves(dut.dma_masters))
+    if op == DMA_OP_FILL:
+        pattern_bytes = pattern.to_bytes(8, "little")
+        result["ok"] &= memory.read(dst_base, size + 1) == bytes(pattern_bytes[i % 8] for i in range(size)) + b"\0"
+    return result
+
+def bench_dma_2d(size, data_width, memory, rows=8, bus_standard="wishbone", max_outstanding=4):
+    """
+    Copy a `rows`-row tile of `size` bytes between two strides with `SimpleDMAEngine` (burst).
+
+    The source rows are 3 words apart beyond their width, the destination rows twice their
+    width apart; the destination must hold the tile with the bytes between the rows intact.
+    """
+    bytes_per_word = data_width // 8
+    width      = max(size // rows, 1)
+    src_stride = (width + 4*bytes_per_word - 1) // bytes_per_word * bytes_per_word
+    dst_stride = (2*width + bytes_per_word - 1) // bytes_per_word * bytes_per_word
+    dst_base   = SRC_BASE + ((rows*src_stride + 0xfff) & ~0xfff)
+    src_data   = bytes(random.randrange(256) for _ in range(rows*src_stride))
+    dst_data   = bytearray(random.randrange(256) for _ in range(rows*dst_stride))
+    memory.write(SRC_BASE, src_data)
+    memory.write(dst_base, dst_data)
+    for row in range(rows):
+        dst_data[row*dst_stride:row*dst_stride + width] = src_data[row*src_stride:row*src_stride + width]
+
+    dut = SimpleDMAEngine(data_width=data_width, bus_standard=bus_standard, max_outstanding=max_outstanding,
+        with_perf=True)
+    result = {"words": rows*((width + bytes_per_word - 1) // bytes_per_word), "bytes": rows*width}
+    def generator():
+        yield from csr_write(dut.src_addr, SRC_BASE)
+        yield from csr_write(dut.dst_addr, dst_base)
+        yield from csr_write(dut.length, width)
+        yield from csr_write(dut.rows, rows)
+        yield from csr_write(dut.src_stride, src_stride)
+        yield from csr_write(dut.dst_stride, dst_stride)
+        result["cycles"] = yield from run_job(dut, 0b11, timeout_for(rows*src_stride, bytes_per_word))
+        result.update((yield from perf_snapshot(dut.perf)))
+        result["ok"] = not ((yield dut.status.status) & 0b100) and (yield dut.progress.status) == rows*width
+    run_simulation(dut, [generator()] + memory.slaves(dut.dma_masters))
+    result["ok"] &= memory.read(dst_base, rows*dst_stride) == bytes(dst_data)
+    return result
+
+class XorStage(LiteXModule):
+    """Pipeline test stage: XOR every word with the `key` CSR, one registered word per cycle."""
+    def __init__(self, data_width):
+        self.sink   = sink   = stream.Endpoint([("data", data_width)])
+        self.source = source = stream.Endpoint([("data", data_width)])
+        self.key    = CSRStorage(data_width)
+        self.words  = CSRStatus(32)
+        self.comb += sink.ready.eq(~source.valid | source.ready)
+        self.sync += If(sink.ready,
+            source.valid.eq(sink.valid),
+            source.last.eq(sink.last),
+            source.data.eq(sink.data ^ self.key.storage)
+        )
+        self.sync += If(sink.valid & sink.ready, self.words.status.eq(self.words.status + 1))
+
+def bench_pipeline(size, data_width, memory, accel_clk_freq=None, sys_clk_freq=100e6,
+    bus_standard="wishbone", max_outstanding=4, csr_burst=0):
+    """
+    Run `size` bytes through a `StreamPipeline` (XOR stage + pass-through) and check the output.
+
+    With `accel_clk_freq`, the stages run in an `accel` clock domain at that frequency (the
+    key and word count CSRs then go through the `CSRClockDomainBridge`). With `csr_burst`, the
+    key is first written that many times back-to-back: writes beyond the bridge's FIFO must be
+    reported in `cdc_status`, then the real key is written and applied before the job starts.
+    """
+    bytes_per_word = data_width // 8
+    key      = int.from_bytes(bytes(random.randrange(256) for _ in range(bytes_per_word)), "little")
+    dst_base = SRC_BASE + ((size + 0xfff) & ~0xfff)
+    src_data = bytes(random.randrange(256) for _ in range(size))
+    memory.write(SRC_BASE, src_data)
+    memory.write(dst_base, bytes(size))
+    key_bytes = key.to_bytes(bytes_per_word, "little")
+    expected  = bytes(b ^ key_bytes[i % bytes_per_word] for i, b in enumerate(src_data))
+
+    clocks = {"sys": round(1e11/sys_clk_freq)}
+    if accel_clk_freq is not None:
+        clocks["accel"] = round(1e11/accel_clk_freq)
+    dut = StreamPipeline(stages=[XorStage(data_width), StreamProcessor(data_width)],
+        data_width      = data_width,
+        bus_standard    = bus_standard,
+        max_outstanding = max_outstanding,
+        with_perf       = True,
+        clock_domain    = "sys" if accel_clk_freq is None else "accel")
+    result = {}
+    def generator():
+        dropped = 1
+        if csr_burst:
+            cdc_status = dut.stage0.cdc_status
+            for i in range(csr_burst):
+                yield dut.stage0.key.storage.eq(i)
+                yield dut.stage0.key.re.eq(1)
+                yield
+            yield dut.stage0.key.re.eq(0)
+            yield
+            dropped = (yield cdc_status.status) & 0b01
+            yield cdc_status.r.eq(0b01)
+            yield cdc_status.re.eq(1)
+            yield
+            yield cdc_status.re.eq(0)
+            while (yield cdc_status.status) & 0b10:
+                yield
+        yield from csr_write(dut.stage0.key, key)
+        if csr_burst:
+            while (yield cdc_status.status) & 0b10:
+                yield
+        yield from csr_write(dut.src_addr, SRC_BASE)
+        yield from csr_write(dut.dst_addr, dst_base)
+        yield from csr_write(dut.length, size)
+        result["cycles"] = yield from run_job(dut, 0b11, timeout_for(size, bytes_per_word))
+        result.update((yield from perf_snapshot(dut.perf)))
+        result["ok"] = not ((yield dut.status.status) & 0b100)
+        result["ok"] &= (yield dut.stage0.words.status) == (size + bytes_per_word - 1) // bytes_per_word
+        if csr_burst:
+            result["ok"] &= dropped and not ((yield dut.stage0.cdc_status.status) & 0b01)
+    run_simulation(dut, [generator()] + memory.slaves(dut.dma_masters), clocks=clocks)
+    result["ok"] &= memory.read(dst_base, size) == expected
+    return result
+
+def bench_sha3(size, data_width, unroll, memory):
+    """Hash `size` bytes with `SHA3Accelerator` (SHA3-256) and check the digest."""
+    bytes_per_word = data_width // 8
+    message = bytes(random.randrange(256) for _ in range(size))
+    memory.write(SRC_BASE, message)
+
+    dut = SHA3Accelerator(data_width=data_width, unroll=unroll, with_perf=True)
+    result = {}
+    def generator():
+        yield from csr_write(dut.input_addr, SRC_BASE)
+        yield from csr_write(dut.input_length, size)
+        result["cycles"] = yield from run_job(dut, 1, timeout_for(size, bytes_per_word))
+        result.update((yield from perf_snapshot(dut.perf)))
+        digest = b""
+        for i in range(8):
+            digest += struct.pack("<I", (yield getattr(dut, f"hash_out{i}").status))
+        result["ok"] = (digest == hashlib.sha3_256(message).digest()) and not ((yield dut.status.status) & 0b100)
+    buses = [dut.wb_dma, dut.wb_dma_wr, dut.wb_dma_table]
+    run_simulation(dut, [generator()] + [memory.slave(bus) for bus in buses])
+    return result
+
+class SHA3CtrlModel(LiteXModule):
+    """
+    Cycle model of sha3_ctrl.sv, for `SHA3CtrlAccelerator` in Migen's simulator.
+
+    Same ports (as Migen signals), FSM, register updates and timing as the SystemVerilog core,
+    with `KeccakF1600` as keccak_core.sv (one round per cycle). `word_count` and
+    `last_byteenable`, which drive no output, are left out. `dropped` is set if a word is
+    strobed while the core cannot absorb it (waitrequest, or while it permutes a data block).
+    """
+    def __init__(self):
+        self.core_reset         = Signal()
+        self.core_last_word     = Signal()
+        self.core_empty_message = Signal()
+        self.data_in_strobe     = Signal()
+        self.data_in_data       = Signal(32)
+        self.data_in_byteenable = Signal(4)
+        self.core_busy          = Signal()
+        self.core_done          = Signal()
+        self.core_waitrequest   = Signal()
+        self.hash_out_data      = Signal(256)
+        self.csr_status         = Signal(32)
+        self.core_ready         = Signal()
+        self.dropped            = Signal()
+
+        IDLE, ABSORB, PAD, RUN_KECCAK, SQUEEZE, DONE = range(6)
+        state_reg       = Signal(3)
+        state_next      = Signal(3)
+        state           = Signal(1600)
+        block           = Array(Signal(8) for _ in range(136))  # block_buffer, by byte
+        byte_count      = Signal(8)
+        round_count     = Signal(5)
+        last_word_latch = Signal()
+        padding_block   = Signal()
+        hash_out_reg    = Signal(256)
+
+        strobe = self.data_in_strobe
+        be     = self.data_in_byteenable
+        data   = self.data_in_data
+
+        self.keccak = keccak = KeccakF1600(unroll=1)
+        self.comb += [keccak.state_in[l].eq(state[64*l:64*(l + 1)]) for l in range(25)]
+        self.comb += keccak.step.eq(Mux(round_count == 0, 0, round_count - 1))
+        round_out = Cat(*keccak.state_out)
+
+        self.comb += [
+            self.hash_out_data.eq(hash_out_reg),
+            self.core_ready.eq(state_reg == IDLE),
+            self.core_busy.eq((state_reg != IDLE) & (state_reg != DONE)),
+            self.core_done.eq(state_reg == DONE),
+            self.csr_status.eq(Cat(self.core_busy, self.core_done, state_reg, self.core_ready)),
+            self.core_waitrequest.eq(
+                (state_reg == PAD) | (state_reg == SQUEEZE) | (state_reg == DONE) |
+                ((state_reg == RUN_KECCAK) & padding_block) |
+                ((state_reg == ABSORB) & (byte_count >= 136))),
+        ]
+        self.sync += If(strobe & (self.core_waitrequest | (state_reg == RUN_KECCAK)), self.dropped.eq(1))
+
+        # Next state
+        word_byte_count = be[0] + be[1] + be[2] + be[3]
+        self.comb += [
+            state_next.eq(state_reg),
+            Case(state_reg, {
+                IDLE: If(self.core_empty_message,
+                    state_next.eq(PAD)
+                ).Elif(strobe,
+                    state_next.eq(ABSORB)
+                ),
+                ABSORB: If((byte_count >= 136) | (strobe & ((byte_count + word_byte_count) >= 136)),
+                    state_next.eq(RUN_KECCAK)
+                ).Elif(last_word_latch | (strobe & self.core_last_word),
+                    state_next.eq(PAD)
+                ),
+                PAD: state_next.eq(RUN_KECCAK),
+                RUN_KECCAK: If(round_count == 24,
+                    If(padding_block,
+                        state_next.eq(SQUEEZE)
+                    ).Elif(last_word_latch,
+                        state_next.eq(PAD)
+                    ).Else(
+                        state_next.eq(IDLE)
+                    )
+                ),
+                SQUEEZE: state_next.eq(DONE),
+                DONE: If(self.core_reset, state_next.eq(IDLE)),
+            })
+        ]
+
+        # Enabled bytes appended at `base`, packed
+        def absorb(base):
+            stmts = []
+            for i in range(4):
+                index = base + sum(be[j] for j in range(i))
+                stmts.append(If(be[i] & (index < 136), block[index].eq(data[8*i:8*(i + 1)])))
+            stmts.append(byte_count.eq(base + word_byte_count))
+            stmts.append(If(self.core_last_word, last_word_latch.eq(1)))
+            return stmts
+
+        # Padding: 0x06 at `pad` (bits 0-2), bit 7 of the last byte of the block
+        full = Signal()
+        pad  = Signal(8)
+        self.comb += [
+            full.eq(byte_count >= 136),
+            pad.eq(Mux(full, 0, byte_count)),
+        ]
+        def pad_byte(value):
+            return (value & 0xf8) | 0x06
+
+        self.sync += [
+            state_reg.eq(state_next),
+            If(self.core_reset, state_reg.eq(IDLE)),
+            Case(state_reg, {
+                IDLE: [
+                    *[b.eq(0) for b in block],
+                    last_word_latch.eq(0),
+                    hash_out_reg.eq(0),
+                    round_count.eq(0),
+                    padding_block.eq(0),
+                    byte_count.eq(0),
+                    If(self.core_empty_message,
+                        padding_block.eq(1)
+                    ).Elif(strobe,
+                        *absorb(0)
+                    )
+                ],
+                ABSORB: If(strobe, *absorb(byte_count)),
+                PAD: [
+                    If(full, *[b.eq(0) for b in block]),
+                    block[pad].eq(pad_byte(Mux(full, 0, block[pad]))),
+                    block[135].eq(Mux(pad == 135, pad_byte(block[135]), Mux(full, 0, block[135])) | 0x80),
+                    padding_block.eq(1),
+                ],
+                RUN_KECCAK: If(round_count == 0,
+                    state[:1088].eq(state[:1088] ^ Cat(*block)),
+                    *[b.eq(0) for b in block],
+                    byte_count.eq(0),
+                    round_count.eq(round_count + 1)
+                ).Elif(round_count == 24,
+                    state.eq(round_out),
+                    round_count.eq(0),
+                    If(padding_block | ~last_word_latch, last_word_latch.eq(0))
+                ).Else(
+                    state.eq(round_out),
+                    round_count.eq(round_count + 1)
+                ),
+                SQUEEZE: hash_out_reg.eq(state[:256]),
+                DONE: If(self.core_reset, state.eq(0)),
+            })
+        ]
+
+def with_sha3_ctrl_model(dut):
+    """Replace the `sha3_ctrl` instance of `dut` by a `SHA3CtrlModel` on the same signals."""
+    specials = dut._fragment.specials
+    instance = next(special for special in specials if isinstance(special, Instance) and special.of == "sha3_ctrl")
+    specials.remove(instance)
+    dut.sha3_ctrl = model = SHA3CtrlModel()
+    for item in instance.items:
+        if isinstance(item, Instance.Input) and item.name not in ["clk", "reset"]:
+            dut.comb += getattr(model, item.name).eq(item.expr)
+        elif isinstance(item, Instance.Output):
+            dut.comb += item.expr.eq(getattr(model, item.name))
+    return model
+
+def bench_sha3_ctrl(size, data_width, memory):
+    """Hash `size` bytes with `SHA3CtrlAccelerator` (on `SHA3CtrlModel`) and check the digest."""
+    message = bytes(random.randrange(256) for _ in range(size))
+    memory.write(SRC_BASE, message)
+
+    dut   = SHA3CtrlAccelerator(platform=GenericPlatform("sim", []), data_width=data_width, with_perf=True)
+    model = with_sha3_ctrl_model(dut)
+    result = {}
+    def generator():
+        yield from csr_write(dut.input_addr, SRC_BASE)
+        yield from csr_write(dut.input_length, size)
+        result["cycles"] = yield from run_job(dut, 1, timeout_for(size, 1))
+        result.update((yield from perf_snapshot(dut.perf)))
+        digest = b""
+        for i in range(8):
+            digest += struct.pack("<I", (yield getattr(dut, f"hash_out{i}").status))
+        result["ok"] = (digest == hashlib.sha3_256(message).digest()) and not (yield model.dropped)
+    run_simulation(dut, [generator(), memory.slave(dut.wb_dma)])
+    return result
+
+def bench_txpow(size, lanes, unroll, accel_clk_freq=None, sys_clk_freq=100e6):
+    """
+    Search `size` nonces with `TxPoWAccelerator` and check the winner against `sha3_golden`.
+
+    The target is just above the lowest digest of the range, so the search runs up to that
+    nonce; cycles per word are (sys) cycles per nonce hashed. With `accel_clk_freq`, the core
+    runs in an `accel` clock domain at that frequency, behind the `CSRClockDomainBridge`.
+    """
+    header     = bytes(random.randrange(256) for _ in range(100))
+    nonce_lane = 1
+    digests    = sha3_golden.txpow_digests(header, nonce_lane, range(size))
+    target     = min(int.from_bytes(digest.tobytes(), "big") for digest in digests) + 1
+    nonce, digest = sha3_golden.txpow_search(header, nonce_lane, 0, size, target)
+
+    clocks = {"sys": round(1e11/sys_clk_freq)}
+    if accel_clk_freq is not None:
+        clocks["accel"] = round(1e11/accel_clk_freq)
+    dut = TxPoWAccelerator(lanes=lanes, unroll=unroll, with_perf=True,
+        clock_domain = "sys" if accel_clk_freq is None else "accel")
+    core   = dut.core
+    result = {"words": nonce + 1, "bytes": (nonce + 1)*len(header)}
+    def generator():
+        for i in range(0, len(header), 4):
+            yield from csr_write(core.header_addr, i // 4)
+            yield from csr_write(core.header_data, int.from_bytes(header[i:i + 4], "little"))
+        yield from csr_write(core.header_length, len(header))
+        yield from csr_write(core.nonce_lane, nonce_lane)
+        yield from csr_write(core.nonce_end, size)
+        for i in range(8):
+            yield from csr_write(getattr(core, f"target{i}"), (target >> (32*i)) & 0xffffffff)
+        dropped = 0
+        if accel_clk_freq is None:
+            result["cycles"] = yield from run_job(core, 1, 20000 + 32*size)
+            result.update((yield from perf_snapshot(core.perf)))
+        else:
+            # Perf counters behind the bridge: snapshot, then wait for it to be applied
+            result["cycles"] = yield from run_job(core, 1, 20000 + 32*size, core.perf_control)
+            yield from csr_write(core.perf_control, 0b01)
+            while (yield core.cdc_status.status) & 0b10:
+                yield
+            yield
+            result["rd_stall"] = (yield core.perf_rd_stall_cycles.status)
+            result["wr_stall"] = (yield core.perf_wr_stall_cycles.status)
+            dropped = (yield core.cdc_status.status) & 0b01
+        hash_out = b""
+        for i in range(8):
+            hash_out += struct.pack("<I", (yield getattr(core, f"hash_out{i}").status))
+        result["ok"] = ((yield core.status.status) & 0b1100) == 0b0100 and \
+            (yield core.nonce_found.status) == nonce and hash_out == digest and \
+            (yield dut.ev.done.pending) and not dropped
+    run_simulation(dut, [generator()], clocks=clocks)
+    return result
+
+def bench_user(size, data_width, memory):
+    """Run the `UserAccelerator` placeholder job (the length is programmed but not used)."""
+    dut = UserAccelerator(data_width=data_width, with_perf=True)
+    result = {}
+    def generator():
+        yield from csr_write(dut.src_addr, SRC_BASE)
+        yield from csr_write(dut.dst_addr, SRC_BASE)
+        yield from csr_write(dut.length, size)
+        result["cycles"] = yield from run_job(dut, 1, 20000)
+        result.update((yield from perf_snapshot(dut.perf)))
+        result["ok"] = (yield dut.error.status) == 0
+    run_simulation(dut, [generator(), memory.slave(dut.wb_dma)])
+    return result
+
+# ====================================================================================================
+# Main
+# ====================================================================================================
+
+BENCHMARKS = ["dma-single", "dma-burst", "dma-fill", "dma-crc", "dma-compare", "dma-2d", "pipeline", "pipeline-cdc", "pipeline-cdc-csr", "sha3", "sha3-ctrl", "txpow", "txpow-cdc", "user"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation benchmarks of the user accelerators.")
+    parser.add_argument("--accelerators",  nargs="+", default=BENCHMARKS, choices=BENCHMARKS, help="Benchmarks to run.")
+    parser.add_argument("--sizes",         nargs="+", default=[64, 256, 1024, 4096], type=int, help="Transfer sizes in bytes (txpow: nonces).")
+    parser.add_argument("--data-width",    default=32, type=int, choices=[32, 64, 128, 256], help="Accelerator DMA data width.")
+    parser.add_argument("--unroll",        default=1, type=int, help="SHA3 Keccak rounds per cycle.")
+    parser.add_argument("--lanes",         default=4, type=int, help="TxPoW Keccak cores.")
+    parser.add_argument("--read-latency",  default=1, type=int, help="Memory read latency in cycles.")
+    parser.add_argument("--write-latency", default=1, type=int, help="Memory write latency in cycles.")
+    parser.add_argument("--wait-states",   default=0, type=int, help="Memory wait states between burst beats.")
+    parser.add_argument("--sys-clk-freq",  default=100e6, type=float, help="System clock frequency for MB/s.")
+    parser.add_argument("--accel-clk-freq", default=150e6, type=float, help="Accelerator clock frequency of pipeline-cdc and txpow-cdc (pipeline-cdc-csr: sys/4).")
+    parser.add_argument("--bus-standard",  default="wishbone", choices=["wishbone", "axi"], help="DMA masters of the dma and pipeline benchmarks.")
+    parser.add_argument("--max-outstanding", default=4, type=int, help="Bursts in flight per AXI master.")
+    parser.add_argument("--seed",          default=0, type=int, help="Random seed for the test data.")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    bytes_per_word = args.data_width // 8
+
+    print(f"Memory: read latency {args.read_latency}, write latency {args.write_latency}, "
+          f"wait states {args.wait_states}; data width {args.data_width} bits; {args.bus_standard} DMA masters")
+    print(f"{'benchmark':<16} {'size':>7} {'cycles':>8} {'cyc/word':>9} {'B/cycle':>8} {'MB/s':>8} "
+          f"{'rd_stall':>9} {'wr_stall':>9}  result")
+    failures = 0
+    for name in args.accelerators:
+        for size in args.sizes:
+            memory = WishboneMemoryModel(size=4*size + 0x2000, base=SRC_BASE,
+                read_latency  = args.read_latency,
+                write_latency = args.write_latency,
+                wait_states   = args.wait_states)
+            bus = dict(bus_standard=args.bus_standard, max_outstanding=args.max_outstanding)
+            if name == "dma-single":
+                result = bench_dma(size, args.data_width, 0, memory, **bus)
+            elif name == "dma-burst":
+                result = bench_dma(size, args.data_width, 1, memory, **bus)
+            elif name == "dma-fill":
+                result = bench_dma_op(size, args.data_width, DMA_OP_FILL, memory, **bus)
+            elif name == "dma-crc":
+                result = bench_dma_op(size, args.data_width, DMA_OP_CRC32C, memory, **bus)
+            elif name == "dma-compare":
+                result = bench_dma_op(size, args.data_width, DMA_OP_COMPARE, memory, **bus)
+            elif name == "dma-2d":
+                result = bench_dma_2d(size, args.data_width, memory, **bus)
+            elif name == "pipeline":
+                result = bench_pipeline(size, args.data_width, memory, **bus)
+            elif name == "pipeline-cdc":
+                result = bench_pipeline(size, args.data_width, memory, args.accel_clk_freq, args.sys_clk_freq, **bus)
+            elif name == "pipeline-cdc-csr":
+                # Stages at a quarter of sys: 32 back-to-back key writes overflow the CSR FIFO
+                result = bench_pipeline(size, args.data_width, memory, args.sys_clk_freq/4, args.sys_clk_freq,
+                    csr_burst=32, **bus)
+            elif name == "sha3":
+                result = bench_sha3(size, args.data_width, args.unroll, memory)
+            elif name == "sha3-ctrl":
+                result = bench_sha3_ctrl(size, args.data_width, memory)
+            elif name == "txpow":
+                result = bench_txpow(size, args.lanes, args.unroll)
+            elif name == "txpow-cdc":
+                result = bench_txpow(size, args.lanes, args.unroll, args.accel_clk_freq, args.sys_clk_freq)
+            else:
+                result = bench_user(size, args.data_width, memory)
+            cycles = result["cycles"]
+            words  = result.get("words", max((size + bytes_per_word - 1) // bytes_per_word, 1))
+            nbytes = result.get("bytes", size)
+            print(f"{name:<16} {size:>7} {cycles:>8} {cycles/words:>9.2f} {nbytes/cycles:>8.3f} "
+                  f"{nbytes/cycles*args.sys_clk_freq/1e6:>8.1f} {result['rd_stall']:>9} {result['wr_stall']:>9}  "
+                  f"{'OK' if result['ok'] else 'FAIL'}")
+            failures += not result["ok"]
+
+    if failures:
+        print(f"{failures} benchmark(s) failed the data check")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
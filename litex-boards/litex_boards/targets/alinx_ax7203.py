@@ -6,6 +6,10 @@
 # Copyright (c) 2025 Aaron Hagan <amhagan@kent.edu>
 # SPDX-License-Identifier: BSD-2-Clause
 
+import ast
+import os
+import sys
+
 from migen import *
 
 from litex.gen import *
@@ -17,39 +21,26 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 
-from litepcie.phy.s7pciephy import S7PCIEPHY
-from litepcie.software import generate_litepcie_software
-
 from litedram.modules import MT41J256M16
 from litedram.phy import s7ddrphy
 
-from litex.soc.cores.video import VideoDVIPHY
-from litex.soc.cores.bitbang import I2CMaster
+# Optional cores (PCIe, Video, Ethernet) are imported where they are instantiated, so that
+# builds without them do not need (or load) litepcie / liteeth.
 
 # ====================================================================================================
-# ETHERNET SUPPORT - Added for ethernet PHY support
-# ====================================================================================================
-from liteeth.phy.s7rgmii import LiteEthPHYRGMII
-# ====================================================================================================
-
-# ====================================================================================================
-# USER ACCELERATOR - Import custom accelerator module
+# USER ACCELERATOR - Custom accelerator module
 # ====================================================================================================
 # Add the accelerator directory to Python path so we can import from there
-import sys
-import os
+# You can edit accelerator/user_accelerator.py with your specific implementation; it is imported
+# by the USER_ACCELERATORS factories below, only when an accelerator is selected.
 _accel_dir = os.path.join(os.path.dirname(__file__), "../../../accelerator")
 if os.path.exists(_accel_dir):
     sys.path.insert(0, os.path.abspath(_accel_dir))
-
-# Import from the accelerator directory
-# You can edit accelerator/user_accelerator.py with your specific implementation
-from user_accelerator import UserAccelerator, SimpleDMAEngine, StreamProcessor, SHA3Accelerator
 # ====================================================================================================
 
 # CRG ----------------------------------------------------------------------------------------------
 class _CRG(LiteXModule):
-    def __init__(self, platform, sys_clk_freq, with_video_pll=False):
+    def __init__(self, platform, sys_clk_freq, with_video_pll=False, accel_clk_freq=None):
         self.rst          = Signal()
         self.cd_sys       = ClockDomain()
         self.cd_sys4x     = ClockDomain()
@@ -73,10 +64,180 @@ class _CRG(LiteXModule):
         pll.create_clkout(self.cd_idelay,    200e6)
         pll.create_clkout(self.cd_hdmi,      148.5e6, margin=2e-2)
         platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin)
-        
+
+        # Accelerator clock (--accel-clk-freq): from the same PLL, asynchronous to sys (the
+        # accelerator crosses to it with async FIFOs and a CSR bridge).
+        if accel_clk_freq is not None:
+            self.cd_accel = ClockDomain()
+            pll.create_clkout(self.cd_accel, accel_clk_freq)
+            platform.add_false_path_constraints(self.cd_sys.clk, self.cd_accel.clk)
+
         # IDELAY Ctrl.
         self.idelayctrl = S7IDELAYCTRL(self.cd_idelay)
 
+# User Accelerator Registry ------------------------------------------------------------------------
+# Accelerators selectable with --user-accelerator=<name>: name -> (factory, supported DMA data
+# paths (--user-accelerator-port), clock domain support, description). Factories import user_accelerator.py only when called, so
+# builds without an accelerator do not elaborate (or even import) it. To add your own accelerator,
+# write a factory and register it with @user_accelerator; it receives the SoC, the DMA data width
+# (None: its own default), the DMA data path and the --accel-param constructor arguments, plus
+# clock_domain (with --accel-clk-freq) when registered with clock_domain=True.
+USER_ACCELERATORS = {}
+
+def user_accelerator(name, description, ports=("wishbone",), clock_domain=False):
+    def register(factory):
+        USER_ACCELERATORS[name] = (factory, ports, clock_domain, description)
+        return factory
+    return register
+
+def _dma_ports(soc, port, data_width, write=True, compare=False):
+    # DMA data path:
+    # - "wishbone": masters on soc.dma_bus (coherent with --with-coherent-dma)
+    # - "native":   dedicated LiteDRAM crossbar ports, bypassing the DMA bus and its
+    #               converters. Not coherent: software must flush/invalidate caches.
+    # - "axi":      AXI4 masters on soc.dma_bus, with several bursts in flight instead of one
+    #               access at a time (native to NaxRiscv's DMA bus / --bus-standard=axi).
+    if port == "axi":
+        return dict(bus_standard="axi")
+    if port != "native":
+        return {}
+    dma_ports = dict(
+        read_port = soc.sdram.crossbar.get_port(mode="read", data_width=data_width),
+        dram_base = soc.mem_map["main_ram"],
+    )
+    if write:
+        dma_ports["write_port"] = soc.sdram.crossbar.get_port(mode="write", data_width=data_width)
+    if compare:
+        dma_ports["compare_port"] = soc.sdram.crossbar.get_port(mode="read", data_width=data_width)
+    return dma_ports
+
+@user_accelerator("user", "UserAccelerator: placeholder with counter FSM")
+def _user_accelerator_user(soc, data_width, port, **params):
+    from user_accelerator import UserAccelerator
+    return UserAccelerator(data_width=data_width or 32, address_width=32, **params)
+
+@user_accelerator("dma", "SimpleDMAEngine: DMA memory copy/fill/CRC32C/compare (burst, scatter-gather, job queues)", ports=("wishbone", "native", "axi"))
+def _user_accelerator_dma(soc, data_width, port, **params):
+    from user_accelerator import SimpleDMAEngine
+    data_width = data_width or 32
+    kwargs = dict(
+        address_width = 32,   # Byte-addressable memory space
+        fifo_depth    = 64,   # Read->write FIFO depth in words (BRAM vs throughput)
+        queue_depth   = 8,    # Job submission/completion queue entries (0 = none)
+        queue_count   = getattr(soc.cpu, "cpu_count", 1),  # One job queue per hart
+        with_perf     = True, # Busy/stall/latency counters (perf CSRs)
+        with_compare  = True, # Compare operation (one more read master / LiteDRAM port)
+    )
+    kwargs.update(params)
+    return SimpleDMAEngine(data_width=data_width, **kwargs,
+        **_dma_ports(soc, port, data_width, compare=kwargs["with_compare"]))
+
+@user_accelerator("stream", "StreamProcessor: stream-based processing example (no DMA)")
+def _user_accelerator_stream(soc, data_width, port, **params):
+    from user_accelerator import StreamProcessor
+    return StreamProcessor(data_width=data_width or 32, **params)
+
+@user_accelerator("pipeline", "StreamPipeline: DMA -> stream stages (StreamProcessor) -> DMA", ports=("wishbone", "native", "axi"), clock_domain=True)
+def _user_accelerator_pipeline(soc, data_width, port, **params):
+    # With clock_domain, the stages run in it; the DMA engines and job control stay in sys.
+    from user_accelerator import StreamPipeline
+    data_width = data_width or 32
+    kwargs = dict(address_width=32, with_perf=True)
+    kwargs.update(params)
+    return StreamPipeline(data_width=data_width, **kwargs, **_dma_ports(soc, port, data_width))
+
+@user_accelerator("sha3", "SHA3Accelerator: SHA3-224/256/384/512 and SHAKE hash engine", ports=("wishbone", "native"))
+def _user_accelerator_sha3(soc, data_width, port, **params):
+    from user_accelerator import SHA3Accelerator
+    data_width = data_width or 64  # 64-bit for better throughput
+    kwargs = dict(address_width=32, with_perf=True)
+    kwargs.update(params)
+    return SHA3Accelerator(data_width=data_width, **kwargs, **_dma_ports(soc, port, data_width))
+
+@user_accelerator("sha3-ctrl", "SHA3CtrlAccelerator: DMA-fed sha3_ctrl.sv / keccak_core.sv core", ports=("wishbone", "native"))
+def _user_accelerator_sha3_ctrl(soc, data_width, port, **params):
+    # Adds accelerator/sha3_ctrl.sv and keccak_core.sv to the platform sources.
+    from user_accelerator import SHA3CtrlAccelerator
+    data_width = data_width or 32  # Core input width; wider DMA words are split
+    kwargs = dict(address_width=32, with_perf=True)
+    kwargs.update(params)
+    return SHA3CtrlAccelerator(platform=soc.platform, data_width=data_width, **kwargs,
+        **_dma_ports(soc, port, data_width, write=False))
+
+@user_accelerator("txpow", "TxPoWAccelerator: parallel SHA3-256 nonce search (no DMA)", clock_domain=True)
+def _user_accelerator_txpow(soc, data_width, port, **params):
+    # Hash rate = lanes * clk / (24/unroll + 1), clk = sys or, with clock_domain, the accel clock;
+    # each lane is a full Keccak core. The completion interrupt stays in sys.
+    from user_accelerator import TxPoWAccelerator
+    kwargs = dict(
+        lanes     = 4,  # Parallel Keccak cores
+        unroll    = 2,  # Keccak rounds per cycle in each core
+        with_perf = True,
+    )
+    kwargs.update(params)
+    return TxPoWAccelerator(**kwargs)
+
+def parse_user_accelerator_params(params):
+    """Parse --accel-param KEY=VALUE arguments (Python literals, else strings) into a dict."""
+    parsed = {}
+    for param in params or []:
+        key, sep, value = param.partition("=")
+        if not sep:
+            raise ValueError(f"Accelerator parameter {param!r} is not KEY=VALUE")
+        try:
+            parsed[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            parsed[key] = value
+    return parsed
+
+# User Accelerator ---------------------------------------------------------------------------------
+def add_user_accelerator(soc, accelerator="dma", port="wishbone", data_width=None, params={},
+    name="user_accel", irq=16, clock_domain="sys"):
+    """Add the `accelerator` of USER_ACCELERATORS as `soc.<name>` (also used by alinx_ax7203_sim.py)."""
+    # Data width and address width should match your SoC configuration
+    # For AXI bus with 64-bit addressing: address_width=32 (byte addressing)
+    # For wider data paths: increase data_width to 64, 128, etc. (--accel-data-width).
+    # The DMA bus / LiteDRAM crossbar converts to their own width, so 128 matches the
+    # NaxRiscv/L2 data path. Transfers must then be aligned to data_width/8 bytes.
+    if accelerator not in USER_ACCELERATORS:
+        raise ValueError(f"Unknown user accelerator {accelerator!r}, available: {', '.join(USER_ACCELERATORS)}")
+    factory, ports, cdc, _ = USER_ACCELERATORS[accelerator]
+    if port not in ports:
+        raise ValueError(f"User accelerator {accelerator!r} has no {port!r} DMA data path, available: {', '.join(ports)}")
+    if clock_domain != "sys":
+        if not cdc:
+            raise ValueError(f"User accelerator {accelerator!r} only runs in the sys clock domain")
+        if not hasattr(soc.crg, f"cd_{clock_domain}"):
+            raise ValueError(f"No {clock_domain!r} clock domain in the CRG (see --accel-clk-freq)")
+        params = dict(params, clock_domain=clock_domain)
+    setattr(soc, name, factory(soc, data_width, port, **params))
+    connect_user_accelerator(soc, name, irq=irq)
+
+def connect_user_accelerator(soc, name, irq=16):
+    """Connect the CSRs, DMA masters and interrupt of the accelerator `soc.<name>`."""
+    accel = getattr(soc, name)
+    
+    # Map CSR registers to CPU-accessible address space
+    # CPU can control the accelerator by reading/writing these registers
+    # Base address 0xF0000000 is in the CSR region
+    soc.csr.add(name, use_loc_if_exists=True)
+    
+    # Connect DMA interface(s) to the DMA bus
+    # This allows the accelerator to directly access DDR memory
+    # With --with-coherent-dma, cache coherency is automatic!
+    # Accelerators with decoupled read/write engines expose one master per engine.
+    # Without a CPU DMA bus (e.g. VexRiscv in simulation) the masters go on the main bus.
+    dma_bus = getattr(soc, "dma_bus", soc.bus)
+    for master_name, master in getattr(accel, "dma_masters", {}).items():
+        dma_bus.add_master(name=f"{name}_{master_name}", master=master)
+    
+    # Connect interrupt (optional but recommended)
+    # This allows the accelerator to signal completion to the CPU
+    # Interrupt number 16 by default (adjust based on your system). The accelerator's
+    # EventManager (`ev`) provides pending/enable/clear and completion coalescing.
+    if soc.irq.enabled and hasattr(accel, "ev"):
+        soc.irq.add(name, n=irq, use_loc_if_exists=True)
+
 # BaseSoC ------------------------------------------------------------------------------------------
 class BaseSoC(SoCCore):
     def __init__(self,
@@ -86,12 +247,17 @@ class BaseSoC(SoCCore):
                  with_video_framebuffer = False,
                  with_ethernet          = False,  # <-- ETHERNET: Added parameter
                  with_user_accelerator  = False,  # <-- USER ACCELERATOR: Added parameter
+                 user_accelerator       = "dma",       # <-- USER ACCELERATOR: USER_ACCELERATORS name
+                 user_accelerator_port  = "wishbone",  # <-- USER ACCELERATOR: "wishbone", "native" or "axi"
+                 user_accelerator_data_width = None,   # <-- USER ACCELERATOR: DMA data path width (None: default)
+                 user_accelerator_params = {},         # <-- USER ACCELERATOR: Extra constructor arguments
+                 accel_clk_freq         = None,        # <-- USER ACCELERATOR: Own clock domain (None: sys)
                  **kwargs):
 
         platform = alinx_ax7203.Platform()
 
         # CRG --------------------------------------------------------------------------------------
-        self.crg = _CRG(platform, sys_clk_freq, with_video_pll=with_video_framebuffer)
+        self.crg = _CRG(platform, sys_clk_freq, with_video_pll=with_video_framebuffer, accel_clk_freq=accel_clk_freq)
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on ALINX AX7203", **kwargs)
@@ -111,6 +277,7 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
+            from litepcie.phy.s7pciephy import S7PCIEPHY
             self.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
                 data_width = 128,
                 bar0_size  = 0x20000)
@@ -131,6 +298,8 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_framebuffer:
+            from litex.soc.cores.video import VideoDVIPHY
+            from litex.soc.cores.bitbang import I2CMaster
             hdmi_pads = platform.request("hdmi")
             self.videophy = VideoDVIPHY(hdmi_pads, clock_domain="hdmi")
             self.videoi2c = I2CMaster(hdmi_pads)
@@ -156,6 +325,7 @@ class BaseSoC(SoCCore):
         if with_ethernet:
             # RGMII Ethernet PHY (KSZ9031RNX)
             # NOTE: Ensure ethernet pins are properly defined in the platform file before building
+            from liteeth.phy.s7rgmii import LiteEthPHYRGMII
             self.ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks"),
                 pads       = self.platform.request("eth"))
@@ -166,51 +336,11 @@ class BaseSoC(SoCCore):
         # USER ACCELERATOR - Custom DMA-capable accelerator
         # ============================================================================================
         if with_user_accelerator:
-            # Instantiate the user accelerator
-            # Data width and address width should match your SoC configuration
-            # For AXI bus with 64-bit addressing: address_width=32 (byte addressing)
-            # For wider data paths: increase data_width to 64, 128, etc.
-            
-            # Choose your accelerator implementation:
-            # - UserAccelerator: Simple placeholder with counter FSM
-            # - SimpleDMAEngine: Complete DMA memory copy example
-            # - StreamProcessor: Stream-based processing example
-            # - SHA3Accelerator: Cryptographic hash accelerator (placeholder)
-            # - Or your own custom class from user_accelerator.py
-            
-            # Use SimpleDMAEngine for actual DMA testing
-            self.user_accel = SimpleDMAEngine(
-                data_width    = 32,   # Match your bus data width
-                address_width = 32    # Byte-addressable memory space
-            )
-            
-            # Alternative: Use the placeholder (no DMA)
-            # self.user_accel = UserAccelerator(
-            #     data_width    = 32,
-            #     address_width = 32
-            # )
-            
-            # Alternative: Use the SHA3 accelerator
-            # self.user_accel = SHA3Accelerator(
-            #     data_width    = 64,   # 64-bit for better throughput
-            #     address_width = 32
-            # )
-            
-            # Map CSR registers to CPU-accessible address space
-            # CPU can control the accelerator by reading/writing these registers
-            # Base address 0xF0000000 is in the CSR region
-            self.csr.add("user_accel", use_loc_if_exists=True)
-            
-            # Connect DMA interface to the DMA bus
-            # This allows the accelerator to directly access DDR memory
-            # With --with-coherent-dma, cache coherency is automatic!
-            self.dma_bus.add_master(name="user_accel_dma", master=self.user_accel.wb_dma)
-            
-            # Connect interrupt (optional but recommended)
-            # This allows the accelerator to signal completion to the CPU
-            # Interrupt number 16 (you can adjust based on your system)
-            if hasattr(self.cpu, 'interrupt'):
-                self.comb += self.cpu.interrupt[16].eq(self.user_accel.interrupt)
+            add_user_accelerator(self, user_accelerator,
+                port         = user_accelerator_port,
+                data_width   = user_accelerator_data_width,
+                params       = user_accelerator_params,
+                clock_domain = "sys" if accel_clk_freq is None else "accel")
         # ============================================================================================
 
         # Leds -------------------------------------------------------------------------------------
@@ -240,7 +370,12 @@ def main():
     # ================================================================================================
     # USER ACCELERATOR: Added command-line argument for custom accelerator
     # ================================================================================================
-    parser.add_target_argument("--with-user-accelerator",  action="store_true",          help="Enable user-defined DMA accelerator (placeholder).")
+    parser.add_target_argument("--with-user-accelerator",  action="store_true",          help="Enable the user accelerator (--user-accelerator, default: dma).")
+    parser.add_target_argument("--user-accelerator",       default=None,                 help="User accelerator to add (implies --with-user-accelerator).", choices=list(USER_ACCELERATORS))
+    parser.add_target_argument("--user-accelerator-port",  default="wishbone",           help="User accelerator DMA data path.", choices=["wishbone", "native", "axi"])
+    parser.add_target_argument("--accel-data-width",       default=None, type=int,       help="User accelerator DMA data width (default: accelerator's).", choices=[32, 64, 128, 256])
+    parser.add_target_argument("--accel-param",            default=[], action="append",  help="User accelerator constructor argument KEY=VALUE (repeatable, e.g. unroll=2).")
+    parser.add_target_argument("--accel-clk-freq",         default=None, type=float,     help="Run the user accelerator in its own clock domain at this frequency (pipeline, txpow).")
     # ================================================================================================
 
     args = parser.parse_args()
@@ -251,7 +386,12 @@ def main():
         with_pcie              = args.with_pcie,
         with_video_framebuffer = args.with_video_framebuffer,
         with_ethernet          = args.with_ethernet,       # <-- ETHERNET: Added argument passing
-        with_user_accelerator  = args.with_user_accelerator, # <-- USER ACCELERATOR: Added argument passing
+        with_user_accelerator  = args.with_user_accelerator or args.user_accelerator is not None, # <-- USER ACCELERATOR: Added argument passing
+        user_accelerator       = args.user_accelerator or "dma",
+        user_accelerator_port  = args.user_accelerator_port,
+        user_accelerator_data_width = args.accel_data_width,
+        user_accelerator_params = parse_user_accelerator_params(args.accel_param),
+        accel_clk_freq         = args.accel_clk_freq,
         **parser.soc_argdict
     )
 
@@ -266,6 +406,7 @@ def main():
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
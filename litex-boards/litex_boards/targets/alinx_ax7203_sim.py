@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Verilator simulation of the ALINX AX7203 SoC: same CPU / user accelerator / DMA topology as
+# alinx_ax7203.py, with a LiteDRAM SDRAM model in place of the A7DDRPHY and DDR3.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import subprocess
+
+from migen import *
+from migen.genlib.resetsync import AsyncResetSynchronizer
+
+from litex.gen import *
+
+from litex.build.generic_platform import *
+from litex.build.sim import SimPlatform
+from litex.build.sim.config import SimConfig
+from litex.build.sim.platform import SimFinish
+
+from litex.soc.integration.common import get_mem_data, get_boot_address
+from litex.soc.integration.soc_core import *
+from litex.soc.integration.builder import *
+
+from litedram import modules as litedram_modules
+from litedram.phy.model import SDRAMPHYModel, sdram_module_nphases
+
+# Board target: shared user accelerator registry and integration
+from litex_boards.targets.alinx_ax7203 import USER_ACCELERATORS, add_user_accelerator, parse_user_accelerator_params
+
+# Benchmark firmware (accelerator/firmware)
+_firmware_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../accelerator/firmware"))
+
+# IOs ----------------------------------------------------------------------------------------------
+_io = [
+    # Clk / Rst.
+    ("sys_clk", 0, Pins(1)),
+    ("sys_rst", 0, Pins(1)),
+    ("accel_clk", 0, Pins(1)),
+
+    # Serial.
+    ("serial", 0,
+        Subsignal("source_valid", Pins(1)),
+        Subsignal("source_ready", Pins(1)),
+        Subsignal("source_data",  Pins(8)),
+
+        Subsignal("sink_valid",   Pins(1)),
+        Subsignal("sink_ready",   Pins(1)),
+        Subsignal("sink_data",    Pins(8)),
+    ),
+]
+
+# Platform -----------------------------------------------------------------------------------------
+class Platform(SimPlatform):
+    def __init__(self):
+        SimPlatform.__init__(self, "SIM", _io)
+
+# SimSoC -------------------------------------------------------------------------------------------
+class SimSoC(SoCCore):
+    def __init__(self,
+                 sys_clk_freq           = int(100e6),
+                 sdram_module           = "MT41K64M16",
+                 sdram_data_width       = 32,
+                 sdram_init             = [],
+                 with_user_accelerator  = True,
+                 user_accelerator       = "dma",
+                 user_accelerator_port  = "wishbone",
+                 user_accelerator_data_width = None,
+                 user_accelerator_params = {},
+                 accel_clk_freq         = None,
+                 with_sha3              = False,
+                 **kwargs):
+
+        platform = Platform()
+
+        # CRG --------------------------------------------------------------------------------------
+        self.crg = CRG(platform.request("sys_clk"))
+        if accel_clk_freq is not None:
+            # Accelerator clock (--accel-clk-freq), from its own simulator clocker.
+            self.crg.clock_domains.cd_accel = ClockDomain()
+            self.comb += self.crg.cd_accel.clk.eq(platform.request("accel_clk"))
+            self.specials += AsyncResetSynchronizer(self.crg.cd_accel, ResetSignal("sys"))
+
+        # SoCCore ----------------------------------------------------------------------------------
+        SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on ALINX AX7203 (Simulation)", **kwargs)
+
+        # SDRAM Model ------------------------------------------------------------------------------
+        # The board has 2x MT41J256M16 (1GB); a smaller DDR3 part keeps the model's memory small.
+        sdram_module_cls = getattr(litedram_modules, sdram_module)
+        sdram_module     = sdram_module_cls(sys_clk_freq, "1:{}".format(sdram_module_nphases[sdram_module_cls.memtype]))
+        self.sdrphy = SDRAMPHYModel(
+            module     = sdram_module,
+            data_width = sdram_data_width,
+            clk_freq   = sys_clk_freq,
+            init       = sdram_init)
+        self.add_sdram("sdram",
+            phy           = self.sdrphy,
+            module        = sdram_module,
+            l2_cache_size = kwargs.get("l2_size", 8192)
+        )
+        if sdram_init != []:
+            # Skip SDRAM test to avoid corrupting the preloaded firmware.
+            self.add_constant("SDRAM_TEST_DISABLE")
+        else:
+            # Reduce memtest size for simulation speedup.
+            self.add_constant("MEMTEST_DATA_SIZE", 8*1024)
+            self.add_constant("MEMTEST_ADDR_SIZE", 8*1024)
+
+        # User Accelerator -------------------------------------------------------------------------
+        if with_user_accelerator:
+            add_user_accelerator(self, user_accelerator,
+                port         = user_accelerator_port,
+                data_width   = user_accelerator_data_width,
+                params       = user_accelerator_params,
+                clock_domain = "sys" if accel_clk_freq is None else "accel")
+
+        # SHA3 Accelerator (for the SHA3 benchmark) ------------------------------------------------
+        if with_sha3:
+            add_user_accelerator(self, "sha3", name="user_sha3", irq=17)
+
+        # Simulation Finish (firmware ends the simulation) -----------------------------------------
+        self.sim_finish = SimFinish()
+
+# Build --------------------------------------------------------------------------------------------
+def main():
+    from litex.build.parser import LiteXArgumentParser
+    parser = LiteXArgumentParser(platform=SimPlatform, description="LiteX SoC on ALINX AX7203 (Verilator simulation).")
+    parser.add_target_argument("--sys-clk-freq",           default=100e6, type=float,    help="System clock frequency (for the cycle to time conversions).")
+    parser.add_target_argument("--sdram-module",           default="MT41K64M16",         help="SDRAM model chip (board: MT41J256M16).")
+    parser.add_target_argument("--sdram-data-width",       default=32, type=int,         help="SDRAM model data width.")
+    parser.add_target_argument("--without-user-accelerator", action="store_true",        help="Leave out the user accelerator.")
+    parser.add_target_argument("--user-accelerator",       default="dma",                help="User accelerator to add.", choices=list(USER_ACCELERATORS))
+    parser.add_target_argument("--user-accelerator-port",  default="wishbone",           help="User accelerator DMA data path.", choices=["wishbone", "native", "axi"])
+    parser.add_target_argument("--accel-data-width",       default=None, type=int,       help="User accelerator DMA data width (default: accelerator's).", choices=[32, 64, 128, 256])
+    parser.add_target_argument("--accel-param",            default=[], action="append",  help="User accelerator constructor argument KEY=VALUE (repeatable, e.g. unroll=2).")
+    parser.add_target_argument("--accel-clk-freq",         default=None, type=float,     help="Run the user accelerator in its own clock domain at this frequency (pipeline only).")
+    parser.add_target_argument("--with-sha3",              action="store_true",          help="Add a SHA3Accelerator (user_sha3) for the SHA3 benchmark.")
+    parser.add_target_argument("--firmware",               default=None,                 help="Firmware image to preload in SDRAM and boot from the BIOS.")
+    parser.add_target_argument("--build-firmware",         action="store_true",          help="Build accelerator/firmware for this SoC and boot it.")
+    parser.add_target_argument("--non-interactive",        action="store_true",          help="Run the simulation without user input.")
+    args = parser.parse_args()
+
+    soc_kwargs = parser.soc_argdict
+    soc_kwargs.update(
+        sys_clk_freq                = int(args.sys_clk_freq),
+        sdram_module                = args.sdram_module,
+        sdram_data_width            = args.sdram_data_width,
+        with_user_accelerator       = not args.without_user_accelerator,
+        user_accelerator            = args.user_accelerator,
+        user_accelerator_port       = args.user_accelerator_port,
+        user_accelerator_data_width = args.accel_data_width,
+        user_accelerator_params     = parse_user_accelerator_params(args.accel_param),
+        accel_clk_freq              = args.accel_clk_freq,
+        with_sha3                   = args.with_sha3,
+    )
+
+    # UART on the simulator console.
+    sim_config = SimConfig()
+    sim_config.add_clocker("sys_clk", freq_hz=int(args.sys_clk_freq))
+    if args.accel_clk_freq is not None:
+        sim_config.add_clocker("accel_clk", freq_hz=int(args.accel_clk_freq))
+    if soc_kwargs["uart_name"] == "serial":
+        soc_kwargs["uart_name"] = "sim"
+        sim_config.add_module("serial2console", "serial")
+
+    # Firmware -------------------------------------------------------------------------------------
+    firmware = args.firmware
+    if args.build_firmware:
+        # Generate the BIOS libraries and headers of the SoC (no gateware), then build the
+        # firmware against them.
+        builder = Builder(SimSoC(**soc_kwargs), **parser.builder_argdict)
+        builder.build(sim_config=sim_config, build=False, run=False)
+        subprocess.check_call(["make", "-C", _firmware_dir, f"BUILD_DIR={os.path.abspath(builder.output_dir)}"])
+        firmware = os.path.join(_firmware_dir, "firmware.bin")
+
+    ram_boot_address = None
+    if firmware is not None:
+        conf_soc = SimSoC(**soc_kwargs)
+        soc_kwargs["sdram_init"] = get_mem_data(firmware,
+            data_width = conf_soc.bus.data_width,
+            endianness = conf_soc.cpu.endianness,
+            offset     = conf_soc.mem_map["main_ram"]
+        )
+        ram_boot_address = get_boot_address(firmware) or conf_soc.mem_map["main_ram"]
+
+    # SoC ------------------------------------------------------------------------------------------
+    soc = SimSoC(**soc_kwargs)
+    if ram_boot_address is not None:
+        soc.add_constant("ROM_BOOT_ADDRESS", ram_boot_address)
+
+    # Build/Run ------------------------------------------------------------------------------------
+    builder = Builder(soc, **parser.builder_argdict)
+    builder.build(
+        sim_config  = sim_config,
+        interactive = not args.non_interactive,
+        **parser.toolchain_argdict
+    )
+
+if __name__ == "__main__":
+    main()